@@ -1,18 +1,18 @@
+from __future__ import annotations
 import argparse
-from prompt_toolkit.application import Application
-from prompt_toolkit.layout import Layout
-from chess_puzzle_ai_cli.modules.board.board_model import BoardModel
-from chess_puzzle_ai_cli.modules.board.board_presenter import BoardPresenter
-from chess_puzzle_ai_cli.modules.board.board_view import BoardView
-from chess_puzzle_ai_cli.modules.clock.clock_model import ClockModel
-from chess_puzzle_ai_cli.modules.clock.clock_presenter import ClockPresenter
-from chess_puzzle_ai_cli.modules.clock.clock_view import ClockView
-from prompt_toolkit.layout.containers import HSplit, VSplit, WindowAlign
-from chess_puzzle_ai_cli.utils.styles import default
-from prompt_toolkit.styles import Style, merge_styles
-from chess_puzzle_ai_cli.utils.config import game_config, terminal_config, player_info_config, lichess_config
+import sys
+from typing import List, Optional
 from chess_puzzle_ai_cli.utils.logging import configure_logger, log
 
+# NOTE: Startup time matters here, as the puzzle should be up before the user
+#  notices the agent starting. Only the modules needed to show the board, clock
+#  and status are imported before the first paint, and only once it is known a
+#  UI is shown. Everything else (puzzle importer, agent runner, variants, the
+#  network stack) is imported on first use. See tests/core/test_startup.py.
+#  When a puzzle daemon is running, this process is only a thin client which
+#  hands its terminal to the daemon, so none of the UI is imported at all.
+
+
 def _parse_arguments():
     parser = argparse.ArgumentParser(description="Chess Puzzle AI CLI Wrapper")
     parser.add_argument(
@@ -23,66 +23,158 @@ def _parse_arguments():
     parser.add_argument(
         "--status-file",
         type=str,
-        help="Path to the file containing the status of the AI agent's task."
+        help="Path to the file the AI agent appends its status to, as JSON lines "
+             "(e.g. {\"status\": \"running\", \"message\": \"Running tests\"})."
+    )
+    parser.add_argument(
+        "--rating",
+        type=int,
+        help="Select a puzzle rated around this rating from the local puzzle store."
+    )
+    parser.add_argument(
+        "--themes",
+        type=str,
+        default="",
+        help="Comma separated list of Lichess puzzle themes the selected puzzle must have (e.g. mateIn2,fork)."
     )
-    return parser.parse_args()
 
-def main() -> None:
-    # Initialize logging
-    configure_logger("chess-puzzle-ai-cli")
+    parser.add_argument(
+        "--no-daemon",
+        action="store_true",
+        help="Show the puzzle in this process, even if a puzzle daemon is running."
+    )
+    parser.add_argument(
+        "--socket-path",
+        type=str,
+        default="",
+        help="Path of the puzzle daemon's Unix socket. Defaults to the program config directory."
+    )
+
+    subparsers = parser.add_subparsers(dest="command")
+    import_parser = subparsers.add_parser(
+        "import-puzzles",
+        help="Import (or incrementally update) the local puzzle store from the Lichess puzzle CSV."
+    )
+    import_parser.add_argument(
+        "csv_file",
+        type=str,
+        help="Path to the Lichess puzzle CSV. May be compressed with bz2 (.bz2) or gzip (.gz)."
+    )
+    import_parser.add_argument(
+        "--store-path",
+        type=str,
+        default="",
+        help="Directory of the puzzle store to import into. Defaults to the program config directory."
+    )
+    subparsers.add_parser(
+        "daemon",
+        help="Run a puzzle daemon, which keeps puzzles ready so puzzles pop up instantly in any terminal."
+    )
+    run_parser = subparsers.add_parser(
+        "run",
+        help="Run the agent command with the puzzle in front, showing its elapsed time and exit code."
+    )
+    run_parser.add_argument(
+        "agent_command",
+        nargs=argparse.REMAINDER,
+        help="The agent command (and its arguments) to run, after a '--' separator."
+    )
 
-    # Initialize configs (this will create default config files if they don't exist)
-    game_config
-    terminal_config
-    player_info_config
-    lichess_config
+    args = parser.parse_args()
+    if args.command == "run":
+        if args.agent_command[:1] == ["--"]:
+            args.agent_command = args.agent_command[1:]
+        if not args.agent_command:
+            parser.error("run requires an agent command (e.g. run -- my-agent --task fix-tests)")
+    return args
 
-    args = _parse_arguments()
-    log.info(f"Received clock_file: {args.clock_file}")
-    log.info(f"Received status_file: {args.status_file}")
 
-    # Create a default board model
-    board_model = BoardModel()
+def _import_puzzles(csv_file: str, store_path: str) -> None:
+    """Imports the Lichess puzzle CSV into the local puzzle store"""
+    from chess_puzzle_ai_cli.modules.puzzle.puzzle_importer import import_puzzles
 
-    # Create a board presenter
-    board_presenter = BoardPresenter(board_model)
+    result = import_puzzles(csv_file, store_path, lambda rows_read: print(f"\rRead {rows_read} puzzles...", end="", flush=True))
+    print(f"\rRead {result.rows_read} puzzles. Added {result.puzzles_added} new, skipped {result.rows_skipped}.")
 
-    # Create a board view
-    board_view = BoardView(board_presenter, board_presenter.get_board_display())
 
-    # Create a clock model
-    clock_model = ClockModel(args.clock_file)
+def main() -> None:
+    args = _parse_arguments()
 
-    # Create a clock presenter
-    clock_presenter = ClockPresenter(clock_model)
+    # Attach to the daemon first, before this process does any other work
+    if args.command in (None, "run"):
+        exit_code = _attach_to_daemon(args)
+        if exit_code is not None:
+            sys.exit(exit_code)
 
-    # Create a clock view
-    clock_view = ClockView(clock_presenter)
+    # Initialize logging
+    configure_logger("chess-puzzle-ai-cli-daemon" if args.command == "daemon" else "chess-puzzle-ai-cli")
 
-    # Create the application layout
-    layout = Layout(
-        HSplit([
-            board_view,
-            VSplit([clock_view], align=WindowAlign.CENTER)
-        ])
-    )
+    if args.command == "import-puzzles":
+        _import_puzzles(args.csv_file, args.store_path)
+    elif args.command == "daemon":
+        _run_daemon(args)
+    else:
+        _run_puzzle_ui(args)
 
-    # Create the application
-    application = Application(
-        layout=layout,
-        full_screen=True,
-        mouse_support=True,
-        style=merge_styles([Style.from_dict(default)]),
-    )
 
-    # Set up a timer to refresh the clock view periodically
-    def on_render(app):
-        clock_view.update()
+def _run_puzzle_ui(args: argparse.Namespace) -> None:
+    """Shows the puzzle UI until the user exits"""
+    from chess_puzzle_ai_cli.core.puzzle_app import PuzzleApp, create_puzzle_prefetcher
+
+    log.info(f"Received clock_file: {args.clock_file}")
+    log.info(f"Received status_file: {args.status_file}")
 
-    application.before_render += on_render
+    puzzle_prefetcher = create_puzzle_prefetcher(args.rating, args.themes)
+    puzzle_app = PuzzleApp(args.clock_file, args.status_file, _get_agent_command(args), puzzle_prefetcher=puzzle_prefetcher)
+    try:
+        puzzle_app.run()
+    finally:
+        puzzle_app.cleanup()
+        if puzzle_prefetcher:
+            puzzle_prefetcher.stop()
+
+    puzzle_app.print_agent_result()
+    if puzzle_app.agent_runner:
+        sys.exit(puzzle_app.get_exit_code())
+
+
+def _attach_to_daemon(args: argparse.Namespace) -> Optional[int]:
+    """Shows the puzzle UI through the daemon (if one is running) and returns
+       the exit code. Returns None if the UI should be shown in this process.
+    """
+    from chess_puzzle_ai_cli.core.daemon_client import attach_to_daemon, create_attach_request, is_daemon_available, DaemonUnavailableError
+
+    if args.no_daemon or not is_daemon_available(args.socket_path) or not (sys.stdin.isatty() and sys.stdout.isatty()):
+        return None
+
+    request = create_attach_request(args.clock_file, args.status_file, args.rating, args.themes, _get_agent_command(args))
+    try:
+        return attach_to_daemon(request, args.socket_path, sys.stdin.fileno(), sys.stdout.fileno())
+    except DaemonUnavailableError:
+        # The daemon is not running (or went away before the session was handed to it)
+        return None
+    except OSError as e:
+        # The session (and its agent command) may already have started in the daemon,
+        # so it must not be started again in this process
+        print(f"The puzzle daemon ended the session unexpectedly: {e}", file=sys.stderr)
+        return 1
+
+
+def _run_daemon(args: argparse.Namespace) -> None:
+    """Runs the puzzle daemon until it is stopped"""
+    from chess_puzzle_ai_cli.core.daemon_server import PuzzleDaemon
+
+    try:
+        PuzzleDaemon(args.socket_path, args.rating, args.themes).run()
+    except OSError as e:
+        log.error(f"Unable to start the puzzle daemon: {e}")
+        sys.exit(f"Unable to start the puzzle daemon: {e}")
+
+
+def _get_agent_command(args: argparse.Namespace) -> Optional[List[str]]:
+    """Returns the agent command to run (in run mode), otherwise None"""
+    return args.agent_command if args.command == "run" else None
 
-    # Run the application
-    application.run()
 
 if __name__ == "__main__":
     main()
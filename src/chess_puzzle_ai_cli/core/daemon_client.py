@@ -0,0 +1,127 @@
+from __future__ import annotations
+from typing import List, Optional
+import threading
+import signal
+import socket
+import json
+import sys
+import os
+
+# NOTE: This module is the thin client, which runs on every launch while a daemon
+#  is up. Keep its imports to the standard library so attaching stays instant.
+#  See tests/core/test_startup.py.
+
+DEFAULT_DAEMON_SOCKET_FILENAME = "daemon.sock"
+MAX_MESSAGE_SIZE = 1024 * 1024
+
+
+class DaemonUnavailableError(ConnectionError):
+    """Raised when a session could not be handed to the daemon (e.g. it is not
+       running). The daemon never received the session, so it is safe to show
+       the puzzle UI in this process instead.
+    """
+
+
+def get_daemon_socket_path(socket_path: str = "") -> str:
+    """Returns the path of the daemon's Unix socket. By default, the socket is in the config
+       directory. The config directory is resolved here (as `config.get_config_path` does),
+       as importing the config module would import the config watching and logging setup.
+    """
+    if socket_path:
+        return socket_path
+
+    config_path = os.path.expandvars("$APPDATA/cli-chess/" if sys.platform == "win32" else "$HOME/.config/cli-chess/")
+    return os.path.join(config_path, DEFAULT_DAEMON_SOCKET_FILENAME)
+
+
+def encode_message(message: dict) -> bytes:
+    """Encodes a message sent between the daemon and client (one JSON object per line)"""
+    return json.dumps(message).encode() + b"\n"
+
+
+class MessageReader:
+    """Splits the messages received on a daemon socket"""
+    def __init__(self, data: bytes = b"") -> None:
+        self._buffer = data
+
+    def feed(self, data: bytes) -> List[dict]:
+        """Adds the received data and returns the complete messages received"""
+        self._buffer += data
+        *lines, self._buffer = self._buffer.split(b"\n")
+        if len(self._buffer) > MAX_MESSAGE_SIZE:
+            raise ValueError("Daemon message too large")
+        return [json.loads(line) for line in lines if line.strip()]
+
+
+def is_daemon_available(socket_path: str = "") -> bool:
+    """Returns True if a daemon socket exists. This is only a cheap check, the
+       daemon may still not be running (see `attach_to_daemon`)
+    """
+    return os.path.exists(get_daemon_socket_path(socket_path))
+
+
+def create_attach_request(clock_file: Optional[str] = None, status_file: Optional[str] = None, rating: Optional[int] = None,
+                          themes: str = "", agent_command: Optional[List[str]] = None) -> dict:
+    """Returns the request asking the daemon to show a puzzle session on this terminal"""
+    return {
+        'type': "attach",
+        'clock_file': os.path.abspath(clock_file) if clock_file else None,
+        'status_file': os.path.abspath(status_file) if status_file else None,
+        'rating': rating,
+        'themes': themes,
+        'agent_command': agent_command,
+        'cwd': os.getcwd(),
+        'env': dict(os.environ) if agent_command else None,
+        'term': os.environ.get("TERM"),
+    }
+
+
+def attach_to_daemon(request: dict, socket_path: str = "", stdin_fd: int = 0, stdout_fd: int = 1) -> int:
+    """Attaches the terminal to the daemon, which runs the puzzle session on it until the
+       user exits. The terminal file descriptors are passed over the daemon's Unix socket,
+       so the daemon reads and writes the terminal directly. Returns the sessions exit
+       code. Raises a DaemonUnavailableError if the session could not be handed to the
+       daemon, or an OSError if the daemon drops the session once it has been attached.
+    """
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        try:
+            sock.connect(get_daemon_socket_path(socket_path))
+            socket.send_fds(sock, [encode_message(request)], [stdin_fd, stdout_fd])
+        except OSError as e:
+            raise DaemonUnavailableError(f"Unable to attach to the daemon: {e}") from e
+        return _wait_for_exit(sock)
+    finally:
+        sock.close()
+
+
+def _wait_for_exit(sock: socket.socket) -> int:
+    """Waits for the daemon to end the session, forwarding terminal resizes
+       (which are only signalled to this process) to the daemon
+    """
+    def on_resize(*args) -> None: # noqa
+        try:
+            sock.sendall(encode_message({'type': "resize"}))
+        except OSError:
+            pass
+
+    previous_handler = None
+    if threading.current_thread() is threading.main_thread() and hasattr(signal, "SIGWINCH"):
+        previous_handler = signal.signal(signal.SIGWINCH, on_resize)
+
+    try:
+        reader = MessageReader()
+        while True:
+            try:
+                data = sock.recv(65536)
+            except InterruptedError:
+                continue
+            if not data:
+                raise ConnectionError("The daemon closed the session")
+
+            for message in reader.feed(data):
+                if message.get('type') == "exit":
+                    return int(message.get('exit_code', 0))
+    finally:
+        if previous_handler is not None:
+            signal.signal(signal.SIGWINCH, previous_handler)
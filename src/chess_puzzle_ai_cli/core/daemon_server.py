@@ -0,0 +1,212 @@
+from __future__ import annotations
+from chess_puzzle_ai_cli.core.daemon_client import get_daemon_socket_path, encode_message, MessageReader
+from chess_puzzle_ai_cli.core.puzzle_app import PuzzleApp, create_puzzle_prefetcher
+from chess_puzzle_ai_cli.utils.logging import log
+from prompt_toolkit.application import create_app_session
+from prompt_toolkit.input import create_input
+from prompt_toolkit.output.vt100 import Vt100_Output
+from typing import Dict, List, Optional, Set, Tuple
+import asyncio
+import signal
+import socket
+import os
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from chess_puzzle_ai_cli.modules.puzzle.puzzle_prefetcher import PuzzlePrefetcher
+
+HANDSHAKE_TIMEOUT = 5.0
+
+
+def _receive_attach_request(conn: socket.socket) -> Tuple[dict, List[int]]:
+    """Receives the attach request and the clients terminal file descriptors.
+       Raises a ValueError if the request is invalid.
+    """
+    conn.settimeout(HANDSHAKE_TIMEOUT)
+    data, fds, _, _ = socket.recv_fds(conn, 65536, 2)
+    try:
+        reader = MessageReader()
+        messages = reader.feed(data)
+        while not messages:
+            data = conn.recv(65536)
+            if not data:
+                raise ValueError("Client disconnected during the handshake")
+            messages = reader.feed(data)
+
+        request = messages[0]
+        if request.get('type') != "attach" or len(fds) != 2:
+            raise ValueError("Invalid attach request")
+        return request, fds
+    except Exception:
+        for fd in fds:
+            os.close(fd)
+        raise
+    finally:
+        conn.settimeout(None)
+
+
+class PuzzleDaemon:
+    """Keeps the puzzle store, its indexes and the decoded puzzle prefetch queue warm
+       in one long running process, and serves puzzle sessions to thin clients over
+       a local Unix socket (see daemon_client). Each client passes its terminal to
+       the daemon, which runs the session's application on it in its own prompt_toolkit
+       app session, so any number of terminals can be served concurrently.
+    """
+    def __init__(self, socket_path: str = "", rating: Optional[int] = None, themes: str = "") -> None:
+        self.socket_path = get_daemon_socket_path(socket_path)
+        self.rating = rating
+        self.themes = themes
+
+        self._prefetchers: Dict[Tuple[Optional[int], str], Optional[PuzzlePrefetcher]] = {}
+        self._sessions: Set[PuzzleApp] = set()
+        self._session_tasks: Set[asyncio.Task] = set()
+        self._stopped: Optional[asyncio.Event] = None
+
+    def get_session_count(self) -> int:
+        """Returns the number of sessions currently being served"""
+        return len(self._sessions)
+
+    def get_prefetcher(self, rating: Optional[int], themes: str) -> Optional[PuzzlePrefetcher]:
+        """Returns the (warm) prefetcher for the rating and themes, creating it on first use"""
+        key = (rating, themes)
+        if key not in self._prefetchers:
+            self._prefetchers[key] = create_puzzle_prefetcher(rating, themes)
+        return self._prefetchers[key]
+
+    async def serve(self) -> None:
+        """Serves puzzle sessions until stopped"""
+        self._stopped = asyncio.Event()
+
+        # Warm up the default prefetch queue before accepting sessions
+        self.get_prefetcher(self.rating, self.themes)
+
+        server_socket = self._create_server_socket()
+        log.info(f"Puzzle daemon listening on {self.socket_path}")
+        accept_task = asyncio.ensure_future(self._accept_sessions(server_socket))
+        try:
+            await self._stopped.wait()
+        finally:
+            accept_task.cancel()
+            for session in list(self._sessions):
+                session.exit()
+            if self._session_tasks:
+                await asyncio.gather(*self._session_tasks, return_exceptions=True)
+
+            server_socket.close()
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+            for prefetcher in self._prefetchers.values():
+                if prefetcher:
+                    prefetcher.stop()
+            log.info("Puzzle daemon stopped")
+
+    def run(self) -> None:
+        """Runs the daemon until it is sent SIGINT or SIGTERM"""
+        async def run():
+            loop = asyncio.get_running_loop()
+            for signal_number in (signal.SIGINT, signal.SIGTERM):
+                loop.add_signal_handler(signal_number, self.stop)
+            await self.serve()
+
+        asyncio.run(run())
+
+    def stop(self) -> None:
+        """Stops serving, exiting all sessions"""
+        if self._stopped:
+            self._stopped.set()
+
+    def _create_server_socket(self) -> socket.socket:
+        """Creates the listening Unix socket, replacing a stale socket file left by a
+           daemon which didn't exit cleanly. Raises an OSError if a daemon is running.
+        """
+        if os.path.exists(self.socket_path):
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(self.socket_path)
+                raise OSError(f"A puzzle daemon is already running on {self.socket_path}")
+            except ConnectionRefusedError:
+                os.remove(self.socket_path)
+            finally:
+                probe.close()
+
+        os.makedirs(os.path.dirname(self.socket_path), exist_ok=True)
+        server_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server_socket.bind(self.socket_path)
+        os.chmod(self.socket_path, 0o600)
+        server_socket.listen()
+        server_socket.setblocking(False)
+        return server_socket
+
+    async def _accept_sessions(self, server_socket: socket.socket) -> None:
+        """Accepts client connections, serving each in its own task"""
+        loop = asyncio.get_running_loop()
+        while True:
+            conn, _ = await loop.sock_accept(server_socket)
+            task = asyncio.ensure_future(self._serve_session(conn))
+            self._session_tasks.add(task)
+            task.add_done_callback(self._session_tasks.discard)
+
+    async def _serve_session(self, conn: socket.socket) -> None:
+        """Runs a puzzle session on the clients terminal until the user exits,
+           then sends the session's exit code back to the client
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            request, fds = await loop.run_in_executor(None, _receive_attach_request, conn)
+        except (OSError, ValueError) as e:
+            log.error(f"Unable to attach the client: {e}")
+            conn.close()
+            return
+
+        conn.setblocking(False)
+        stdin = os.fdopen(fds[0], "r", closefd=True)
+        stdout = os.fdopen(fds[1], "w", closefd=True)
+        exit_code = 1
+        try:
+            with create_app_session(input=create_input(stdin), output=Vt100_Output.from_pty(stdout, term=request.get('term'))):
+                session = PuzzleApp(request.get('clock_file'), request.get('status_file'), request.get('agent_command'),
+                                    request.get('cwd'), request.get('env'),
+                                    self.get_prefetcher(request.get('rating'), request.get('themes') or ""))
+                self._sessions.add(session)
+                monitor_task = asyncio.ensure_future(self._monitor_client(conn, session))
+                try:
+                    await session.run_async()
+                finally:
+                    monitor_task.cancel()
+                    self._sessions.discard(session)
+                    session.cleanup()
+
+            session.print_agent_result(stdout)
+            stdout.flush()
+            exit_code = session.get_exit_code()
+        except Exception as e:
+            log.error(f"Puzzle session ended unexpectedly: {e}")
+        finally:
+            stdin.close()
+            stdout.close()
+
+        try:
+            await loop.sock_sendall(conn, encode_message({'type': "exit", 'exit_code': exit_code}))
+        except OSError:
+            pass
+        conn.close()
+
+    async def _monitor_client(self, conn: socket.socket, session: PuzzleApp) -> None:
+        """Handles messages from the client. Resizes repaint the session (the renderer
+           picks up the new terminal size), and a disconnected client exits the session.
+        """
+        loop = asyncio.get_running_loop()
+        reader = MessageReader()
+        while True:
+            try:
+                data = await loop.sock_recv(conn, 65536)
+            except OSError:
+                data = b""
+
+            if not data:
+                log.info("Client disconnected, exiting its session")
+                session.exit()
+                return
+
+            for message in reader.feed(data):
+                if message.get('type') == "resize":
+                    session.application.invalidate()
@@ -0,0 +1,239 @@
+from __future__ import annotations
+from prompt_toolkit.application import Application
+from prompt_toolkit.key_binding import KeyBindings
+from prompt_toolkit.layout import Layout
+from prompt_toolkit.layout.containers import HSplit, VSplit, WindowAlign
+from prompt_toolkit.styles import Style, merge_styles
+from chess_puzzle_ai_cli.modules.board.board_model import BoardModel
+from chess_puzzle_ai_cli.modules.board.board_presenter import BoardPresenter
+from chess_puzzle_ai_cli.modules.clock.clock_model import ClockModel
+from chess_puzzle_ai_cli.modules.clock.clock_presenter import ClockPresenter
+from chess_puzzle_ai_cli.modules.puzzle.puzzle_presenter import PuzzlePresenter
+from chess_puzzle_ai_cli.modules.status.status_model import StatusModel, AgentStatus, AGENT_FAILED
+from chess_puzzle_ai_cli.modules.status.status_presenter import StatusPresenter
+from chess_puzzle_ai_cli.utils.config import game_config, terminal_config, start_watching_configs, stop_watching_configs
+from chess_puzzle_ai_cli.utils.frame_scheduler import FrameScheduler
+from chess_puzzle_ai_cli.utils.logging import log
+from chess_puzzle_ai_cli.utils.styles import default
+from typing import Dict, List, Optional, TextIO
+import asyncio
+import sys
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from chess_puzzle_ai_cli.modules.puzzle.puzzle_prefetcher import PuzzlePrefetcher
+
+# Seconds the solved puzzle stays on the board before the next puzzle is loaded
+NEXT_PUZZLE_DELAY = 1.5
+
+
+def create_puzzle_prefetcher(rating: Optional[int] = None, themes: str = "") -> Optional[PuzzlePrefetcher]:
+    """Creates and starts a puzzle prefetcher selecting puzzles matching the passed in
+       rating and comma separated themes from the local puzzle store. Returns None if
+       a puzzle store (and its index) is not available.
+    """
+    from chess_puzzle_ai_cli.modules.puzzle.puzzle_store import PuzzleStore
+    from chess_puzzle_ai_cli.modules.puzzle.puzzle_index import PuzzleIndex
+    from chess_puzzle_ai_cli.modules.puzzle.puzzle_prefetcher import PuzzlePrefetcher
+
+    try:
+        store = PuzzleStore()
+    except (OSError, ValueError) as e:
+        log.info(f"No puzzle store available, using a default board: {e}")
+        return None
+
+    try:
+        index = PuzzleIndex(store)
+    except (OSError, ValueError) as e:
+        log.error(f"Unable to open the puzzle index: {e}")
+        store.close()
+        return None
+
+    prefetcher = PuzzlePrefetcher(store, index, rating, themes=[theme.strip() for theme in themes.split(",") if theme.strip()])
+    prefetcher.start()
+    return prefetcher
+
+
+class PuzzleApp:
+    """The puzzle UI: the agent status banner, the puzzle board with its move input and the agent clock.
+       The clock and status are either read from the clock and status files, or
+       (when an agent command is passed in) driven by running the agent command.
+       The application uses the current prompt_toolkit app session, so several
+       puzzle apps can run in one process (see the daemon).
+    """
+    def __init__(self, clock_file: Optional[str] = None, status_file: Optional[str] = None,
+                 agent_command: Optional[List[str]] = None, agent_cwd: Optional[str] = None,
+                 agent_env: Optional[Dict[str, str]] = None, puzzle_prefetcher: Optional[PuzzlePrefetcher] = None) -> None:
+        # Create the board model, presenter and view. Board model updates are
+        # coalesced by the frame scheduler, so a burst of updates renders once
+        self.frame_scheduler = FrameScheduler(terminal_config.get_max_frame_rate())
+        self.board_model = BoardModel()
+        self.board_presenter = BoardPresenter(self.board_model, self.frame_scheduler)
+
+        # Moves entered in the move input are checked against the loaded puzzle's solution
+        self.puzzle_presenter = PuzzlePresenter(self.board_presenter)
+
+        # Load the first puzzle from the local puzzle store (if available). The
+        # next puzzle is taken from the prefetch queue once a puzzle is solved
+        self.puzzle_prefetcher = puzzle_prefetcher
+        self._next_puzzle_handle: Optional[asyncio.TimerHandle] = None
+        if self.puzzle_prefetcher:
+            self.puzzle_presenter.e_puzzle_solved.add_listener(self._puzzle_solved)
+            self._load_next_puzzle(self.puzzle_prefetcher)
+
+        # Create the clock model, presenter and view. The clock file is watched for
+        # changes to the clock anchor, and the time is counted locally from it. In
+        # run mode the clock and status are driven by the agent process instead
+        self.clock_model = ClockModel(None if agent_command else clock_file)
+        self.clock_presenter = ClockPresenter(self.clock_model)
+
+        # Create the status model, presenter and view. The status file is tailed as the agent appends to it
+        self.status_model = StatusModel(None if agent_command else status_file)
+        self.status_presenter = StatusPresenter(self.status_model)
+
+        self.agent_runner = None
+        if agent_command:
+            from chess_puzzle_ai_cli.modules.agent.agent_runner import AgentRunner
+            self.agent_runner = AgentRunner(agent_command, self.clock_model, self.status_model, cwd=agent_cwd, env=agent_env)
+
+        self.application = self._create_application()
+
+        # Model updates can come from watcher threads, which don't see this apps session,
+        # so the application is invalidated directly (this is thread safe)
+        self.clock_model.e_clock_model_updated.add_listener(self._invalidate)
+        self.status_model.e_status_model_updated.add_listener(self._invalidate)
+
+        # Config changes made in another terminal are reloaded (on a watcher thread) and applied without a restart
+        game_config.e_game_config_updated.add_listener(self._invalidate)
+        start_watching_configs()
+
+    def _load_next_puzzle(self, puzzle_prefetcher: PuzzlePrefetcher) -> None:
+        """Loads the next puzzle from the prefetcher onto the board"""
+        try:
+            puzzle = puzzle_prefetcher.get_next_puzzle()
+        except ValueError as e:
+            log.error(f"Unable to select a puzzle: {e}")
+            puzzle = None
+
+        if puzzle:
+            log.info(f"Starting puzzle {puzzle.record.puzzle_id} (rating {puzzle.record.rating})")
+            self.puzzle_presenter.start_puzzle(puzzle)
+        else:
+            log.info("No matching puzzle found, using a default board")
+
+    def _puzzle_solved(self, *args, **kwargs) -> None: # noqa
+        """Loads the next puzzle once the current puzzle is solved. In the application
+           event loop the solved position is shown for a moment first.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._load_next_puzzle(self.puzzle_prefetcher)
+            return
+
+        if self._next_puzzle_handle:
+            self._next_puzzle_handle.cancel()
+        self._next_puzzle_handle = loop.call_later(NEXT_PUZZLE_DELAY, self._load_next_puzzle, self.puzzle_prefetcher)
+
+    def _create_application(self) -> Application:
+        """Creates the application"""
+        layout = Layout(
+            HSplit([
+                self.status_presenter.view,
+                self.board_presenter.view,
+                self.puzzle_presenter.view,
+                VSplit([self.clock_presenter.view], align=WindowAlign.CENTER)
+            ])
+        )
+
+        return Application(
+            layout=layout,
+            key_bindings=self._create_key_bindings(),
+            full_screen=True,
+            mouse_support=True,
+            style=merge_styles([Style.from_dict(default)]),
+        )
+
+    def _create_key_bindings(self) -> KeyBindings:
+        """Creates the application key bindings"""
+        bindings = KeyBindings()
+
+        @bindings.add("c-c", eager=True)
+        @bindings.add("c-q", eager=True)
+        def _exit(event):
+            event.app.exit()
+
+        return bindings
+
+    def _invalidate(self, *args, **kwargs) -> None: # noqa
+        """Repaints this application"""
+        self.application.invalidate()
+
+    def _pre_run(self) -> None:
+        """Starts the background tasks of the application. The clock is refreshed
+           on a fixed tick, and the agent command (in run mode) is awaited, in
+           the application event loop.
+        """
+        self.frame_scheduler.set_event_loop(asyncio.get_running_loop())
+        self.application.create_background_task(self.clock_presenter.run_clock_tick())
+        if self.agent_runner:
+            self.application.create_background_task(self._run_agent())
+
+    async def _run_agent(self) -> None:
+        """Runs the agent command, showing an error status if it could not be started"""
+        try:
+            await self.agent_runner.run()
+        except OSError as e:
+            log.error(f"Unable to start the agent command: {e}")
+            self.status_model.set_status(AgentStatus(AGENT_FAILED, f"unable to start: {e.strerror or e}"))
+
+    def run(self) -> None:
+        """Runs the application until the user exits"""
+        self.application.run(pre_run=self._pre_run)
+
+    async def run_async(self) -> None:
+        """Runs the application in the running event loop until the user exits"""
+        await self.application.run_async(pre_run=self._pre_run, handle_sigint=False)
+
+    def exit(self) -> None:
+        """Exits the application if it is running"""
+        if self.application.is_running and not self.application.is_done:
+            self.application.exit()
+
+    def get_exit_code(self) -> int:
+        """Returns the exit code of the program, the agent command's exit code in run mode"""
+        if not self.agent_runner:
+            return 0
+
+        returncode = self.agent_runner.returncode
+        return 1 if returncode is None else returncode if returncode >= 0 else 128 - returncode
+
+    def print_agent_result(self, file: TextIO = sys.stdout) -> None:
+        """Prints the captured output and exit code of the agent command (in run mode)"""
+        if not self.agent_runner:
+            return
+
+        for line in self.agent_runner.get_output_lines():
+            print(line, file=file)
+
+        if self.agent_runner.returncode is None:
+            print(f"{self.agent_runner.get_command_display()} did not start", file=file)
+        else:
+            print(f"{self.agent_runner.get_command_display()} exited with code {self.agent_runner.returncode} "
+                  f"after {int(self.agent_runner.get_elapsed_time())}s", file=file)
+
+    def cleanup(self) -> None:
+        """Handles application cleanup tasks. This should only
+           be run once the application has exited.
+        """
+        self.frame_scheduler.cancel()
+        if self._next_puzzle_handle:
+            self._next_puzzle_handle.cancel()
+        stop_watching_configs()
+        game_config.e_game_config_updated.remove_listener(self._invalidate)
+        self.clock_model.cleanup()
+        self.status_model.cleanup()
+        self.puzzle_presenter.cleanup()
+        self.board_presenter.cleanup()
+        self.board_model.cleanup()
+        if self.agent_runner:
+            self.agent_runner.cleanup()
@@ -0,0 +1,193 @@
+from __future__ import annotations
+from chess_puzzle_ai_cli.modules.status.status_model import AgentStatus, AGENT_RUNNING, AGENT_FINISHED, AGENT_FAILED
+from chess_puzzle_ai_cli.utils.event import EventManager
+from chess_puzzle_ai_cli.utils.logging import log
+from collections import deque
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
+import asyncio
+import shlex
+import time
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from chess_puzzle_ai_cli.modules.clock.clock_model import ClockModel
+    from chess_puzzle_ai_cli.modules.status.status_model import StatusModel
+
+DEFAULT_OUTPUT_BUFFER_LINES = 1000
+MAX_OUTPUT_LINE_LENGTH = 4096
+READ_CHUNK_SIZE = 64 * 1024
+TERMINATE_TIMEOUT = 5.0
+OUTPUT_DRAIN_TIMEOUT = 1.0
+
+
+class AgentRunner:
+    """Runs the agent command as a child process while the puzzle is played. The
+       childs exit is awaited in the asyncio event loop (using the loops child
+       watcher), and its stdout and stderr are captured into a bounded ring buffer
+       of the most recent lines. The passed in clock and status models are driven
+       directly from the process, so no clock or status files are needed: the clock
+       counts up from the process start and the status shows the latest output
+       line, then the exit code once the process ends. The exit is reported as soon
+       as the process ends, even if a process it started still holds the pipes open.
+       The command is run in the passed in working directory and environment
+       (defaulting to this process's).
+    """
+    def __init__(self, command: Sequence[str], clock_model: Optional[ClockModel] = None,
+                 status_model: Optional[StatusModel] = None, output_buffer_lines: int = DEFAULT_OUTPUT_BUFFER_LINES,
+                 cwd: Optional[str] = None, env: Optional[Dict[str, str]] = None) -> None:
+        if not command:
+            raise ValueError("No agent command to run")
+
+        self.command = list(command)
+        self.cwd = cwd
+        self.env = env
+        self.clock_model = clock_model
+        self.status_model = status_model
+        self.output: Deque[Tuple[str, str]] = deque(maxlen=output_buffer_lines)
+        self.start_time: Optional[float] = None
+        self.end_time: Optional[float] = None
+        self.returncode: Optional[int] = None
+
+        self._process: Optional[asyncio.subprocess.Process] = None
+        self._exited: Optional[asyncio.Future] = None
+        self._event_manager = EventManager()
+        self.e_agent_exited = self._event_manager.create_event()
+
+    def get_command_display(self) -> str:
+        """Returns the agent command as it would be typed in a shell"""
+        return shlex.join(self.command)
+
+    def get_elapsed_time(self) -> float:
+        """Returns the seconds since the process started (until it exited)"""
+        if self.start_time is None:
+            return 0.0
+        end_time = self.end_time if self.end_time is not None else time.monotonic()
+        return end_time - self.start_time
+
+    def get_output_lines(self) -> List[str]:
+        """Returns the captured output lines (stdout and stderr interleaved), oldest first"""
+        return [line for _, line in self.output]
+
+    async def run(self) -> int:
+        """Runs the agent command until it exits and returns its exit code. If this task
+           is cancelled (e.g. the user quits) the process is terminated. Raises an
+           OSError if the command could not be started.
+        """
+        log.info(f"Starting agent command: {self.get_command_display()}")
+        self.start_time = time.monotonic()
+        loop = asyncio.get_running_loop()
+        self._exited = loop.create_future()
+        transport, protocol = await loop.subprocess_exec(lambda: _AgentProcessProtocol(self._exited, loop), *self.command,
+                                                         cwd=self.cwd, env=self.env,
+                                                         stdin=asyncio.subprocess.DEVNULL,
+                                                         stdout=asyncio.subprocess.PIPE,
+                                                         stderr=asyncio.subprocess.PIPE)
+        self._process = asyncio.subprocess.Process(transport, protocol, loop)
+        if self.clock_model:
+            self.clock_model.set_anchor(self.get_elapsed_time(), "up")
+        self._set_status(AgentStatus(AGENT_RUNNING, self.get_command_display()))
+
+        readers = [asyncio.ensure_future(self._read_output(self._process.stdout, "stdout")),
+                   asyncio.ensure_future(self._read_output(self._process.stderr, "stderr"))]
+        try:
+            # The output is read while waiting, and the exit is reported without waiting for the
+            # pipes to close (unlike Process.wait), as a process started by the agent may keep them open
+            self.returncode = await asyncio.shield(self._exited)
+            self._on_exit()
+
+            # Drain the output written just before the exit
+            await asyncio.wait(readers, timeout=OUTPUT_DRAIN_TIMEOUT)
+        except asyncio.CancelledError:
+            await self.terminate()
+            raise
+        finally:
+            for reader in readers:
+                reader.cancel()
+            transport.close()
+
+        return self.returncode
+
+    async def terminate(self) -> None:
+        """Terminates the agent process if it is still running, killing it if it does not exit in time"""
+        if self._process is None or self._process.returncode is not None:
+            return
+
+        log.info("Terminating agent command")
+        try:
+            self._process.terminate()
+            await asyncio.wait_for(asyncio.shield(self._exited), TERMINATE_TIMEOUT)
+        except ProcessLookupError:
+            pass
+        except asyncio.TimeoutError:
+            self._process.kill()
+            await self._exited
+        self.returncode = self._process.returncode
+
+    async def _read_output(self, stream: asyncio.StreamReader, name: str) -> None:
+        """Reads the stream in chunks until EOF, adding complete lines to the output buffer.
+           Lines longer than MAX_OUTPUT_LINE_LENGTH are truncated.
+        """
+        partial_line = b""
+        while True:
+            data = await stream.read(READ_CHUNK_SIZE)
+            if not data:
+                break
+
+            lines = (partial_line + data).split(b"\n")
+            partial_line = lines.pop()[:MAX_OUTPUT_LINE_LENGTH]
+            self._add_output(name, lines)
+
+        if partial_line:
+            self._add_output(name, [partial_line])
+
+    def _add_output(self, name: str, lines: List[bytes]) -> None:
+        """Adds the lines to the output buffer and shows the latest non blank line in the status"""
+        # Lines which would be pushed straight out of the ring buffer are not decoded
+        if self.output.maxlen:
+            lines = lines[-self.output.maxlen:]
+
+        latest_line = ""
+        for line in lines:
+            line = line[:MAX_OUTPUT_LINE_LENGTH].decode(errors="replace").rstrip("\r")
+            self.output.append((name, line))
+            latest_line = line.strip() or latest_line
+
+        # Once the process has exited the status shows its exit code
+        if latest_line and self.returncode is None:
+            self._set_status(AgentStatus(AGENT_RUNNING, latest_line))
+
+    def _on_exit(self) -> None:
+        """Stops the clock and shows the exit code once the process has exited"""
+        self.end_time = time.monotonic()
+        elapsed = self.get_elapsed_time()
+        log.info(f"Agent command exited with code {self.returncode} after {elapsed:.1f}s")
+        if self.clock_model:
+            self.clock_model.set_anchor(elapsed, "stopped")
+
+        state = AGENT_FINISHED if self.returncode == 0 else AGENT_FAILED
+        self._set_status(AgentStatus(state, f"exit code {self.returncode}"))
+        self.e_agent_exited.notify(self.returncode)
+
+    def _set_status(self, status: AgentStatus) -> None:
+        """Sets the status on the status model (if any)"""
+        if self.status_model:
+            self.status_model.set_status(status)
+
+    def cleanup(self) -> None:
+        """Handles runner cleanup tasks"""
+        self._event_manager.purge_all_events()
+
+
+class _AgentProcessProtocol(asyncio.subprocess.SubprocessStreamProtocol):
+    """Subprocess protocol which resolves the passed in future with the exit code as
+       soon as the process exits, whether or not its pipes have been closed
+    """
+    def __init__(self, exited: asyncio.Future, loop: asyncio.AbstractEventLoop) -> None:
+        super().__init__(limit=READ_CHUNK_SIZE, loop=loop)
+        self._exited = exited
+
+    def process_exited(self) -> None:
+        # The transport is released by the base protocol once both the process and its pipes are done
+        returncode = self._transport.get_returncode()
+        super().process_exited()
+        if not self._exited.done():
+            self._exited.set_result(returncode)
@@ -1,11 +1,44 @@
 from __future__ import annotations
 
+from chess_puzzle_ai_cli.modules.board.game_outcome import GameOutcomeTracker
+from chess_puzzle_ai_cli.modules.board.move_parse_cache import MoveParseCache
 from chess_puzzle_ai_cli.utils.event import EventManager, EventTopics
 from chess_puzzle_ai_cli.utils.logging import log
 import chess
-import chess.variant
 from random import randint
-from typing import List, Optional
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+
+class BoardLayout(NamedTuple):
+    """The display layout of the board for a single orientation. The
+       per square tables are indexed by the square number.
+    """
+    squares: Tuple[chess.Square, ...]  # square numbers in display order
+    rank_labels: Tuple[str, ...]  # the rank label of squares at the start of a rank, otherwise ""
+    start_of_rank: Tuple[bool, ...]
+    end_of_rank: Tuple[bool, ...]
+    file_labels: str
+
+
+def _create_board_layout(orientation: chess.Color) -> BoardLayout:
+    """Returns the board layout of the passed in orientation"""
+    ranks = range(7, -1, -1) if orientation is chess.WHITE else range(8)
+    files = list(range(8)) if orientation is chess.WHITE else list(range(7, -1, -1))
+    squares = tuple(chess.square(file, rank) for rank in ranks for file in files)
+
+    start_of_rank = tuple(chess.square_file(square) == files[0] for square in chess.SQUARES)
+    end_of_rank = tuple(chess.square_file(square) == files[-1] for square in chess.SQUARES)
+    rank_labels = tuple(chess.RANK_NAMES[chess.square_rank(square)] if start_of_rank[square] else ""
+                        for square in chess.SQUARES)
+    file_labels = "".join(chess.FILE_NAMES[file] + " " for file in files)
+    return BoardLayout(squares, rank_labels, start_of_rank, end_of_rank, file_labels)
+
+
+# The board layouts are computed once, so renders are only table lookups
+BOARD_LAYOUTS: Dict[chess.Color, BoardLayout] = {
+    chess.WHITE: _create_board_layout(chess.WHITE),
+    chess.BLACK: _create_board_layout(chess.BLACK),
+}
 
 
 class BoardModel:
@@ -16,7 +49,9 @@ class BoardModel:
         self.side_confirmed = side_confirmed  # flag to indicate if the users color is fully confirmed (e.g. online)
         self.highlight_move = chess.Move.null()
         self.premove_highlight = chess.Move.null()
-        self._game_over_result: Optional[chess.Outcome] = None
+        self._game_over_result: Optional[chess.Outcome] = None  # set on results the board can't tell (e.g. resignation)
+        self._outcome_tracker = GameOutcomeTracker(self.board)
+        self._move_parse_cache = MoveParseCache()
         self._log_init_info()
 
         self._event_manager = EventManager()
@@ -36,13 +71,22 @@ class BoardModel:
                 return chess.Board(fen=None, chess960=True)
             else:
                 return chess.Board.from_chess960_pos(randint(0, 959))
+        elif variant in ("standard", "chess"):
+            if fen:
+                return chess.Board(fen)
+            elif fen is None:
+                return chess.Board(fen=None)
+            else:
+                return chess.Board()
         else:
+            # Variant support is only loaded when a variant board is needed
+            from chess.variant import find_variant
             if fen:
-                return chess.variant.find_variant(variant)(fen)
+                return find_variant(variant)(fen)
             elif fen is None:
-                return chess.variant.find_variant(variant)(fen=None)
+                return find_variant(variant)(fen=None)
             else:
-                return chess.variant.find_variant(variant)()
+                return find_variant(variant)()
 
     def reinitialize_board(self, variant: str, orientation: chess.Color, fen: str = "", uci_last_move="", is_side_confirmed=True):
         """Reinitializes the existing board object to the new variant/fen.
@@ -55,6 +99,7 @@ class BoardModel:
             self.set_board_orientation(chess.WHITE if variant.lower() == "racingkings" else orientation, notify=False)
             self.highlight_move = chess.Move.from_uci(uci_last_move) if uci_last_move else chess.Move.null()
             self._game_over_result = None
+            self._outcome_tracker.reset(self.board)
             self.side_confirmed = is_side_confirmed
 
             self._log_init_info()
@@ -63,6 +108,23 @@ class BoardModel:
             log.error(f"Error while trying to reinitialize the board: {e}")
             raise
 
+    def load_board(self, board: chess.Board, orientation: chess.Color, notify=True) -> None:
+        """Replaces the board object with an already initialized board (e.g. a
+           prefetched puzzle). The last move on the boards move stack (if any)
+           is highlighted. If notify is false, a model update notification will not be sent.
+        """
+        self.board = board
+        self.initial_fen = board.root().fen()
+        self.set_board_orientation(orientation, notify=False)
+        self.highlight_move = board.peek() if board.move_stack else chess.Move.null()
+        self._game_over_result = None
+        self._outcome_tracker.reset(board)
+        self.side_confirmed = True
+
+        self._log_init_info()
+        if notify:
+            self._notify_board_model_updated(EventTopics.GAME_START)
+
     def reset(self, notify=True):
         """Fully restores the board to it's initial starting state.
            If notify is false, a model update notification will not be sent.
@@ -82,13 +144,13 @@ class BoardModel:
             if self.is_game_over():
                 raise Warning("The game has already ended")
 
-            move = move.strip()
-            move = self.board.push_san(move)
+            move = self._move_parse_cache.parse_move(self.board, move)
+            self._outcome_tracker.push(move)
             self.highlight_move = move
 
             if notify:
                 log.debug(f"Made move ({move})")
-                if not self.is_game_over():
+                if self._outcome_tracker.get_outcome() is None:
                     self._notify_board_model_updated(EventTopics.MOVE_MADE)
                 else:
                     self._notify_board_model_updated(EventTopics.MOVE_MADE, EventTopics.GAME_END)
@@ -114,7 +176,7 @@ class BoardModel:
             if self.is_game_over():
                 raise Warning("The game has already ended")
 
-            return str(self.board.parse_san(move))
+            return str(self._move_parse_cache.parse_move(self.board, move))
         except Exception as e:
             log.error(e)
             if isinstance(e, chess.InvalidMoveError):
@@ -126,6 +188,12 @@ class BoardModel:
             else:
                 raise e
 
+    def get_legal_moves(self) -> List[chess.Move]:
+        """Returns the legal moves in the current position. The
+           returned list must not be modified.
+        """
+        return self._move_parse_cache.get_legal_moves(self.board)
+
     def make_moves_from_list(self, move_list: list) -> None:
         """Attempts to make all moves in the provided move list.
            Raises a ValueError on an illegal move.
@@ -139,7 +207,47 @@ class BoardModel:
 
         if move_list:
             log.debug(f"Updated board with moves from list. Last move played: {move_list[-1]}")
-            self._notify_board_model_updated(EventTopics.MOVE_MADE)
+            if self._outcome_tracker.get_outcome() is None:
+                self._notify_board_model_updated(EventTopics.MOVE_MADE)
+            else:
+                self._notify_board_model_updated(EventTopics.MOVE_MADE, EventTopics.GAME_END)
+
+    def push_moves(self, moves: Iterable[chess.Move | str], validate=True, notify=True) -> None:
+        """Makes all the passed in moves (chess.Move objects or UCI strings) on the board
+           without SAN parsing. Moves are checked for legality unless validate is false
+           (e.g. for trusted puzzle lines). The game over check is only done once
+           after all moves are made. On an illegal move, the moves already made are
+           undone and a ValueError is raised. If notify is false, a model update
+           notification will not be sent, otherwise a single notification is sent.
+        """
+        if self.is_game_over():
+            raise Warning("The game has already ended")
+
+        board = self.board
+        pushed = 0
+        try:
+            for move in moves:
+                if not isinstance(move, chess.Move):
+                    move = chess.Move.from_uci(move)
+                if validate and not board.is_legal(move):
+                    raise chess.IllegalMoveError(f"illegal move: {move}")
+                self._outcome_tracker.push(move)
+                pushed += 1
+        except ValueError as e:
+            log.error(f"Exception caught while pushing moves: {e}")
+            for _ in range(pushed):
+                self._outcome_tracker.pop()
+            error = "Illegal" if isinstance(e, chess.IllegalMoveError) else "Invalid"
+            raise ValueError(f"{error} move: {move}") from e
+
+        if pushed:
+            self.highlight_move = board.peek()
+            if notify:
+                log.debug(f"Pushed {pushed} moves. Last move played: {self.highlight_move}")
+                if self._outcome_tracker.get_outcome() is None:
+                    self._notify_board_model_updated(EventTopics.MOVE_MADE)
+                else:
+                    self._notify_board_model_updated(EventTopics.MOVE_MADE, EventTopics.GAME_END)
 
     def takeback(self, caller_color: chess.Color):
         """Issues a takeback, so it's the callers move again. Raises a Warning if the move
@@ -155,9 +263,9 @@ class BoardModel:
             if len(self.board.move_stack) == 1 and not self.board.turn != caller_color:
                 raise Warning("Cannot take back opponents move")
 
-            self.board.pop()
+            self._outcome_tracker.pop()
             if self.board.turn != caller_color:
-                self.board.pop()
+                self._outcome_tracker.pop()
 
             self.highlight_move = self.board.peek() if len(self.board.move_stack) > 0 else chess.Move.null()
 
@@ -222,6 +330,7 @@ class BoardModel:
         try:
             self.board.set_fen(fen)
             self.initial_fen = fen
+            self._outcome_tracker.reset(self.board)
 
             if notify:
                 self._notify_board_model_updated()
@@ -229,22 +338,13 @@ class BoardModel:
             log.error(f"Error setting FEN: {e}")
             raise e
 
-    def get_board_squares(self) -> list:
-        """Returns the boards square numbers as a list based current board orientation"""
-        # Square numbers from white perspective
-        square_numbers = [56, 57, 58, 59, 60, 61, 62, 63,
-                          48, 49, 50, 51, 52, 53, 54, 55,
-                          40, 41, 42, 43, 44, 45, 46, 47,
-                          32, 33, 34, 35, 36, 37, 38, 39,
-                          24, 25, 26, 27, 28, 29, 30, 31,
-                          16, 17, 18, 19, 20, 21, 22, 23,
-                          8, 9, 10, 11, 12, 13, 14, 15,
-                          0, 1, 2, 3, 4, 5, 6, 7]
-
-        if self.orientation is chess.BLACK:
-            return square_numbers[::-1]
+    def get_board_layout(self) -> BoardLayout:
+        """Returns the board layout of the current board orientation"""
+        return BOARD_LAYOUTS[self.orientation]
 
-        return square_numbers
+    def get_board_squares(self) -> Tuple[chess.Square, ...]:
+        """Returns the boards square numbers in display order based on the current board orientation"""
+        return BOARD_LAYOUTS[self.orientation].squares
 
     @staticmethod
     def get_square_file_index(square: chess.Square) -> int:
@@ -255,15 +355,7 @@ class BoardModel:
         """Returns a string containing the file
            labels based on the board orientation
         """
-        file_labels = ""
-        if self.orientation is chess.BLACK:
-            for name in chess.FILE_NAMES[::-1]:
-                file_labels += name + " "
-        else:
-            for name in chess.FILE_NAMES:
-                file_labels += name + " "
-
-        return file_labels
+        return BOARD_LAYOUTS[self.orientation].file_labels
 
     @staticmethod
     def get_square_rank_index(square: chess.Square) -> int:
@@ -319,18 +411,16 @@ class BoardModel:
             log.error(f"Error caught setting board position: {e}")
 
     def is_game_over(self) -> bool:
-        """Returns True if the game is over"""
-        self._game_over_result = self.board.outcome() if self._game_over_result is None else self._game_over_result
-
-        is_game_over = self._game_over_result is not None
-        if is_game_over:
-            self._notify_board_model_updated(EventTopics.GAME_END)
-
-        return is_game_over
+        """Returns True if the game is over. This is only a query, the game end
+           notification is sent by the move which ended the game.
+        """
+        return self.get_game_over_result() is not None
 
     def get_game_over_result(self) -> chess.Outcome:
-        """Returns the reason the game ended as an Outcome object"""
-        return self._game_over_result if self._game_over_result else self.board.outcome()
+        """Returns the reason the game ended as an Outcome object, or None if the game
+           is not over. The outcome is cached until the position changes.
+        """
+        return self._game_over_result if self._game_over_result else self._outcome_tracker.get_outcome()
 
     def handle_resignation(self, color_resigning: chess.Color) -> None:
         """Handle marking the game as ended by resignation. The color
@@ -1,37 +1,231 @@
 from __future__ import annotations
-from cli_chess.modules.board import BoardView
-from cli_chess.modules.common import get_piece_unicode_symbol
-from cli_chess.utils.config import game_config
+from chess_puzzle_ai_cli.modules.board.board_view import BoardView
+from chess_puzzle_ai_cli.modules.common import get_piece_unicode_symbol
+from chess_puzzle_ai_cli.utils.config import game_config
+from chess_puzzle_ai_cli.utils.event import EventTopics
 import chess
-from typing import List, Dict
+from typing import List, Optional, Set, Tuple
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from chess_puzzle_ai_cli.modules.board.board_model import BoardModel
+    from chess_puzzle_ai_cli.utils.config import GameConfigValues
+    from chess_puzzle_ai_cli.utils.frame_scheduler import FrameScheduler
+
+# The piece strings of each (piece type, color), for unicode and letter pieces
+UNICODE_PIECE_STRS = {(piece_type, color): get_piece_unicode_symbol(chess.piece_symbol(piece_type))
+                      for piece_type in chess.PIECE_TYPES for color in chess.COLORS}
+LETTER_PIECE_STRS = {(piece_type, color): chess.piece_symbol(piece_type).upper()
+                     for piece_type in chess.PIECE_TYPES for color in chess.COLORS}
+
+
+class SquareDisplay:
+    """The display data of a single board square. The presenter keeps one
+       record per square and updates it in place on each render, so
+       renders don't allocate new display data.
+    """
+    __slots__ = ("square_number", "piece_str", "piece_display_color", "square_display_color", "rank_label", "is_end_of_rank")
+
+    def __init__(self, square_number: chess.Square, piece_str: str = "", piece_display_color: str = "",
+                 square_display_color: str = "", rank_label: str = "", is_end_of_rank: bool = False) -> None:
+        self.square_number = square_number
+        self.piece_str = piece_str
+        self.piece_display_color = piece_display_color
+        self.square_display_color = square_display_color
+        self.rank_label = rank_label
+        self.is_end_of_rank = is_end_of_rank
+
+    def set(self, piece_str: str, piece_display_color: str, square_display_color: str,
+            rank_label: str, is_end_of_rank: bool) -> bool:
+        """Updates the display data, returns True if it changed"""
+        if (self.piece_str == piece_str and self.piece_display_color == piece_display_color and
+                self.square_display_color == square_display_color and self.rank_label == rank_label and
+                self.is_end_of_rank == is_end_of_rank):
+            return False
+
+        self.piece_str = piece_str
+        self.piece_display_color = piece_display_color
+        self.square_display_color = square_display_color
+        self.rank_label = rank_label
+        self.is_end_of_rank = is_end_of_rank
+        return True
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, SquareDisplay):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self) -> str:
+        values = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"SquareDisplay({values})"
 
 
 class BoardPresenter:
-    def __init__(self, model: BoardModel) -> None:
+    def __init__(self, model: BoardModel, frame_scheduler: Optional[FrameScheduler] = None) -> None:
         self.model = model
-        self.game_config_values = game_config.get_all_values()
-        self.view = BoardView(self, self.get_board_display())
+        self.game_config_values = game_config.get_snapshot()
+
+        # If a frame scheduler is passed in, model updates are coalesced and rendered
+        # once per frame. Otherwise, each model update is rendered immediately.
+        self.frame_scheduler = frame_scheduler
+        self._full_render_pending = False
+
+        # The display record of each square (indexed by square number) and the records in
+        # display order. The records are updated in place, so the view always holds the
+        # latest display. The state of the last render is kept to only re-render the
+        # squares which changed.
+        self._square_records = [SquareDisplay(square) for square in chess.SQUARES]
+        self._board_records: List[SquareDisplay] = []
+        self._board_records_orientation: Optional[chess.Color] = None
+        self._board_snapshot: Tuple[int, ...] = ()
+        self._highlight_squares: Set[chess.Square] = set()
+
+        self._update_all_records()
+        self.view = BoardView(self, self._board_records)
 
         self.model.e_board_model_updated.add_listener(self.update)
         game_config.e_game_config_updated.add_listener(self._update_cached_config_values)
 
     def update(self, *args, **kwargs) -> None: # noqa
-        """Updates the board output"""
-        # TODO: Update this so the view utilizes a lambda pointing to the presenter?
-        #       This would allow for this update function to be removed
-        self.view.update(self.get_board_display())
+        """Updates the board output. Called on board model updates. Only the squares
+           whose display changed (pieces moved, or highlights and check changed) are
+           re-rendered. The full board is only re-rendered when a new game starts
+           or the board orientation changes.
+        """
+        if EventTopics.GAME_START in args or EventTopics.BOARD_ORIENTATION_CHANGED in args:
+            self._full_render_pending = True
+        self._schedule_render()
+
+    def _schedule_render(self) -> None:
+        """Renders the model updates on the next frame (or now, without a frame scheduler)"""
+        if self.frame_scheduler:
+            self.frame_scheduler.mark_dirty(self._render)
+        else:
+            self._render()
+
+    def _render(self) -> None:
+        """Renders the model updates since the last render"""
+        if self._full_render_pending:
+            self.render_full_board()
+        else:
+            self._render_changed_squares()
+
+    def render_full_board(self) -> None:
+        """Re-renders the complete board output"""
+        self._full_render_pending = False
+        self._update_all_records()
+        self.view.update(self._board_records)
+
+    def _render_changed_squares(self) -> None:
+        """Re-renders only the squares whose display changed since the last render. Squares
+           with changed pieces are found by diffing the piece bitboards with the last render.
+        """
+        board_snapshot = self._get_board_snapshot()
+        changed_mask = 0
+        for previous, current in zip(self._board_snapshot, board_snapshot):
+            changed_mask |= previous ^ current
+
+        highlight_squares = self._get_highlight_squares()
+        candidate_squares = set(chess.scan_forward(changed_mask)) | highlight_squares | self._highlight_squares
+        self._board_snapshot = board_snapshot
+        self._highlight_squares = highlight_squares
+
+        changed_squares = []
+        for square in candidate_squares:
+            record = self._square_records[square]
+            if self._update_record(record):
+                changed_squares.append(record)
+
+        if changed_squares:
+            self.view.update_squares(changed_squares)
+
+    def _update_all_records(self) -> None:
+        """Updates the display record of every square to the current board"""
+        for record in self._square_records:
+            self._update_record(record)
+        self._update_render_state()
+
+    def _update_render_state(self) -> None:
+        """Caches the state of the board being rendered, and orders the
+           square records for display if the board orientation changed
+        """
+        self._board_snapshot = self._get_board_snapshot()
+        self._highlight_squares = self._get_highlight_squares()
+
+        orientation = self.model.get_board_orientation()
+        if orientation != self._board_records_orientation:
+            self._board_records = [self._square_records[square] for square in self.model.get_board_squares()]
+            self._board_records_orientation = orientation
+
+    def _update_record(self, record: SquareDisplay) -> bool:
+        """Updates the passed in square display record to the current
+           board, returns True if the square display changed
+        """
+        square = record.square_number
+        board = self.model.board
+        piece_type = board.piece_type_at(square)
+        if piece_type:
+            color = bool(board.occupied_co[chess.WHITE] & chess.BB_SQUARES[square])
+            piece_display_color = "light-piece" if color else "dark-piece"
+            piece_str = self._get_piece_str(piece_type, color)
+        else:
+            piece_display_color = piece_str = ""
+
+        return record.set(piece_str, piece_display_color, self.get_square_display_color(square),
+                          self.get_rank_label(square), self.is_square_end_of_rank(square))
+
+    def _get_board_snapshot(self) -> Tuple[int, ...]:
+        """Returns the piece bitboards of the board"""
+        board = self.model.board
+        return (board.pawns, board.knights, board.bishops, board.rooks, board.queens, board.kings,
+                board.occupied_co[chess.WHITE], board.occupied_co[chess.BLACK])
+
+    def _get_highlight_squares(self) -> Set[chess.Square]:
+        """Returns the squares which are highlighted (last move, premove and check)"""
+        squares = set()
+        for move in (self.model.get_highlight_move(), self.model.premove_highlight):
+            if move:
+                squares.update((move.from_square, move.to_square))
+
+        king_square = self.model.board.king(self.model.board.turn)
+        if king_square is not None and self.model.board.is_check():
+            squares.add(king_square)
+        return squares
 
     def _update_cached_config_values(self):
         """Updates the 'game_config_values' variable with the
            latest configuration values from the game_config. Additionally,
            this will notify the board_view to update as there has been a change.
-           This function is called automatically on game config updates
+           This function is called automatically on game config updates, which
+           can be on a config watcher thread, so the board is re-rendered through
+           the frame scheduler (on the application's event loop).
+        """
+        self.game_config_values = game_config.get_snapshot()
+        self._full_render_pending = True
+        self._schedule_render()
+
+    def load_board(self, board: chess.Board, orientation: chess.Color, board_display: List[SquareDisplay],
+                   config_values: GameConfigValues) -> None:
+        """Loads an already initialized board into the model and displays the passed
+           in board display (as returned by `get_board_display`) for it. This allows
+           the display of a prefetched board to be precomputed off the UI thread.
+           The passed in config values are the game config values the board display
+           was computed with. If the game config has changed since, the board is
+           fully rendered with the current config values instead.
         """
-        self.game_config_values = game_config.get_all_values()
-        self.update()
+        self.model.load_board(board, orientation, notify=False)
+        self.game_config_values = game_config.get_snapshot()
+        if config_values != self.game_config_values:
+            self.render_full_board()
+            return
+
+        self._full_render_pending = False
+        for square_display in board_display:
+            self._square_records[square_display.square_number].set(
+                square_display.piece_str, square_display.piece_display_color, square_display.square_display_color,
+                square_display.rank_label, square_display.is_end_of_rank)
+
+        self._update_render_state()
+        self.view.update(self._board_records)
 
     def make_move(self, move: str) -> None:
         """Sends a move to the board model to attempt to make.
@@ -42,27 +236,19 @@ class BoardPresenter:
         except ValueError as e:
             raise e
 
-    def get_board_display(self) -> List[Dict]:
-        """Returns a list containing the complete board display. Each item in the list
-           is a dictionary containing the display data for that square (piece at,
-           piece color, square color, square number, etc). This data is generally sent
-           to the view to output the board display.
+    def get_board_display(self) -> List[SquareDisplay]:
+        """Returns a list containing the complete board display in display order. Each
+           item in the list is a new SquareDisplay record containing the display data
+           for that square (piece at, piece color, square color, square number, etc).
+           Unlike the records rendered by the presenter, these are not updated later.
         """
-        board_output = []
-        board_squares = self.model.get_board_squares()
-
-        # TODO: Update this implementation to use a dictionary so
-        #       the following syntax can be used: board_output[chess.D2]?
-        for square in board_squares:
-            data = {'square_number': square,
-                    'piece_str': self.get_piece_str(square),
-                    'piece_display_color': self.get_piece_display_color(self.model.board.piece_at(square)),
-                    'square_display_color': self.get_square_display_color(square),
-                    'rank_label': self.get_rank_label(square),
-                    'is_end_of_rank': self.is_square_end_of_rank(square)}
-            board_output.append(data)
-
-        return board_output
+        return [self.get_square_display(square) for square in self.model.get_board_squares()]
+
+    def get_square_display(self, square: chess.Square) -> SquareDisplay:
+        """Returns a new display record of the passed in square (see `get_board_display`)"""
+        record = SquareDisplay(square)
+        self._update_record(record)
+        return record
 
     def get_file_labels(self) -> str:
         """Returns a string containing the file labels. An empty
@@ -70,7 +256,7 @@ class BoardPresenter:
            is disabled in the configuration.
         """
         file_labels = ""
-        show_board_coordinates = self.game_config_values[game_config.Keys.SHOW_BOARD_COORDINATES] and self.model.is_side_confirmed()
+        show_board_coordinates = self.game_config_values.show_board_coordinates and self.model.is_side_confirmed()
 
         if show_board_coordinates:
             file_labels = self.model.get_file_labels()
@@ -81,36 +267,16 @@ class BoardPresenter:
         """Returns a label string if at the start of a rank
            otherwise an empty string will be returned
         """
-        rank_label = ""
-        rank_index = self.model.get_square_rank_index(square)
-        show_board_coordinates = self.game_config_values[game_config.Keys.SHOW_BOARD_COORDINATES] and self.model.is_side_confirmed()
-
-        if self.is_square_start_of_rank(square) and show_board_coordinates:
-            rank_label = self.model.get_rank_label(rank_index)
-
-        return rank_label
+        show_board_coordinates = self.game_config_values.show_board_coordinates and self.model.is_side_confirmed()
+        return self.model.get_board_layout().rank_labels[square] if show_board_coordinates else ""
 
     def is_square_start_of_rank(self, square: chess.Square) -> bool:
         """Returns True if the square passed in is the start of a rank"""
-        is_start_of_rank = False
-
-        if self.model.is_white_orientation() and chess.BB_SQUARES[square] & chess.BB_FILE_A:
-            is_start_of_rank = True
-        elif not self.model.is_white_orientation() and chess.BB_SQUARES[square] & chess.BB_FILE_H:
-            is_start_of_rank = True
-
-        return is_start_of_rank
+        return self.model.get_board_layout().start_of_rank[square]
 
     def is_square_end_of_rank(self, square: chess.Square) -> bool:
         """Returns True if the square passed in is the last on the rank"""
-        is_end_of_rank = False
-
-        if self.model.is_white_orientation() and chess.BB_SQUARES[square] & chess.BB_FILE_H:
-            is_end_of_rank = True
-        elif not self.model.is_white_orientation() and chess.BB_SQUARES[square] & chess.BB_FILE_A:
-            is_end_of_rank = True
-
-        return is_end_of_rank
+        return self.model.get_board_layout().end_of_rank[square]
 
     def get_piece_str(self, square: chess.Square):
         """Returns the piece at the square as a string. Depending on configuration
@@ -119,15 +285,15 @@ class BoardPresenter:
            not a piece at the square
         """
         piece = self.model.board.piece_at(square)
-        piece_str = ""
+        return self._get_piece_str(piece.piece_type, piece.color) if piece else ""
 
-        blindfold_chess = self.game_config_values[game_config.Keys.BLINDFOLD_CHESS]
-        use_unicode_pieces = self.game_config_values[game_config.Keys.USE_UNICODE_PIECES]
+    def _get_piece_str(self, piece_type: chess.PieceType, color: chess.Color) -> str:
+        """Returns the string of the passed in piece based on configuration settings"""
+        if self.game_config_values.blindfold_chess:
+            return ""
 
-        if piece and not blindfold_chess:
-            piece_str = get_piece_unicode_symbol(piece.symbol()) if use_unicode_pieces else piece.symbol().upper()
-
-        return piece_str
+        use_unicode_pieces = self.game_config_values.use_unicode_pieces
+        return (UNICODE_PIECE_STRS if use_unicode_pieces else LETTER_PIECE_STRS)[piece_type, color]
 
     @staticmethod
     def get_piece_display_color(piece: chess.Piece) -> str:
@@ -154,7 +320,7 @@ class BoardPresenter:
         else:
             square_color = "dark-square"
 
-        show_board_highlights = self.game_config_values[game_config.Keys.SHOW_BOARD_HIGHLIGHTS]
+        show_board_highlights = self.game_config_values.show_board_highlights
         if show_board_highlights:
             # TODO: Lighten last move square color if on light square
             try:
@@ -178,3 +344,9 @@ class BoardPresenter:
            resignation notification over to the model to be handled.
         """
         self.model.handle_resignation(color_resigning)
+
+    def cleanup(self) -> None:
+        """Handles presenter cleanup tasks. This should only ever
+           be run when this presenter is no longer needed.
+        """
+        game_config.e_game_config_updated.remove_listener(self._update_cached_config_values)
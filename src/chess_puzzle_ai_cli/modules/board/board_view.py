@@ -1,17 +1,50 @@
 from __future__ import annotations
-from cli_chess.utils.ui_common import repaint_ui
+from chess_puzzle_ai_cli.utils.ui_common import repaint_ui
 from prompt_toolkit.layout import Window, FormattedTextControl, D
-from prompt_toolkit.formatted_text import HTML
+from prompt_toolkit.formatted_text import FormattedText
 from prompt_toolkit.widgets import Box
+from typing import Dict, List, Tuple
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
-    from chess_puzzle_ai_cli.modules.board.board_presenter import BoardPresenter
+    import chess
+    from chess_puzzle_ai_cli.modules.board.board_presenter import BoardPresenter, SquareDisplay
+
+SQUARE_DISPLAY_COLORS = ("light-square", "dark-square", "last-move", "pre-move", "in-check")
+PIECE_DISPLAY_COLORS = ("", "light-piece", "dark-piece")
+
+# The style class string of each (square display color, piece display color) pair.
+# Precomputed so renders only do a lookup rather than formatting style strings.
+SQUARE_STYLES: Dict[Tuple[str, str], str] = {
+    (square_color, piece_color): f"class:{square_color}.{piece_color}" if piece_color else f"class:{square_color}"
+    for square_color in SQUARE_DISPLAY_COLORS for piece_color in PIECE_DISPLAY_COLORS
+}
+RANK_LABEL_STYLE = "class:rank-label"
+FILE_LABEL_STYLE = "class:file-label"
+NEWLINE_FRAGMENT = ("", "\n")
+EMPTY_SQUARE_TEXT = "  "
+
+# Fragments are immutable, so each distinct fragment is created once and shared across renders.
+# The square fragments are keyed by the square style and piece string.
+_label_fragments: Dict[Tuple[str, str], Tuple[str, str]] = {}
+_square_fragments: Dict[Tuple[str, str], Tuple[str, str]] = {}
+
+
+def _get_label_fragment(style: str, text: str) -> Tuple[str, str]:
+    """Returns the shared (style, text) fragment of a rank or file label"""
+    fragment = _label_fragments.get((style, text))
+    if fragment is None:
+        fragment = _label_fragments.setdefault((style, text), (style, text))
+    return fragment
 
 
 class BoardView:
     def __init__(self, presenter: BoardPresenter, initial_board_output: list):
         self.presenter = presenter
-        self.board_output = FormattedTextControl(HTML(self._build_output(initial_board_output)))
+        self._fragments = FormattedText()
+        self._square_fragment_index: Dict[chess.Square, int] = {}
+        self._board_output_list: List[SquareDisplay] = []
+        self._build_output(initial_board_output)
+        self.board_output = FormattedTextControl(lambda: self._fragments)
         self._container = self._create_container()
 
     def _create_container(self):
@@ -23,32 +56,75 @@ class BoardView:
             height=D(max=9, preferred=9)
         ), padding=1)
 
-    def _build_output(self, board_output_list: list) -> str:
-        """Returns a string containing the board output to be used for
-           display. The string returned will contain HTML elements"""
-        board_output_str = ""
+    def _build_output(self, board_output_list: List[SquareDisplay]) -> None:
+        """Builds the (style, text) fragments of the board output and the index
+           of each squares fragment, so single squares can be patched in place.
+           The fragments are passed to prompt_toolkit as is, no markup is parsed.
+        """
+        fragments = FormattedText()
+        square_fragment_index = {}
 
         for square in board_output_list:
-            square_style = f"{square['square_display_color']}.{square['piece_display_color']}"
-            piece_str = square['piece_str']
-            piece_str += " " if square['piece_str'] else "  "
-
-            board_output_str += f"<rank-label>{square['rank_label']}</rank-label>"
-            board_output_str += f"<{square_style}>{piece_str}</{square_style}>"
+            fragments.append(_get_label_fragment(RANK_LABEL_STYLE, square.rank_label))
+            square_fragment_index[square.square_number] = len(fragments)
+            fragments.append(self._get_square_fragment(square))
 
-            if square['is_end_of_rank']:
-                board_output_str += "\n"
+            if square.is_end_of_rank:
+                fragments.append(NEWLINE_FRAGMENT)
 
         file_labels = " " + self.presenter.get_file_labels()
-        board_output_str += f"<file-label>{file_labels}</file-label>"
+        fragments.append(_get_label_fragment(FILE_LABEL_STYLE, file_labels))
 
-        return board_output_str
+        self._fragments = fragments
+        self._square_fragment_index = square_fragment_index
+        self._board_output_list = board_output_list
 
-    def update(self, board_output_list: list):
-        """Updates the board output with the passed in text"""
-        self.board_output.text = HTML(self._build_output(board_output_list))
+    def _patch_output(self, board_output_list: List[SquareDisplay]) -> None:
+        """Patches the fragments of every square and label in place. The passed in board
+           output must have the same square order as the board output last built.
+        """
+        fragments = self._fragments
+        for square in board_output_list:
+            square_index = self._square_fragment_index[square.square_number]
+            fragments[square_index - 1] = _get_label_fragment(RANK_LABEL_STYLE, square.rank_label)
+            fragments[square_index] = self._get_square_fragment(square)
+
+        fragments[-1] = _get_label_fragment(FILE_LABEL_STYLE, " " + self.presenter.get_file_labels())
+
+    @staticmethod
+    def _get_square_fragment(square: SquareDisplay) -> Tuple[str, str]:
+        """Returns the (style, text) fragment of the passed in square display"""
+        square_style = SQUARE_STYLES[square.square_display_color, square.piece_display_color]
+        piece_str = square.piece_str
+        fragment = _square_fragments.get((square_style, piece_str))
+        if fragment is None:
+            fragment = _square_fragments.setdefault((square_style, piece_str),
+                                                    (square_style, piece_str + " " if piece_str else EMPTY_SQUARE_TEXT))
+        return fragment
+
+    def update(self, board_output_list: List[SquareDisplay]):
+        """Updates the complete board output from the passed in board display. If the
+           same board display list as last time is passed in (the presenter updates its
+           records in place) the output is patched in place rather than rebuilt.
+        """
+        if board_output_list is self._board_output_list:
+            self._patch_output(board_output_list)
+        else:
+            self._build_output(board_output_list)
         repaint_ui()
 
+    def update_squares(self, square_output_list: List[SquareDisplay]) -> None:
+        """Patches the output of only the passed in squares. The squares
+           must already be part of the board output.
+        """
+        for square in square_output_list:
+            self._fragments[self._square_fragment_index[square.square_number]] = self._get_square_fragment(square)
+        repaint_ui()
+
+    def get_output(self) -> FormattedText:
+        """Returns the (style, text) fragments of the current board output"""
+        return self._fragments
+
     def __pt_container__(self) -> Box:
         """Returns this container"""
         return self._container
@@ -0,0 +1,101 @@
+from __future__ import annotations
+from collections import Counter
+from typing import Hashable, List, Optional, Tuple
+import chess
+
+
+def get_repetition_key(board: chess.Board) -> Hashable:
+    """Returns the key python-chess compares positions by for repetitions. This
+       includes the variant specific state (e.g. crazyhouse pockets).
+    """
+    return board._transposition_key()  # noqa
+
+
+class GameOutcomeTracker:
+    """Tracks the outcome of the game on a board. Moves should be pushed and popped
+       through the tracker, which keeps a count of each position in the move stack
+       so fivefold repetition is an O(1) lookup rather than a replay of the move
+       stack. The outcome is cached until the position changes. Changes made to
+       the board directly (e.g. setting a FEN) are detected, and the position
+       counts are rebuilt from the move stack.
+    """
+    def __init__(self, board: chess.Board) -> None:
+        self.board = board
+        self._keys: List[Hashable] = []  # the position key after each move, starting at the root
+        self._counts: Counter = Counter()
+        self._outcome_key: Optional[Tuple[int, Hashable]] = None
+        self._outcome: Optional[chess.Outcome] = None
+        self.reset(board)
+
+    def reset(self, board: chess.Board) -> None:
+        """Tracks the passed in board, counting the positions of its move stack"""
+        self.board = board
+        self._outcome_key = None
+        self._outcome = None
+
+        replay_board = board.root()
+        self._keys = [get_repetition_key(replay_board)]
+        for move in board.move_stack:
+            replay_board.push(move)
+            self._keys.append(get_repetition_key(replay_board))
+        self._counts = Counter(self._keys)
+
+    def push(self, move: chess.Move) -> None:
+        """Pushes the passed in move onto the board"""
+        self._sync()
+        self.board.push(move)
+        key = get_repetition_key(self.board)
+        self._keys.append(key)
+        self._counts[key] += 1
+
+    def pop(self) -> chess.Move:
+        """Pops the last move from the board and returns it"""
+        self._sync()
+        move = self.board.pop()
+        self._counts[self._keys.pop()] -= 1
+        return move
+
+    def get_repetitions(self) -> int:
+        """Returns the number of times the current position has occurred"""
+        self._sync()
+        return self._counts[self._keys[-1]]
+
+    def get_outcome(self) -> Optional[chess.Outcome]:
+        """Returns the outcome of the game in the current position (the same as
+           `board.outcome()`), or None if the game is not over
+        """
+        self._sync()
+        outcome_key = (len(self._keys), self._keys[-1])
+        if outcome_key != self._outcome_key:
+            self._outcome = self._compute_outcome()
+            self._outcome_key = outcome_key
+        return self._outcome
+
+    def _compute_outcome(self) -> Optional[chess.Outcome]:
+        """Returns the outcome of the game, checking repetitions using the position counts"""
+        board = self.board
+        if board.is_variant_loss():
+            return chess.Outcome(chess.Termination.VARIANT_LOSS, not board.turn)
+        if board.is_variant_win():
+            return chess.Outcome(chess.Termination.VARIANT_WIN, board.turn)
+        if board.is_variant_draw():
+            return chess.Outcome(chess.Termination.VARIANT_DRAW, None)
+
+        if board.is_checkmate():
+            return chess.Outcome(chess.Termination.CHECKMATE, not board.turn)
+        if board.is_insufficient_material():
+            return chess.Outcome(chess.Termination.INSUFFICIENT_MATERIAL, None)
+        if not any(board.generate_legal_moves()):
+            return chess.Outcome(chess.Termination.STALEMATE, None)
+
+        if board.is_seventyfive_moves():
+            return chess.Outcome(chess.Termination.SEVENTYFIVE_MOVES, None)
+        if self._counts[self._keys[-1]] >= 5:
+            return chess.Outcome(chess.Termination.FIVEFOLD_REPETITION, None)
+
+        return None
+
+    def _sync(self) -> None:
+        """Rebuilds the position counts if the board was changed directly"""
+        if len(self.board.move_stack) + 1 != len(self._keys) or get_repetition_key(self.board) != self._keys[-1]:
+            self.reset(self.board)
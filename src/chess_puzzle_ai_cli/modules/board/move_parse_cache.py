@@ -0,0 +1,91 @@
+from __future__ import annotations
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional, Tuple, Union
+import chess
+
+DEFAULT_MOVE_CACHE_POSITIONS = 128
+MAX_CACHED_INPUTS_PER_POSITION = 64
+
+
+def get_position_key(board: chess.Board) -> Tuple[Hashable, ...]:
+    """Returns a key identifying the position on the board for move legality purposes
+       (the variant and chess960 mode, and python-chess's transposition key of the position:
+       piece placement, side to move, castling rights, en passant square and the variant
+       state such as crazyhouse pockets)
+    """
+    return type(board), board.chess960, board._transposition_key()  # noqa
+
+
+class _PositionMoves:
+    """The cached moves of a single position"""
+    def __init__(self) -> None:
+        self.legal_moves: Optional[List[chess.Move]] = None
+        self.parsed_moves: Dict[str, Union[chess.Move, ValueError]] = {}
+
+
+class MoveParseCache:
+    """A bounded LRU cache of parsed moves keyed by position. For each position the
+       SAN/UCI move strings parsed in it are mapped to their move (or the error
+       raised parsing them), alongside the positions legal move list. As the cache
+       is keyed by the position itself, entries never need to be invalidated, a
+       position change simply looks up a different entry. A cache must only be
+       used from a single thread.
+    """
+    def __init__(self, max_positions: int = DEFAULT_MOVE_CACHE_POSITIONS) -> None:
+        self.max_positions = max_positions
+        self.hits = 0
+        self.misses = 0
+        self._positions: "OrderedDict[Tuple[Hashable, ...], _PositionMoves]" = OrderedDict()
+
+    def parse_move(self, board: chess.Board, move: str) -> chess.Move:
+        """Returns the move parsed from the passed in SAN or UCI string in the boards current
+           position. Raises the python-chess ValueError subclass (InvalidMoveError,
+           IllegalMoveError or AmbiguousMoveError) if the move cannot be parsed.
+        """
+        move = move.strip()
+        position_moves = self._get_position_moves(board)
+        parsed_move = position_moves.parsed_moves.get(move)
+
+        if parsed_move is None:
+            self.misses += 1
+            try:
+                parsed_move = board.parse_san(move)
+            except ValueError as e:
+                parsed_move = e
+
+            if len(position_moves.parsed_moves) < MAX_CACHED_INPUTS_PER_POSITION:
+                position_moves.parsed_moves[move] = parsed_move
+        else:
+            self.hits += 1
+
+        if isinstance(parsed_move, ValueError):
+            # Raise a copy, so the cached error doesn't collect the traceback of each raise
+            raise type(parsed_move)(*parsed_move.args)
+        return parsed_move
+
+    def get_legal_moves(self, board: chess.Board) -> List[chess.Move]:
+        """Returns the legal moves in the boards current position. The
+           returned list is shared with the cache and must not be modified.
+        """
+        position_moves = self._get_position_moves(board)
+        if position_moves.legal_moves is None:
+            position_moves.legal_moves = list(board.legal_moves)
+        return position_moves.legal_moves
+
+    def clear(self) -> None:
+        """Removes all cached positions"""
+        self._positions.clear()
+
+    def _get_position_moves(self, board: chess.Board) -> _PositionMoves:
+        """Returns the cache entry of the boards current position, evicting
+           the least recently used position if the cache is full
+        """
+        key = get_position_key(board)
+        position_moves = self._positions.get(key)
+        if position_moves is None:
+            position_moves = self._positions[key] = _PositionMoves()
+            if len(self._positions) > self.max_positions:
+                self._positions.popitem(last=False)
+        else:
+            self._positions.move_to_end(key)
+        return position_moves
@@ -1,15 +1,106 @@
+from chess_puzzle_ai_cli.utils.event import EventManager
+from chess_puzzle_ai_cli.utils.file_watcher import FileWatcher
 from chess_puzzle_ai_cli.utils.logging import log
+from typing import NamedTuple, Optional
+import json
+import time
+
+CLOCK_DIRECTIONS = ("down", "up", "stopped")
+
+
+class ClockAnchor(NamedTuple):
+    """The clock time at a point in time (on the monotonic clock), and the direction
+       the clock counts from there. The displayed time is interpolated locally from this.
+    """
+    time: float
+    monotonic: float
+    direction: str
+
+    def get_time(self, now: Optional[float] = None) -> float:
+        """Returns the interpolated clock time at the passed in monotonic time (defaults to now)"""
+        elapsed = (time.monotonic() if now is None else now) - self.monotonic
+        if self.direction == "down":
+            return max(0.0, self.time - elapsed)
+        elif self.direction == "up":
+            return self.time + elapsed
+        return self.time
+
 
 class ClockModel:
-    def __init__(self, clock_file_path):
+    """Serves the time from the clock file written by the AI agent. The file holds
+       an anchor, so the agent only needs to write it when the clock changes:
+       `{"time": 120, "at": <unix time>, "direction": "down"}`. The time is
+       then counted down (or up) locally from the monotonic clock. A bare number
+       is also accepted, and is shown as a stopped clock. The file is only re-read
+       when it actually changes (see FileWatcher).
+    """
+    def __init__(self, clock_file_path: Optional[str]):
         self._clock_file_path = clock_file_path
-        self._time_left = 0.0
+        self._anchor = ClockAnchor(0.0, time.monotonic(), "stopped")
+
+        self._event_manager = EventManager()
+        self.e_clock_model_updated = self._event_manager.create_event()
+
+        self._watcher = None
+        if clock_file_path:
+            self._read_clock_file()
+            self._watcher = FileWatcher(clock_file_path, self._on_clock_file_changed)
+            self._watcher.start()
+
+    def get_time(self) -> float:
+        """Returns the current clock time, interpolated from the last anchor"""
+        return self._anchor.get_time()
 
-    def get_time(self):
+    def is_ticking(self) -> bool:
+        """Returns True if the clock is counting down (and not yet at zero) or up"""
+        return self._anchor.direction == "up" or (self._anchor.direction == "down" and self.get_time() > 0)
+
+    def get_direction(self) -> str:
+        """Returns the direction the clock is counting (down, up or stopped)"""
+        return self._anchor.direction
+
+    def set_anchor(self, time_left: float, direction: str = "stopped", wall_time: Optional[float] = None) -> None:
+        """Sets the clock to `time_left` at the passed in wall (unix) time, counting
+           in the passed in direction from there. The wall time defaults to now.
+           Raises a ValueError on an unknown direction.
+        """
+        if direction not in CLOCK_DIRECTIONS:
+            raise ValueError(f"Unknown clock direction: {direction}")
+
+        # Convert the wall time to the monotonic clock so local time adjustments do not affect the clock
+        age = 0.0 if wall_time is None else time.time() - wall_time
+        self._anchor = ClockAnchor(float(time_left), time.monotonic() - age, direction)
+        self._notify_clock_model_updated()
+
+    def _read_clock_file(self) -> bool:
+        """Reads the clock file and sets the clock anchor from it. Returns True
+           if the file was parsed. On read or parse errors the last anchor is kept.
+        """
         try:
             with open(self._clock_file_path, 'r') as f:
-                self._time_left = float(f.read().strip())
-        except (IOError, ValueError) as e:
+                contents = json.loads(f.read())
+
+            if isinstance(contents, dict):
+                self.set_anchor(float(contents['time']), contents.get('direction', "down"), contents.get('at'))
+            else:
+                self.set_anchor(float(contents))
+            return True
+        except (IOError, ValueError, KeyError, TypeError) as e:
             log.error(f"Error reading or parsing clock file: {e}")
-            self._time_left = 0.0
-        return self._time_left
+            return False
+
+    def _on_clock_file_changed(self) -> None:
+        """Re-reads the clock file, notifying listeners if the clock changed"""
+        self._read_clock_file()
+
+    def cleanup(self) -> None:
+        """Handles model cleanup tasks. This should only ever
+           be run when this model is no longer needed.
+        """
+        if self._watcher:
+            self._watcher.stop()
+        self._event_manager.purge_all_events()
+
+    def _notify_clock_model_updated(self) -> None:
+        """Notifies listeners of clock model updates"""
+        self.e_clock_model_updated.notify()
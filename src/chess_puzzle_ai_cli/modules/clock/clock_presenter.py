@@ -1,11 +1,46 @@
 from .clock_model import ClockModel
+from .clock_view import ClockView
+import asyncio
+
+CLOCK_TICK_INTERVAL = 1.0
+
 
 class ClockPresenter:
     def __init__(self, model: ClockModel):
         self._model = model
+        self.view = ClockView(self)
+
+        self._model.e_clock_model_updated.add_listener(self.update)
+
+    def update(self, *args, **kwargs) -> None: # noqa
+        """Updates the clock view. Called on clock model updates"""
+        self.view.update()
 
     def get_time_display(self) -> str:
         seconds = self._model.get_time()
         minutes = int(seconds / 60)
         seconds = int(seconds % 60)
         return f"{minutes:02d}:{seconds:02d}"
+
+    def is_clock_ticking(self) -> bool:
+        """Returns True if the clock is currently counting"""
+        return self._model.is_ticking()
+
+    async def run_clock_tick(self) -> None:
+        """Refreshes the clock view on a fixed tick while the clock is counting. This
+           should be run as a background task of the application event loop.
+        """
+        while True:
+            self.view.update()
+            await asyncio.sleep(self._get_next_tick_delay())
+
+    def _get_next_tick_delay(self) -> float:
+        """Returns the delay until the displayed second next changes, so
+           the displayed time stays accurate to the second
+        """
+        if not self._model.is_ticking():
+            return CLOCK_TICK_INTERVAL
+
+        fraction = self._model.get_time() % 1
+        delay = fraction if self._model.get_direction() == "down" else 1 - fraction
+        return min(CLOCK_TICK_INTERVAL, max(delay, 0.01) + 0.001)
@@ -1,13 +1,35 @@
-from prompt_toolkit.widgets import TextArea
-from .clock_presenter import ClockPresenter
+from __future__ import annotations
+from chess_puzzle_ai_cli.utils.ui_common import repaint_ui
+from prompt_toolkit.layout import Window, FormattedTextControl
+from prompt_toolkit.formatted_text import StyleAndTextTuples
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from .clock_presenter import ClockPresenter
+
 
 class ClockView:
     def __init__(self, presenter: ClockPresenter):
         self._presenter = presenter
-        self._text_area = TextArea(text=self._presenter.get_time_display(), height=1, width=5)
+        self.time_str = self._presenter.get_time_display()
+        self.is_ticking = self._presenter.is_clock_ticking()
+        self._clock_control = FormattedTextControl(self._get_clock_text)
+        self._container = Window(self._clock_control, height=1, width=5, always_hide_cursor=True)
 
     def __pt_container__(self):
-        return self._text_area
+        return self._container
+
+    def _get_clock_text(self) -> StyleAndTextTuples:
+        """Returns the formatted clock text"""
+        style = "class:clock.ticking" if self.is_ticking else "class:clock"
+        return [(style, self.time_str)]
 
-    def update(self):
-        self._text_area.text = self._presenter.get_time_display()
+    def update(self) -> None:
+        """Updates the displayed time, repainting the UI only if the display changed.
+           This is safe to call from the clock file watcher thread.
+        """
+        time_str = self._presenter.get_time_display()
+        is_ticking = self._presenter.is_clock_ticking()
+        if time_str != self.time_str or is_ticking != self.is_ticking:
+            self.time_str = time_str
+            self.is_ticking = is_ticking
+            repaint_ui()
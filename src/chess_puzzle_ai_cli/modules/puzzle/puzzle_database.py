@@ -0,0 +1,93 @@
+from __future__ import annotations
+from chess_puzzle_ai_cli.modules.puzzle.puzzle_store import get_puzzle_store_path
+from chess_puzzle_ai_cli.utils.logging import log
+from typing import Iterable, List, Optional
+import sqlite3
+import os
+
+DEFAULT_PUZZLE_DB_FILENAME = "puzzles.db"
+
+
+class PuzzleDatabase:
+    """Local puzzle id index backed by sqlite. Maps each Lichess PuzzleId to the
+       index of its record in the puzzle store. Puzzle ids are unique, so adding
+       a puzzle id that already exists is a no-op which allows for incremental
+       re-imports of the Lichess puzzle dump.
+    """
+    def __init__(self, store_path: str = "") -> None:
+        self.store_path = store_path if store_path else get_puzzle_store_path()
+        self.full_filename = os.path.join(self.store_path, DEFAULT_PUZZLE_DB_FILENAME)
+
+        if not os.path.exists(self.store_path):
+            os.makedirs(self.store_path)
+
+        self._connection = sqlite3.connect(self.full_filename)
+        self._create_tables()
+
+    def _create_tables(self) -> None:
+        """Creates the puzzle id table if it does not exist"""
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS puzzle_ids ("
+                "puzzle_id TEXT PRIMARY KEY, "
+                "record_index INTEGER NOT NULL)"
+            )
+
+    def begin_bulk_insert(self) -> None:
+        """Relaxes durability settings for the duration of a bulk import. The
+           database is only a local cache of the puzzle dump, so a crash mid
+           import at worst requires re-running the import.
+        """
+        self._connection.execute("PRAGMA journal_mode = WAL")
+        self._connection.execute("PRAGMA synchronous = OFF")
+
+    def end_bulk_insert(self) -> None:
+        """Restores the default durability settings after a bulk import. Puzzle ids
+           which were not committed (e.g. the import failed) are rolled back.
+        """
+        self._connection.rollback()
+        self._connection.execute("PRAGMA synchronous = FULL")
+
+    def add_puzzle_ids(self, puzzle_ids: Iterable[str], first_record_index: int) -> List[bool]:
+        """Adds the passed in puzzle ids in a single transaction, which is left open
+           until `commit` is called so the matching store records can be written
+           first. New puzzle ids are assigned consecutive record indexes starting at
+           `first_record_index`, puzzle ids which already exist are skipped. Returns
+           a list holding True for each puzzle id that was newly added.
+        """
+        added = []
+        record_index = first_record_index
+        try:
+            for puzzle_id in puzzle_ids:
+                cursor = self._connection.execute(
+                    "INSERT OR IGNORE INTO puzzle_ids VALUES (?, ?)", (puzzle_id, record_index)
+                )
+                is_new = cursor.rowcount == 1
+                record_index += is_new
+                added.append(is_new)
+        except sqlite3.Error:
+            self._connection.rollback()
+            raise
+        return added
+
+    def commit(self) -> None:
+        """Commits the puzzle ids added since the last commit"""
+        self._connection.commit()
+
+    def get_record_index(self, puzzle_id: str) -> Optional[int]:
+        """Returns the store record index of the passed in puzzle id, or None if it does not exist"""
+        row = self._connection.execute(
+            "SELECT record_index FROM puzzle_ids WHERE puzzle_id = ?", (puzzle_id,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def get_puzzle_count(self) -> int:
+        """Returns the number of puzzles in the database"""
+        return self._connection.execute("SELECT COUNT(*) FROM puzzle_ids").fetchone()[0]
+
+    def close(self) -> None:
+        """Closes the database connection"""
+        try:
+            self._connection.close()
+        except sqlite3.Error as e:
+            log.error(f"Error closing the puzzle database: {e}")
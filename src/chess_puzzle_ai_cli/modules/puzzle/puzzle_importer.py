@@ -0,0 +1,138 @@
+from __future__ import annotations
+from chess_puzzle_ai_cli.modules.puzzle.puzzle_database import PuzzleDatabase
+from chess_puzzle_ai_cli.modules.puzzle.puzzle_index import build_puzzle_index, get_puzzle_index_filename
+from chess_puzzle_ai_cli.modules.puzzle.puzzle_store import PuzzleStoreWriter, pack_puzzle
+from chess_puzzle_ai_cli.utils.logging import log
+from itertools import islice
+from typing import Callable, Iterator, NamedTuple, Optional, TextIO
+import bz2
+import csv
+import gzip
+import os
+
+IMPORT_BATCH_SIZE = 10000
+REQUIRED_COLUMNS = ("PuzzleId", "FEN", "Moves", "Rating", "Themes", "Popularity")
+
+
+class PuzzleRow(NamedTuple):
+    """A single puzzle as read from the Lichess puzzle CSV"""
+    puzzle_id: str
+    fen: str
+    moves: str
+    rating: int
+    themes: str
+    popularity: int
+
+
+class ImportResult(NamedTuple):
+    """Summary of a puzzle import run"""
+    rows_read: int
+    puzzles_added: int
+    rows_skipped: int
+
+
+def open_puzzle_csv(csv_path: str) -> TextIO:
+    """Opens the Lichess puzzle CSV for streaming. The file can be
+       either uncompressed, or compressed using bz2 (.bz2) or gzip (.gz)
+    """
+    if csv_path.endswith(".bz2"):
+        return bz2.open(csv_path, "rt", encoding="utf-8", newline="")
+    elif csv_path.endswith(".gz"):
+        return gzip.open(csv_path, "rt", encoding="utf-8", newline="")
+    else:
+        return open(csv_path, "r", encoding="utf-8", newline="")
+
+
+class PuzzleCsvReader:
+    """Iterates over the rows of a Lichess puzzle CSV file, yielding a PuzzleRow
+       for each row. The file is consumed row by row so memory use is constant
+       regardless of the file size. Malformed rows are logged and skipped.
+       Raises a ValueError if the CSV header is missing a required column.
+    """
+    def __init__(self, csv_file: TextIO) -> None:
+        self._reader = csv.reader(csv_file)
+        self.rows_skipped = 0
+
+    def __iter__(self) -> Iterator[PuzzleRow]:
+        header = next(self._reader, None)
+        if header is None:
+            return
+
+        missing_columns = [column for column in REQUIRED_COLUMNS if column not in header]
+        if missing_columns:
+            raise ValueError(f"Puzzle CSV is missing required columns: {', '.join(missing_columns)}")
+
+        id_idx, fen_idx, moves_idx, rating_idx, themes_idx, popularity_idx = (header.index(column) for column in REQUIRED_COLUMNS)
+        for row in self._reader:
+            try:
+                yield PuzzleRow(row[id_idx], row[fen_idx], row[moves_idx], int(row[rating_idx]),
+                                row[themes_idx], int(row[popularity_idx]))
+            except (IndexError, ValueError) as e:
+                log.warning(f"Skipping malformed puzzle row ({row[:1]}): {e}")
+                self.rows_skipped += 1
+
+
+def import_puzzles(csv_path: str, store_path: str = "", progress_callback: Optional[Callable[[int], None]] = None) -> ImportResult:
+    """Streams the Lichess puzzle CSV at the passed in path into the puzzle
+       store in batches. Puzzles already in the store are skipped, so re-running
+       an import only appends puzzles that are new. Puzzles which cannot be packed
+       into a store record are skipped. The optional progress callback is called
+       with the number of rows read after each batch. The puzzle indexes are
+       rebuilt once the import completes if any puzzles were added.
+    """
+    rows_read = 0
+    puzzles_added = 0
+    rows_skipped = 0
+
+    log.info(f"Importing puzzles from {csv_path}")
+    database = PuzzleDatabase(store_path)
+    writer = PuzzleStoreWriter(store_path)
+    database.begin_bulk_insert()
+    try:
+        # Records appended by an import which stopped before their puzzle ids were committed are dropped
+        puzzle_count = database.get_puzzle_count()
+        if writer.record_count > puzzle_count:
+            log.warning(f"Removing {writer.record_count - puzzle_count} puzzle records without a puzzle id")
+            writer.truncate(puzzle_count)
+
+        with open_puzzle_csv(csv_path) as csv_file:
+            reader = PuzzleCsvReader(csv_file)
+            rows = iter(reader)
+            while True:
+                batch = list(islice(rows, IMPORT_BATCH_SIZE))
+                if not batch:
+                    break
+
+                rows_read += len(batch)
+                puzzle_ids = []
+                records = []
+                for row in batch:
+                    try:
+                        records.append(pack_puzzle(*row))
+                        puzzle_ids.append(row.puzzle_id)
+                    except ValueError as e:
+                        log.warning(f"Skipping puzzle ({row.puzzle_id}): {e}")
+                        rows_skipped += 1
+
+                # The records are written out before their puzzle ids are committed,
+                # so a committed puzzle id always has its record in the store
+                added = database.add_puzzle_ids(puzzle_ids, writer.record_count)
+                new_records = [record for record, is_new in zip(records, added) if is_new]
+                writer.append_records(new_records)
+                database.commit()
+                puzzles_added += len(new_records)
+
+                if progress_callback:
+                    progress_callback(rows_read)
+            rows_skipped += reader.rows_skipped
+            rows_read += reader.rows_skipped
+    finally:
+        database.end_bulk_insert()
+        database.close()
+        writer.close()
+
+    log.info(f"Puzzle import finished. Read {rows_read} rows, added {puzzles_added} new puzzles, skipped {rows_skipped}")
+    if puzzles_added or not os.path.exists(get_puzzle_index_filename(store_path)):
+        build_puzzle_index(store_path)
+
+    return ImportResult(rows_read, puzzles_added, rows_skipped)
@@ -0,0 +1,189 @@
+from __future__ import annotations
+from chess_puzzle_ai_cli.modules.puzzle.puzzle_store import PuzzleStore, PUZZLE_THEMES, THEME_BITS, get_puzzle_store_path
+from chess_puzzle_ai_cli.utils.logging import log
+from array import array
+from bisect import bisect_left, bisect_right
+from random import randrange
+from typing import Container, Iterable, Optional
+import struct
+import mmap
+import os
+
+DEFAULT_PUZZLE_INDEX_FILENAME = "puzzles.idx"
+
+# File header: magic, format version, number of posting lists, number of indexed puzzles
+HEADER_STRUCT = struct.Struct("<4sHHI4x")
+HEADER_MAGIC = b"CPZI"
+INDEX_VERSION = 1
+
+# Table of contents entry for each posting list: data offset, number of entries.
+# List 0 holds every puzzle, list N holds the puzzles with theme bit N-1 set.
+TOC_STRUCT = struct.Struct("<QI4x")
+NUM_LISTS = len(PUZZLE_THEMES) + 1
+
+# Number of random probes into a rating band before falling back to a scan
+MAX_RANDOM_PROBES = 32
+
+
+def get_puzzle_index_filename(store_path: str = "") -> str:
+    """Returns the full filename of the puzzle index file"""
+    return os.path.join(store_path if store_path else get_puzzle_store_path(), DEFAULT_PUZZLE_INDEX_FILENAME)
+
+
+def build_puzzle_index(store_path: str = "") -> None:
+    """Builds the rating and theme secondary indexes of the puzzle store.
+       Each posting list (all puzzles, and one per theme) is stored as a
+       rating sorted array of ratings alongside the matching record indexes.
+       The index is written to a temporary file and moved into place, so
+       readers never see a partially written index.
+    """
+    store = PuzzleStore(store_path)
+    try:
+        count = len(store)
+        ratings = array("H", (store.get_rating(i) for i in range(count)))
+
+        # Counting sort the record indexes by rating
+        buckets = [0] * (max(ratings, default=0) + 2)
+        for rating in ratings:
+            buckets[rating + 1] += 1
+        for i in range(1, len(buckets)):
+            buckets[i] += buckets[i - 1]
+
+        sorted_records = array("I", bytes(4 * count))
+        for i, rating in enumerate(ratings):
+            sorted_records[buckets[rating]] = i
+            buckets[rating] += 1
+
+        # Walking the records in rating order keeps each theme list rating sorted
+        theme_ratings = [array("H") for _ in PUZZLE_THEMES]
+        theme_records = [array("I") for _ in PUZZLE_THEMES]
+        for i in sorted_records:
+            themes_mask = store.get_themes_mask(i)
+            while themes_mask:
+                low_bit = themes_mask & -themes_mask
+                bit = low_bit.bit_length() - 1
+                theme_ratings[bit].append(ratings[i])
+                theme_records[bit].append(i)
+                themes_mask ^= low_bit
+
+        posting_lists = [(array("H", (ratings[i] for i in sorted_records)), sorted_records)]
+        posting_lists.extend(zip(theme_ratings, theme_records))
+    finally:
+        store.close()
+
+    index_filename = get_puzzle_index_filename(store_path)
+    temp_filename = index_filename + ".tmp"
+    with open(temp_filename, "wb") as f:
+        f.write(HEADER_STRUCT.pack(HEADER_MAGIC, INDEX_VERSION, NUM_LISTS, count))
+
+        offset = HEADER_STRUCT.size + TOC_STRUCT.size * NUM_LISTS
+        for list_ratings, _ in posting_lists:
+            f.write(TOC_STRUCT.pack(offset, len(list_ratings)))
+            offset += _get_posting_list_size(len(list_ratings))
+
+        for list_ratings, list_records in posting_lists:
+            list_ratings.tofile(f)
+            f.write(bytes(_get_ratings_size(len(list_ratings)) - 2 * len(list_ratings)))
+            list_records.tofile(f)
+
+    os.replace(temp_filename, index_filename)
+    log.info(f"Built puzzle index for {count} puzzles")
+
+
+def _get_ratings_size(length: int) -> int:
+    """Returns the size of a ratings array, padded so the records array that follows is aligned"""
+    return (2 * length + 3) & ~3
+
+
+def _get_posting_list_size(length: int) -> int:
+    """Returns the size of a posting list (ratings and record indexes) in the index file"""
+    return _get_ratings_size(length) + 4 * length
+
+
+class PuzzleIndex:
+    """Memory mapped rating and theme indexes of the puzzle store. Used to
+       select a puzzle by rating band and themes with a bisect of the rating
+       sorted posting lists, without scanning the puzzle store. Raises a
+       ValueError if the index is not of this version or is out of date.
+    """
+    def __init__(self, store: PuzzleStore, store_path: str = "") -> None:
+        self.store = store
+        self.full_filename = get_puzzle_index_filename(store_path)
+        with open(self.full_filename, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, num_lists, count = HEADER_STRUCT.unpack_from(self._mmap, 0)
+        if magic != HEADER_MAGIC or version != INDEX_VERSION or num_lists != NUM_LISTS:
+            self._mmap.close()
+            raise ValueError(f"Unsupported puzzle index format: {self.full_filename}")
+
+        if count != len(store):
+            self._mmap.close()
+            raise ValueError(f"Puzzle index is out of date ({count} of {len(store)} puzzles indexed)")
+
+        self._view = memoryview(self._mmap)
+        self._posting_lists = []
+        for i in range(NUM_LISTS):
+            offset, length = TOC_STRUCT.unpack_from(self._mmap, HEADER_STRUCT.size + i * TOC_STRUCT.size)
+            records_offset = offset + _get_ratings_size(length)
+            self._posting_lists.append((self._view[offset:offset + 2 * length].cast("H"),
+                                        self._view[records_offset:records_offset + 4 * length].cast("I")))
+
+    def select_puzzle(self, rating: Optional[int] = None, rating_range: int = 100,
+                      themes: Iterable[str] = (), exclude: Container[int] = ()) -> Optional[int]:
+        """Returns the store record index of a random puzzle rated within `rating_range`
+           of `rating` which has all of the passed in themes and is not in `exclude`.
+           If rating is None, puzzles of any rating are considered. Returns None
+           if there is no matching puzzle. Raises a ValueError on unknown themes.
+        """
+        required_mask = 0
+        candidate_lists = []
+        for theme in themes:
+            if theme not in THEME_BITS:
+                raise ValueError(f"Unknown puzzle theme: {theme}")
+            required_mask |= THEME_BITS[theme]
+            candidate_lists.append(self._posting_lists[THEME_BITS[theme].bit_length()])
+
+        # Use the smallest rating band of the required themes as the candidate set
+        best_band = None
+        for ratings, records in candidate_lists or [self._posting_lists[0]]:
+            if rating is None:
+                band = (0, len(ratings), records)
+            else:
+                band = (bisect_left(ratings, rating - rating_range), bisect_right(ratings, rating + rating_range), records)
+            if best_band is None or band[1] - band[0] < best_band[1] - best_band[0]:
+                best_band = band
+
+        start, end, records = best_band
+        if start >= end:
+            return None
+
+        # Probe random candidates, this finds a match in constant time unless
+        # most of the band is excluded or missing one of the other themes
+        for _ in range(MAX_RANDOM_PROBES):
+            index = records[randrange(start, end)]
+            if self._is_candidate(index, required_mask, exclude):
+                return index
+
+        offset = randrange(start, end)
+        for position in range(end - start):
+            index = records[start + (offset + position) % (end - start)]
+            if self._is_candidate(index, required_mask, exclude):
+                return index
+
+        return None
+
+    def _is_candidate(self, index: int, required_mask: int, exclude: Container[int]) -> bool:
+        """Returns True if the puzzle at the index has all required themes and is not excluded"""
+        if index in exclude:
+            return False
+        return not required_mask or self.store.get_themes_mask(index) & required_mask == required_mask
+
+    def close(self) -> None:
+        """Unmaps the puzzle index file"""
+        for ratings, records in self._posting_lists:
+            ratings.release()
+            records.release()
+        self._posting_lists = []
+        self._view.release()
+        self._mmap.close()
@@ -0,0 +1,167 @@
+from __future__ import annotations
+from chess_puzzle_ai_cli.modules.board.board_model import BoardModel
+from chess_puzzle_ai_cli.modules.board.board_presenter import BoardPresenter, SquareDisplay
+from chess_puzzle_ai_cli.modules.puzzle.puzzle_session import PuzzleStep, compute_puzzle_steps
+from chess_puzzle_ai_cli.modules.puzzle.puzzle_store import PuzzleRecord
+from chess_puzzle_ai_cli.utils.common import threaded
+from chess_puzzle_ai_cli.utils.logging import log
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+import threading
+import queue
+import chess
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from chess_puzzle_ai_cli.modules.puzzle.puzzle_store import PuzzleStore
+    from chess_puzzle_ai_cli.modules.puzzle.puzzle_index import PuzzleIndex
+    from chess_puzzle_ai_cli.utils.config import GameConfigValues
+
+DEFAULT_PREFETCH_DEPTH = 3
+
+
+class DecodedPuzzle(NamedTuple):
+    """A puzzle that is fully decoded and ready to be played"""
+    record_index: int
+    record: PuzzleRecord
+    board: chess.Board
+    solution: List[chess.Move]
+    steps: Tuple[PuzzleStep, ...]  # the users solution steps, starting from the board position
+    board_display: List[SquareDisplay]
+    config_values: GameConfigValues  # the game config values the board display was computed with
+
+    def get_solver_color(self) -> chess.Color:
+        """Returns the color the user plays in the puzzle"""
+        return self.board.turn
+
+
+class PuzzleDecoder:
+    """Decodes puzzle records into a DecodedPuzzle. The decoder owns a board
+       model and presenter which are used to precompute the puzzles first
+       board display, so a decoder must only be used from a single thread.
+    """
+    def __init__(self) -> None:
+        self._model = BoardModel()
+        self._presenter = BoardPresenter(self._model)
+
+        # The decoder model is never displayed, so the presenter does not need model updates
+        self._model.e_board_model_updated.remove_listener(self._presenter.update)
+
+    def decode(self, record_index: int, record: PuzzleRecord) -> DecodedPuzzle:
+        """Returns the decoded puzzle. The returned board is positioned after the
+           opponents first move, which is where the user starts solving from.
+           The solution steps (including each opponent reply and every mate in
+           one) are precomputed, so playing the puzzle needs no move generation.
+           Raises a ValueError if the puzzle position or solution is invalid.
+        """
+        solution = [chess.Move.from_uci(move) for move in record.moves]
+        self._model.reinitialize_board("standard", not record.get_turn(), fen=record.fen)
+        self._model.push_moves(solution[:1], notify=False)
+        steps = compute_puzzle_steps(self._model.board, solution[1:])
+        return DecodedPuzzle(record_index, record, self._model.board, solution, steps,
+                             self._presenter.get_board_display(), self._presenter.game_config_values)
+
+    def cleanup(self) -> None:
+        """Handles decoder cleanup tasks"""
+        self._presenter.cleanup()
+        self._model.cleanup()
+
+
+class PuzzlePrefetcher:
+    """Keeps a bounded queue of the next puzzles fully decoded and ready to play.
+       The queue is filled by a background daemon thread, so getting the next
+       puzzle is only a queue pop. Puzzles are selected from the puzzle index
+       using the passed in rating and themes, and are never handed out twice.
+    """
+    def __init__(self, store: PuzzleStore, index: PuzzleIndex, rating: Optional[int] = None, rating_range: int = 100,
+                 themes: Iterable[str] = (), depth: int = DEFAULT_PREFETCH_DEPTH) -> None:
+        self.store = store
+        self.index = index
+        self.rating = rating
+        self.rating_range = rating_range
+        self.themes = list(themes)
+        self.capacity = depth
+
+        self.hits = 0
+        self.misses = 0
+
+        self._queue: "queue.Queue[Optional[DecodedPuzzle]]" = queue.Queue(maxsize=depth)
+        self._seen = set()
+        self._seen_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._exhausted = False
+        self._foreground_decoder: Optional[PuzzleDecoder] = None
+
+    def start(self) -> None:
+        """Starts filling the prefetch queue in the background"""
+        self._fill_queue()
+
+    def stop(self) -> None:
+        """Stops the background thread filling the prefetch queue"""
+        self._stopped.set()
+        log.debug(f"Puzzle prefetcher stopped: {self.get_stats()}")
+
+    def get_depth(self) -> int:
+        """Returns the number of decoded puzzles currently waiting in the queue"""
+        return self._queue.qsize()
+
+    def get_stats(self) -> dict:
+        """Returns the prefetch queue statistics (depth, capacity, hits and misses)"""
+        return {"depth": self.get_depth(), "capacity": self.capacity, "hits": self.hits, "misses": self.misses}
+
+    def get_next_puzzle(self) -> Optional[DecodedPuzzle]:
+        """Returns the next decoded puzzle. If the queue is empty (a miss) the next
+           puzzle is decoded on the calling thread instead of waiting on the
+           background thread. Returns None when no matching puzzles are left.
+        """
+        try:
+            puzzle = self._queue.get_nowait()
+            if puzzle is not None:
+                self.hits += 1
+                return puzzle
+            self._exhausted = True
+        except queue.Empty:
+            pass
+
+        if self._exhausted:
+            return None
+
+        self.misses += 1
+        if self._foreground_decoder is None:
+            self._foreground_decoder = PuzzleDecoder()
+        return self._select_and_decode(self._foreground_decoder)
+
+    @threaded
+    def _fill_queue(self) -> None:
+        """Keeps the prefetch queue filled until stopped or no matching puzzles are left"""
+        decoder = PuzzleDecoder()
+        try:
+            while not self._stopped.is_set():
+                puzzle = self._select_and_decode(decoder)
+                while not self._stopped.is_set():
+                    try:
+                        self._queue.put(puzzle, timeout=0.5)
+                        break
+                    except queue.Full:
+                        continue
+
+                if puzzle is None:
+                    break
+        except Exception as e:
+            log.error(f"Puzzle prefetcher stopped unexpectedly: {e}")
+        finally:
+            decoder.cleanup()
+
+    def _select_and_decode(self, decoder: PuzzleDecoder) -> Optional[DecodedPuzzle]:
+        """Selects the next unseen puzzle and returns it decoded. Puzzles which fail
+           to decode are skipped. Returns None if no matching puzzles are left.
+        """
+        while True:
+            with self._seen_lock:
+                record_index = self.index.select_puzzle(self.rating, self.rating_range, self.themes, self._seen)
+                if record_index is None:
+                    return None
+                self._seen.add(record_index)
+
+            try:
+                return decoder.decode(record_index, self.store.get_puzzle(record_index))
+            except ValueError as e:
+                log.error(f"Skipping puzzle at record {record_index}: {e}")
@@ -0,0 +1,70 @@
+from __future__ import annotations
+from chess_puzzle_ai_cli.modules.puzzle.puzzle_session import PuzzleSession, PuzzleMoveResult
+from chess_puzzle_ai_cli.modules.puzzle.puzzle_view import PuzzleView
+from chess_puzzle_ai_cli.utils.common import AlertType
+from chess_puzzle_ai_cli.utils.event import EventManager
+from chess_puzzle_ai_cli.utils.logging import log
+from typing import Optional
+import chess
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from chess_puzzle_ai_cli.modules.board.board_presenter import BoardPresenter
+    from chess_puzzle_ai_cli.modules.puzzle.puzzle_prefetcher import DecodedPuzzle
+
+
+class PuzzlePresenter:
+    """Plays the loaded puzzle on the board. The moves entered in the move input
+       are submitted to a PuzzleSession of the puzzle, and the result is shown
+       below the board. The puzzle solved event is notified (with the puzzle)
+       once the puzzle has been solved.
+    """
+    def __init__(self, board_presenter: BoardPresenter) -> None:
+        self.board_presenter = board_presenter
+        self.puzzle: Optional[DecodedPuzzle] = None
+        self.session: Optional[PuzzleSession] = None
+        self.view = PuzzleView(self)
+
+        self._event_manager = EventManager()
+        self.e_puzzle_solved = self._event_manager.create_event()
+
+    def start_puzzle(self, puzzle: DecodedPuzzle) -> None:
+        """Loads the passed in puzzle onto the board using its precomputed
+           board display, and starts a session checking moves against its
+           precomputed solution steps
+        """
+        self.board_presenter.load_board(puzzle.board, puzzle.get_solver_color(), puzzle.board_display, puzzle.config_values)
+        self.puzzle = puzzle
+        self.session = PuzzleSession(self.board_presenter.model, puzzle.steps)
+
+        color = chess.COLOR_NAMES[puzzle.get_solver_color()].capitalize()
+        self.view.show_alert(f"Puzzle {puzzle.record.puzzle_id} (rating {puzzle.record.rating}): {color} to move",
+                             AlertType.NEUTRAL)
+
+    def user_input_received(self, inpt: str) -> None:
+        """Submits the move entered by the user to the puzzle session"""
+        inpt = inpt.strip()
+        if not inpt:
+            return
+
+        if self.session is None or self.session.is_solved():
+            self.view.show_alert("There is no puzzle to solve", AlertType.ERROR)
+            return
+
+        try:
+            result = self.session.submit_move(inpt)
+        except ValueError as e:
+            self.view.show_alert(str(e) or f"Invalid move: {inpt}", AlertType.ERROR)
+            return
+
+        if result is PuzzleMoveResult.INCORRECT:
+            self.view.show_alert(f"{inpt} is not the best move, try again", AlertType.ERROR)
+        elif result is PuzzleMoveResult.CORRECT:
+            self.view.show_alert("Correct, keep going", AlertType.SUCCESS)
+        else:
+            log.info(f"Solved puzzle {self.puzzle.record.puzzle_id} with {self.session.mistakes} mistakes")
+            self.view.show_alert("Puzzle solved!", AlertType.SUCCESS)
+            self.e_puzzle_solved.notify(self.puzzle)
+
+    def cleanup(self) -> None:
+        """Handles presenter cleanup tasks"""
+        self._event_manager.purge_all_events()
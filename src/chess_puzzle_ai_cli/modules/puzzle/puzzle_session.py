@@ -0,0 +1,116 @@
+from __future__ import annotations
+from chess_puzzle_ai_cli.utils.logging import log
+from typing import FrozenSet, List, NamedTuple, Optional, Sequence, Tuple
+import chess
+import enum
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from chess_puzzle_ai_cli.modules.board.board_model import BoardModel
+
+
+class PuzzleStep(NamedTuple):
+    """A single user move of a puzzle solution, precomputed so
+       checking a move against it is only a set lookup
+    """
+    expected_move: chess.Move
+    mating_moves: FrozenSet[chess.Move]  # every mate in one in the steps position
+    reply: Optional[chess.Move]  # the opponents reply, None on the last step
+
+
+class PuzzleMoveResult(enum.Enum):
+    """The result of a move submitted to a puzzle session"""
+    CORRECT = enum.auto()
+    INCORRECT = enum.auto()
+    SOLVED = enum.auto()
+
+
+def compute_puzzle_steps(board: chess.Board, moves: Sequence[chess.Move]) -> Tuple[PuzzleStep, ...]:
+    """Returns the puzzle steps of the passed in solution line. The moves alternate
+       between the user and the opponent, starting with the users first move in
+       the boards position. The board is left unchanged. Raises a ValueError
+       if a move of the solution line is illegal.
+    """
+    board = board.copy()
+    steps: List[PuzzleStep] = []
+    for i in range(0, len(moves), 2):
+        expected_move = moves[i]
+        reply = moves[i + 1] if i + 1 < len(moves) else None
+        if not board.is_legal(expected_move):
+            raise ValueError(f"Illegal solution move: {expected_move}")
+
+        steps.append(PuzzleStep(expected_move, _get_mating_moves(board), reply))
+        board.push(expected_move)
+        if reply is not None:
+            if not board.is_legal(reply):
+                raise ValueError(f"Illegal solution move: {reply}")
+            board.push(reply)
+
+    return tuple(steps)
+
+
+def _get_mating_moves(board: chess.Board) -> FrozenSet[chess.Move]:
+    """Returns the moves which checkmate the opponent in the boards position"""
+    mating_moves = []
+    for move in board.generate_legal_moves():
+        if board.gives_check(move):
+            board.push(move)
+            if board.is_checkmate():
+                mating_moves.append(move)
+            board.pop()
+    return frozenset(mating_moves)
+
+
+class PuzzleSession:
+    """Plays a puzzle on a board model. Each submitted user move is checked
+       against the precomputed solution steps, and on a correct move the
+       opponents reply is played automatically. As with Lichess, any mate in
+       one solves the puzzle, even if it is not the move of the solution line.
+       The board model must be positioned at the start of the puzzle.
+    """
+    def __init__(self, model: BoardModel, steps: Sequence[PuzzleStep]) -> None:
+        self.model = model
+        self.steps = steps
+        self.mistakes = 0
+        self._step_index = 0
+
+    def check_move(self, move: chess.Move) -> bool:
+        """Returns True if the passed in move is a correct move in the current puzzle step"""
+        step = self.steps[self._step_index]
+        return move == step.expected_move or move in step.mating_moves
+
+    def submit_move(self, move: chess.Move | str) -> PuzzleMoveResult:
+        """Checks the passed in move (a chess.Move object, or a SAN or UCI string)
+           against the solution. A correct move is made on the board along with
+           the opponents reply. An incorrect move leaves the board unchanged.
+           Raises a ValueError if a move string is not a legal move, or a
+           Warning if the puzzle has already been solved.
+        """
+        if self.is_solved():
+            raise Warning("The puzzle has already been solved")
+        if not isinstance(move, chess.Move):
+            move = chess.Move.from_uci(self.model.verify_move(move))
+
+        if not self.check_move(move):
+            self.mistakes += 1
+            log.debug(f"Incorrect puzzle move: {move}")
+            return PuzzleMoveResult.INCORRECT
+
+        step = self.steps[self._step_index]
+        if move in step.mating_moves or step.reply is None:
+            self._step_index = len(self.steps)
+            self.model.push_moves((move,), validate=False)
+            return PuzzleMoveResult.SOLVED
+
+        self._step_index += 1
+        self.model.push_moves((move, step.reply), validate=False)
+        return PuzzleMoveResult.CORRECT
+
+    def get_expected_move(self) -> Optional[chess.Move]:
+        """Returns the expected solution move of the current step (e.g. for a hint),
+           or None if the puzzle is solved
+        """
+        return None if self.is_solved() else self.steps[self._step_index].expected_move
+
+    def is_solved(self) -> bool:
+        """Returns True if the puzzle has been solved"""
+        return self._step_index >= len(self.steps)
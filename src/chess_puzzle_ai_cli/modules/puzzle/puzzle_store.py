@@ -0,0 +1,330 @@
+from __future__ import annotations
+from chess_puzzle_ai_cli.utils.config import get_config_path
+from chess_puzzle_ai_cli.utils.logging import log
+from typing import List, NamedTuple, Tuple
+import struct
+import mmap
+import os
+
+DEFAULT_PUZZLE_STORE_FILENAME = "puzzles.bin"
+
+# File header: magic, format version, record size
+HEADER_STRUCT = struct.Struct("<4sHH8x")
+HEADER_MAGIC = b"CPZS"
+STORE_VERSION = 1
+
+# Fixed width puzzle record: puzzle id, packed board, rating, popularity,
+# number of solution moves, themes bitmask, solution moves (2 bytes each)
+MAX_SOLUTION_MOVES = 32
+RECORD_STRUCT = struct.Struct(f"<8s32sHbB16s{MAX_SOLUTION_MOVES * 2}s4x")
+RECORD_SIZE = RECORD_STRUCT.size
+RATING_OFFSET = 40
+THEMES_OFFSET = 44
+
+# Packed board: occupied bitboard, piece nibbles (in ascending square order),
+# flags (side to move + castling rights), en passant square, halfmove clock, fullmove number
+BOARD_STRUCT = struct.Struct("<Q16sBBBH3x")
+NO_EN_PASSANT = 0xFF
+PIECE_SYMBOLS = "pnbrqk"
+CASTLING_SYMBOLS = "KQkq"
+FILE_NAMES = "abcdefgh"
+PROMOTION_SYMBOLS = " pnbrqk"
+
+# The bit position of each theme in the themes bitmask. Themes
+# must only ever be appended as the position is stored on disk.
+PUZZLE_THEMES = (
+    "advancedPawn", "advantage", "anastasiaMate", "arabianMate", "attackingF2F7", "attraction",
+    "backRankMate", "bishopEndgame", "bodenMate", "capturingDefender", "castling", "clearance",
+    "crushing", "defensiveMove", "deflection", "discoveredAttack", "doubleBishopMate", "doubleCheck",
+    "dovetailMate", "enPassant", "endgame", "equality", "exposedKing", "fork",
+    "hangingPiece", "hookMate", "interference", "intermezzo", "kingsideAttack", "knightEndgame",
+    "long", "master", "masterVsMaster", "mate", "mateIn1", "mateIn2",
+    "mateIn3", "mateIn4", "mateIn5", "middlegame", "oneMove", "opening",
+    "pawnEndgame", "pin", "promotion", "queenEndgame", "queenRookEndgame", "queensideAttack",
+    "quietMove", "rookEndgame", "sacrifice", "short", "skewer", "smotheredMate",
+    "superGM", "trappedPiece", "underPromotion", "veryLong", "xRayAttack", "zugzwang",
+    "killBoxMate", "vukovicMate", "balestraMate", "blindSwineMate", "cornerMate", "epauletteMate",
+    "morphysMate", "operaMate", "pillsburysMate", "triangleMate",
+)
+THEME_BITS = {theme: 1 << bit for bit, theme in enumerate(PUZZLE_THEMES)}
+_unknown_themes = set()
+
+
+class PuzzleRecord(NamedTuple):
+    """A single puzzle decoded from the puzzle store"""
+    puzzle_id: str
+    fen: str
+    moves: Tuple[str, ...]
+    rating: int
+    themes: Tuple[str, ...]
+    popularity: int
+
+    def get_turn(self) -> bool:
+        """Returns True if white is to move in the puzzle FEN. The first
+           solution move is played by this side (the solvers opponent)
+        """
+        return self.fen.split(" ", 2)[1] == "w"
+
+
+def pack_fen(fen: str) -> bytes:
+    """Packs a standard chess FEN into its 32 byte bitboard-plus-flags form.
+       Raises a ValueError if the FEN cannot be represented.
+    """
+    parts = fen.split()
+    if len(parts) < 4:
+        raise ValueError(f"Invalid FEN: {fen}")
+
+    placement, turn, castling, ep_square = parts[:4]
+    halfmove_clock = int(parts[4]) if len(parts) > 4 else 0
+    fullmove_number = int(parts[5]) if len(parts) > 5 else 1
+
+    ranks = placement.split("/")
+    if len(ranks) != 8:
+        raise ValueError(f"Invalid FEN placement: {placement}")
+
+    pieces = {}
+    for rank_index, rank in enumerate(reversed(ranks)):
+        file_index = 0
+        for char in rank:
+            if char.isdigit():
+                file_index += int(char)
+            else:
+                piece_type = PIECE_SYMBOLS.find(char.lower())
+                if piece_type < 0 or file_index > 7:
+                    raise ValueError(f"Invalid FEN placement: {placement}")
+                pieces[rank_index * 8 + file_index] = (piece_type + 1) | (8 if char.isupper() else 0)
+                file_index += 1
+        if file_index != 8:
+            raise ValueError(f"Invalid FEN placement: {placement}")
+
+    if len(pieces) > 32:
+        raise ValueError(f"Too many pieces to pack: {fen}")
+
+    occupied = 0
+    nibbles = bytearray(16)
+    for i, square in enumerate(sorted(pieces)):
+        occupied |= 1 << square
+        nibbles[i >> 1] |= pieces[square] << (4 * (i & 1))
+
+    if turn not in ("w", "b"):
+        raise ValueError(f"Invalid FEN turn: {turn}")
+    flags = 1 if turn == "w" else 0
+    if castling != "-":
+        for char in castling:
+            bit = CASTLING_SYMBOLS.find(char)
+            if bit < 0:
+                raise ValueError(f"Unsupported FEN castling rights: {castling}")
+            flags |= 2 << bit
+
+    ep = NO_EN_PASSANT if ep_square == "-" else _parse_square(ep_square)
+    return BOARD_STRUCT.pack(occupied, bytes(nibbles), flags, ep, min(halfmove_clock, 255), min(fullmove_number, 0xFFFF))
+
+
+def unpack_fen(packed_board: bytes) -> str:
+    """Returns the FEN of a board packed with `pack_fen`"""
+    occupied, nibbles, flags, ep, halfmove_clock, fullmove_number = BOARD_STRUCT.unpack(packed_board)
+
+    board = [""] * 64
+    square = 0
+    i = 0
+    while occupied:
+        if occupied & 1:
+            piece = (nibbles[i >> 1] >> (4 * (i & 1))) & 0xF
+            symbol = PIECE_SYMBOLS[(piece & 7) - 1]
+            board[square] = symbol.upper() if piece & 8 else symbol
+            i += 1
+        occupied >>= 1
+        square += 1
+
+    ranks = []
+    for rank_index in range(7, -1, -1):
+        rank = ""
+        empty = 0
+        for symbol in board[rank_index * 8:rank_index * 8 + 8]:
+            if symbol:
+                rank += (str(empty) if empty else "") + symbol
+                empty = 0
+            else:
+                empty += 1
+        ranks.append(rank + (str(empty) if empty else ""))
+
+    castling = "".join(char for bit, char in enumerate(CASTLING_SYMBOLS) if flags & (2 << bit)) or "-"
+    ep_square = "-" if ep == NO_EN_PASSANT else FILE_NAMES[ep & 7] + str((ep >> 3) + 1)
+    return f"{'/'.join(ranks)} {'w' if flags & 1 else 'b'} {castling} {ep_square} {halfmove_clock} {fullmove_number}"
+
+
+def encode_move(uci: str) -> int:
+    """Encodes a UCI move into its 2 byte move code. The move code holds the from
+       square (bits 0-5), the to square (bits 6-11) and promotion piece type (bits 12-14).
+    """
+    if len(uci) not in (4, 5):
+        raise ValueError(f"Invalid UCI move: {uci}")
+
+    promotion = 0
+    if len(uci) == 5:
+        promotion = PROMOTION_SYMBOLS.find(uci[4])
+        if promotion < 2:
+            raise ValueError(f"Invalid UCI move promotion: {uci}")
+
+    return _parse_square(uci[0:2]) | (_parse_square(uci[2:4]) << 6) | (promotion << 12)
+
+
+def decode_move(move_code: int) -> str:
+    """Decodes a 2 byte move code into a UCI move string"""
+    from_square = move_code & 63
+    to_square = (move_code >> 6) & 63
+    promotion = move_code >> 12
+    uci = FILE_NAMES[from_square & 7] + str((from_square >> 3) + 1) + FILE_NAMES[to_square & 7] + str((to_square >> 3) + 1)
+    return uci + PROMOTION_SYMBOLS[promotion] if promotion else uci
+
+
+def encode_themes(themes: str) -> int:
+    """Returns the themes bitmask of a space separated themes string.
+       Themes that are not known are logged and ignored.
+    """
+    themes_mask = 0
+    for theme in themes.split():
+        bit = THEME_BITS.get(theme)
+        if bit:
+            themes_mask |= bit
+        elif theme not in _unknown_themes:
+            _unknown_themes.add(theme)
+            log.warning(f"Unknown puzzle theme ({theme}) will not be stored")
+    return themes_mask
+
+
+def decode_themes(themes_mask: int) -> Tuple[str, ...]:
+    """Returns the theme names set in the passed in themes bitmask"""
+    return tuple(theme for theme in PUZZLE_THEMES if themes_mask & THEME_BITS[theme])
+
+
+def pack_puzzle(puzzle_id: str, fen: str, moves: str, rating: int, themes: str, popularity: int) -> bytes:
+    """Packs a puzzle into a fixed width store record.
+       Raises a ValueError if the puzzle cannot be represented.
+    """
+    move_codes = [encode_move(move) for move in moves.split()]
+    if not move_codes or len(move_codes) > MAX_SOLUTION_MOVES:
+        raise ValueError(f"Unsupported number of solution moves ({len(move_codes)}) in puzzle {puzzle_id}")
+
+    encoded_id = puzzle_id.encode("ascii")
+    if len(encoded_id) > 8:
+        raise ValueError(f"Puzzle id is too long: {puzzle_id}")
+
+    return RECORD_STRUCT.pack(encoded_id, pack_fen(fen), max(0, min(rating, 0xFFFF)), max(-128, min(popularity, 127)),
+                              len(move_codes), encode_themes(themes).to_bytes(16, "little"),
+                              struct.pack(f"<{len(move_codes)}H", *move_codes))
+
+
+def get_puzzle_store_path() -> str:
+    """Returns the directory the local puzzle store lives in"""
+    return os.path.join(get_config_path(), "puzzles", "")
+
+
+def get_puzzle_store_filename(store_path: str = "") -> str:
+    """Returns the full filename of the puzzle record file"""
+    return os.path.join(store_path if store_path else get_puzzle_store_path(), DEFAULT_PUZZLE_STORE_FILENAME)
+
+
+def _parse_square(name: str) -> int:
+    """Returns the square index of a square name (e.g. e4)"""
+    file_index = FILE_NAMES.find(name[0]) if len(name) == 2 else -1
+    if file_index < 0 or name[1] not in "12345678":
+        raise ValueError(f"Invalid square: {name}")
+    return file_index + 8 * (int(name[1]) - 1)
+
+
+class PuzzleStore:
+    """Read only, memory mapped view of the puzzle record file. Each puzzle is a
+       fixed width record, so puzzle N is found through offset arithmetic alone.
+       Opening the store only maps the file, nothing is parsed up front.
+       Raises a ValueError if the file is not a puzzle store of this version.
+    """
+    def __init__(self, store_path: str = "") -> None:
+        self.full_filename = get_puzzle_store_filename(store_path)
+        with open(self.full_filename, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if hasattr(mmap, "MADV_RANDOM"):
+            self._mmap.madvise(mmap.MADV_RANDOM)
+
+        magic, version, record_size = HEADER_STRUCT.unpack_from(self._mmap, 0)
+        if magic != HEADER_MAGIC or version != STORE_VERSION or record_size != RECORD_SIZE:
+            self._mmap.close()
+            raise ValueError(f"Unsupported puzzle store format: {self.full_filename}")
+
+        self._count = (len(self._mmap) - HEADER_STRUCT.size) // RECORD_SIZE
+
+    def __len__(self) -> int:
+        return self._count
+
+    def get_puzzle(self, index: int) -> PuzzleRecord:
+        """Returns the decoded puzzle record at the passed in index"""
+        puzzle_id, packed_board, rating, popularity, num_moves, themes, moves = RECORD_STRUCT.unpack_from(self._mmap, self._get_offset(index))
+        move_codes = struct.unpack_from(f"<{num_moves}H", moves)
+        return PuzzleRecord(puzzle_id.rstrip(b"\0").decode("ascii"), unpack_fen(packed_board),
+                            tuple(decode_move(code) for code in move_codes), rating,
+                            decode_themes(int.from_bytes(themes, "little")), popularity)
+
+    def get_rating(self, index: int) -> int:
+        """Returns the rating of the puzzle at the passed in index without decoding the record"""
+        return struct.unpack_from("<H", self._mmap, self._get_offset(index) + RATING_OFFSET)[0]
+
+    def get_themes_mask(self, index: int) -> int:
+        """Returns the themes bitmask of the puzzle at the passed in index without decoding the record"""
+        offset = self._get_offset(index) + THEMES_OFFSET
+        return int.from_bytes(self._mmap[offset:offset + 16], "little")
+
+    def close(self) -> None:
+        """Unmaps the puzzle record file"""
+        self._mmap.close()
+
+    def _get_offset(self, index: int) -> int:
+        """Returns the file offset of the record at the passed in index"""
+        if not 0 <= index < self._count:
+            raise IndexError(f"Puzzle index out of range: {index}")
+        return HEADER_STRUCT.size + index * RECORD_SIZE
+
+
+class PuzzleStoreWriter:
+    """Appends packed puzzle records to the puzzle record file.
+       The file (and its header) is created if it does not exist.
+       A partial record left at the end of the file by an interrupted
+       write is truncated on open, so appends stay record aligned.
+    """
+    def __init__(self, store_path: str = "") -> None:
+        self.full_filename = get_puzzle_store_filename(store_path)
+        directory = os.path.dirname(self.full_filename)
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+
+        self._file = open(self.full_filename, "ab")
+        if self._file.tell() < HEADER_STRUCT.size:
+            self._file.truncate(0)
+            self._file.write(HEADER_STRUCT.pack(HEADER_MAGIC, STORE_VERSION, RECORD_SIZE))
+            self._file.flush()
+
+        self.record_count = (self._file.tell() - HEADER_STRUCT.size) // RECORD_SIZE
+        if self._file.tell() != self._get_size(self.record_count):
+            log.warning(f"Truncating a partial record from the end of the puzzle store: {self.full_filename}")
+            self.truncate(self.record_count)
+
+    def append_records(self, records: List[bytes]) -> None:
+        """Appends the passed in packed records to the end of the store"""
+        self._file.write(b"".join(records))
+        self._file.flush()
+        self.record_count += len(records)
+
+    def truncate(self, record_count: int) -> None:
+        """Removes the records past the passed in record count from the end of the store"""
+        self.record_count = min(self.record_count, record_count)
+        self._file.truncate(self._get_size(self.record_count))
+        self._file.seek(0, os.SEEK_END)
+
+    @staticmethod
+    def _get_size(record_count: int) -> int:
+        """Returns the file size of a store holding the passed in number of records"""
+        return HEADER_STRUCT.size + record_count * RECORD_SIZE
+
+    def close(self) -> None:
+        """Closes the puzzle record file"""
+        self._file.close()
@@ -0,0 +1,41 @@
+from __future__ import annotations
+from chess_puzzle_ai_cli.utils.common import AlertType
+from chess_puzzle_ai_cli.utils.ui_common import AlertContainer
+from prompt_toolkit.layout import HSplit, D
+from prompt_toolkit.widgets import TextArea
+from prompt_toolkit.buffer import Buffer
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from .puzzle_presenter import PuzzlePresenter
+
+
+class PuzzleView:
+    def __init__(self, presenter: PuzzlePresenter):
+        self._presenter = presenter
+        self.alert = AlertContainer()
+        self.input_field_container = self._create_input_field_container()
+        self._container = HSplit([self.alert, self.input_field_container])
+
+    def __pt_container__(self):
+        return self._container
+
+    def _create_input_field_container(self) -> TextArea:
+        """Returns a TextArea to use as the move input field"""
+        input_field = TextArea(height=D(max=1),
+                               prompt="Move: ",
+                               style="class:move-input",
+                               multiline=False,
+                               wrap_lines=True,
+                               focus_on_click=True)
+
+        input_field.accept_handler = self._accept_input
+        return input_field
+
+    def _accept_input(self, input: Buffer) -> None: # noqa
+        """Accept handler for the input field"""
+        self._presenter.user_input_received(input.text)
+        self.input_field_container.text = ''
+
+    def show_alert(self, text: str, alert_type: AlertType) -> None:
+        """Shows the passed in text below the board"""
+        self.alert.show_alert(text, alert_type)
@@ -0,0 +1,120 @@
+from chess_puzzle_ai_cli.utils.event import EventManager
+from chess_puzzle_ai_cli.utils.file_tailer import FileTailer
+from chess_puzzle_ai_cli.utils.file_watcher import FileWatcher
+from chess_puzzle_ai_cli.utils.logging import log
+from typing import NamedTuple, Optional
+import threading
+import json
+
+AGENT_RUNNING = "running"
+AGENT_FINISHED = "finished"
+AGENT_FAILED = "failed"
+AGENT_STATES = (AGENT_RUNNING, AGENT_FINISHED, AGENT_FAILED)
+
+
+class AgentStatus(NamedTuple):
+    """A status event written by the AI agent"""
+    state: str
+    message: str
+
+    def is_finished(self) -> bool:
+        """Returns True if the agent has finished (successfully or not)"""
+        return self.state != AGENT_RUNNING
+
+
+def parse_status_line(line: bytes) -> Optional[AgentStatus]:
+    """Parses a line of the status file. Lines are expected to be JSON objects such
+       as `{"status": "running", "message": "Running tests"}`, where status is one
+       of running, finished or failed. Plain text lines are treated as a running
+       status message. Returns None for blank or unparsable lines.
+    """
+    line = line.strip()
+    if not line:
+        return None
+
+    if not line.startswith(b"{"):
+        return AgentStatus(AGENT_RUNNING, line.decode(errors="replace"))
+
+    try:
+        event = json.loads(line)
+        state = str(event.get('status', AGENT_RUNNING)).lower()
+        if state not in AGENT_STATES:
+            raise ValueError(f"unknown status {state}")
+        return AgentStatus(state, str(event.get('message', "")))
+    except (ValueError, AttributeError) as e:
+        log.debug(f"Ignoring unparsable status line: {e}")
+        return None
+
+
+class StatusModel:
+    """Follows the status file appended to by the AI agent. The file is tailed
+       incrementally when it changes (see FileTailer), and as only the latest
+       status is displayed, each batch of appended lines is parsed from the
+       end, stopping at the first valid status event.
+    """
+    def __init__(self, status_file_path: Optional[str]):
+        self._status_file_path = status_file_path
+        self.status: Optional[AgentStatus] = None
+
+        self._event_manager = EventManager()
+        self.e_status_model_updated = self._event_manager.create_event()
+        self.e_agent_finished = self._event_manager.create_event()
+
+        self._tailer = None
+        self._tailer_lock = threading.Lock()
+        self._watcher = None
+        if status_file_path:
+            self._tailer = FileTailer(status_file_path)
+            self.read_status_file()
+            self._watcher = FileWatcher(status_file_path, self.read_status_file)
+            self._watcher.start()
+
+    def get_status(self) -> Optional[AgentStatus]:
+        """Returns the latest agent status, or None if the agent has not reported a status"""
+        return self.status
+
+    def is_agent_finished(self) -> bool:
+        """Returns True if the agent has reported that it finished"""
+        return self.status is not None and self.status.is_finished()
+
+    def read_status_file(self) -> None:
+        """Reads the lines appended to the status file since the last read and
+           updates the status from the latest status event in them
+        """
+        with self._tailer_lock:
+            lines = self._tailer.read_lines()
+
+        for line in reversed(lines):
+            status = parse_status_line(line)
+            if status:
+                self.set_status(status)
+                break
+
+    def set_status(self, status: AgentStatus) -> None:
+        """Sets the agent status, notifying listeners if it changed. The agent
+           finished event is notified when the agent first reports it finished.
+        """
+        if status == self.status:
+            return
+
+        was_finished = self.is_agent_finished()
+        self.status = status
+        self._notify_status_model_updated()
+
+        if status.is_finished() and not was_finished:
+            log.info(f"AI agent {status.state}: {status.message}")
+            self.e_agent_finished.notify(status)
+
+    def cleanup(self) -> None:
+        """Handles model cleanup tasks. This should only ever
+           be run when this model is no longer needed.
+        """
+        if self._watcher:
+            self._watcher.stop()
+        if self._tailer:
+            self._tailer.close()
+        self._event_manager.purge_all_events()
+
+    def _notify_status_model_updated(self) -> None:
+        """Notifies listeners of status model updates"""
+        self.e_status_model_updated.notify()
@@ -0,0 +1,30 @@
+from .status_model import StatusModel, AGENT_FINISHED, AGENT_FAILED
+from .status_view import StatusView
+from chess_puzzle_ai_cli.utils.common import AlertType
+from typing import Tuple
+
+
+class StatusPresenter:
+    def __init__(self, model: StatusModel):
+        self._model = model
+        self.view = StatusView(self)
+
+        self._model.e_status_model_updated.add_listener(self.update)
+
+    def update(self, *args, **kwargs) -> None: # noqa
+        """Updates the status banner. Called on status model updates"""
+        self.view.update()
+
+    def get_status_display(self) -> Tuple[str, AlertType]:
+        """Returns the status banner text and its alert type. The
+           text is empty if the agent has not reported a status
+        """
+        status = self._model.get_status()
+        if status is None:
+            return "", AlertType.NEUTRAL
+
+        if status.state == AGENT_FINISHED:
+            return f"AI agent finished{': ' + status.message if status.message else ''}", AlertType.SUCCESS
+        elif status.state == AGENT_FAILED:
+            return f"AI agent failed{': ' + status.message if status.message else ''}", AlertType.ERROR
+        return f"AI agent running{': ' + status.message if status.message else '...'}", AlertType.NEUTRAL
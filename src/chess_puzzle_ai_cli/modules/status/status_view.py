@@ -0,0 +1,23 @@
+from __future__ import annotations
+from chess_puzzle_ai_cli.utils.ui_common import AlertContainer
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from .status_presenter import StatusPresenter
+
+
+class StatusView:
+    def __init__(self, presenter: StatusPresenter):
+        self._presenter = presenter
+        self._status_banner = AlertContainer()
+        self.update()
+
+    def __pt_container__(self):
+        return self._status_banner
+
+    def update(self) -> None:
+        """Updates the status banner, hiding it if there is no status to show"""
+        text, alert_type = self._presenter.get_status_display()
+        if text:
+            self._status_banner.show_alert(text, alert_type)
+        else:
+            self._status_banner.clear_alert()
@@ -0,0 +1,212 @@
+"""Benchmarks of the board render pipeline. Each benchmark is timed relative to a fixed
+   pure Python calibration workload, which is timed interleaved with the benchmark so
+   a change in machine load affects both. The relative costs still differ between
+   interpreter versions (and to a lesser extent machines), so the JSON baseline holds
+   the relative costs per interpreter version. A benchmark that is slower than its
+   baseline by more than the regression threshold fails, and a benchmark without a
+   baseline for the running interpreter is only measured.
+
+   The benchmarks are skipped unless opted in:
+       CLI_CHESS_RUN_BENCHMARKS=1 pytest tests/benchmarks
+   To record a new baseline run:
+       CLI_CHESS_RUN_BENCHMARKS=1 CLI_CHESS_UPDATE_BENCHMARK_BASELINE=1 pytest tests/benchmarks
+   The threshold can be overridden with CLI_CHESS_BENCHMARK_THRESHOLD.
+"""
+from chess_puzzle_ai_cli.modules.board.board_model import BoardModel
+from chess_puzzle_ai_cli.modules.board.board_presenter import BoardPresenter
+from chess_puzzle_ai_cli.modules.board.board_view import BoardView
+from chess_puzzle_ai_cli.utils.config import GameConfig
+from prompt_toolkit.formatted_text import HTML, to_formatted_text
+from time import perf_counter
+from typing import Callable, Dict
+import platform
+from unittest.mock import Mock
+from os import remove
+import chess
+import json
+import gc
+import os
+import pytest
+
+pytestmark = pytest.mark.benchmark
+
+BASELINE_FILENAME = os.path.join(os.path.dirname(__file__), "board_render_baseline.json")
+INTERPRETER = f"{platform.python_implementation().lower()}-{platform.python_version_tuple()[0]}.{platform.python_version_tuple()[1]}"
+CALIBRATION_ITERATIONS = 200
+UPDATE_BASELINE = bool(os.environ.get("CLI_CHESS_UPDATE_BENCHMARK_BASELINE"))
+DEFAULT_REGRESSION_THRESHOLD = 2.0
+
+# The benchmark positions, and a white move to play from each for the update round trip
+POSITIONS = {
+    "start": (chess.STARTING_FEN, "Nf3"),
+    "middlegame": ("r1bq1rk1/pp2bppp/2n1pn2/3p4/2PP4/2N1PN2/PP3PPP/R2QKB1R w KQ - 0 8", "Bd3"),
+}
+PIECE_STYLES = {"unicode": True, "ascii": False}
+
+
+def _time_calls(workload: Callable, iterations: int) -> float:
+    """Returns the average time of a single call to the workload"""
+    start = perf_counter()
+    for _ in range(iterations):
+        workload()
+    return (perf_counter() - start) / iterations
+
+
+def _get_relative_cost(workload: Callable, iterations: int, repeats: int = 7) -> float:
+    """Returns the cost of a single call to the workload relative to the calibration workload.
+       The two are timed alternately, and the best time of each is compared. Garbage
+       collection is disabled while timing (as timeit does), as its pauses are noise.
+    """
+    best_time = best_calibration_time = float("inf")
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeats):
+            best_calibration_time = min(best_calibration_time, _time_calls(_calibration_workload, CALIBRATION_ITERATIONS))
+            best_time = min(best_time, _time_calls(workload, iterations))
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return best_time / best_calibration_time
+
+
+class _CalibrationSquare:
+    __slots__ = ("number", "label")
+
+    def __init__(self, number: int) -> None:
+        self.number = number
+        self.label = ""
+
+    def update(self, label: str) -> bool:
+        changed = label != self.label
+        self.label = label
+        return changed
+
+
+def _calibration_workload() -> None:
+    """A fixed pure Python workload the benchmark timings are relative to. Like the render
+       pipeline, it is a mix of attribute access, method calls, string building and lookups.
+    """
+    styles = {False: "dark", True: "light"}
+    squares = [_CalibrationSquare(number) for number in range(64)]
+    fragments = []
+    for square in squares:
+        if square.update(f"{styles[(square.number + square.number // 8) % 2 == 1]}.{square.number % 8}"):
+            fragments.append((square.label, str(square.number)))
+    "".join(text for _, text in sorted(fragments))
+
+
+def _build_html(presenter: BoardPresenter) -> HTML:
+    """Returns the board output built as HTML markup and parsed by prompt_toolkit"""
+    board_output_str = ""
+    for square in presenter.get_board_display():
+        square_style = f"{square.square_display_color}.{square.piece_display_color}"
+        piece_str = square.piece_str + " " if square.piece_str else "  "
+        board_output_str += f"<rank-label>{square.rank_label}</rank-label>"
+        board_output_str += f"<{square_style}>{piece_str}</{square_style}>"
+        if square.is_end_of_rank:
+            board_output_str += "\n"
+    board_output_str += f"<file-label> {presenter.get_file_labels()}</file-label>"
+    return HTML(board_output_str)
+
+
+@pytest.fixture(scope="module")
+def baseline():
+    try:
+        with open(BASELINE_FILENAME) as baseline_file:
+            baseline = json.load(baseline_file)
+    except FileNotFoundError:
+        baseline = {"threshold": DEFAULT_REGRESSION_THRESHOLD, "benchmarks": {}}
+
+    results: Dict[str, float] = {}
+    yield baseline, results
+
+    if UPDATE_BASELINE:
+        benchmarks = baseline["benchmarks"].setdefault(INTERPRETER, {})
+        benchmarks.update(results)
+        baseline["benchmarks"][INTERPRETER] = dict(sorted(benchmarks.items()))
+        baseline["benchmarks"] = dict(sorted(baseline["benchmarks"].items()))
+        with open(BASELINE_FILENAME, "w") as baseline_file:
+            json.dump(baseline, baseline_file, indent=2)
+            baseline_file.write("\n")
+
+
+@pytest.fixture
+def check_benchmark(baseline):
+    baseline, results = baseline
+    threshold = float(os.environ.get("CLI_CHESS_BENCHMARK_THRESHOLD", baseline["threshold"]))
+
+    def check(name: str, workload: Callable, iterations: int) -> None:
+        relative_cost = round(_get_relative_cost(workload, iterations), 3)
+        results[name] = relative_cost
+
+        baseline_cost = baseline["benchmarks"].get(INTERPRETER, {}).get(name)
+        if UPDATE_BASELINE or baseline_cost is None:
+            return
+        assert relative_cost <= baseline_cost * threshold, \
+            f"{name} regressed: {relative_cost} vs {INTERPRETER} baseline {baseline_cost} (threshold {threshold}x)"
+
+    return check
+
+
+@pytest.fixture(params=PIECE_STYLES)
+def game_config(request, monkeypatch):
+    test_game_config = GameConfig("unit_test_config.ini")
+    test_game_config.set_value(GameConfig.Keys.USE_UNICODE_PIECES, PIECE_STYLES[request.param])
+    monkeypatch.setattr('chess_puzzle_ai_cli.modules.board.board_presenter.game_config', test_game_config)
+    yield test_game_config
+    remove(test_game_config.full_filename)
+
+
+@pytest.fixture(params=POSITIONS)
+def position(request):
+    return request.param
+
+
+@pytest.fixture
+def presenter(position: str, game_config: GameConfig, monkeypatch):
+    # Outside a running application repainting creates a dummy application, which would dominate the timings
+    monkeypatch.setattr('chess_puzzle_ai_cli.modules.board.board_view.repaint_ui', Mock())
+    model = BoardModel(fen=POSITIONS[position][0])
+    presenter = BoardPresenter(model)
+    yield presenter
+    presenter.cleanup()
+
+
+def _get_piece_style(game_config: GameConfig) -> str:
+    return "unicode" if game_config.get_boolean(GameConfig.Keys.USE_UNICODE_PIECES) else "ascii"
+
+
+def test_board_model_construction(position: str, check_benchmark):
+    fen = POSITIONS[position][0]
+    check_benchmark(f"board_model_construction[{position}]", lambda: BoardModel(fen=fen), 200)
+
+
+def test_get_board_display(position: str, presenter: BoardPresenter, game_config: GameConfig, check_benchmark):
+    name = f"get_board_display[{position}-{_get_piece_style(game_config)}]"
+    check_benchmark(name, presenter.get_board_display, 500)
+
+
+def test_build_output(position: str, presenter: BoardPresenter, game_config: GameConfig, check_benchmark):
+    view = BoardView(presenter, presenter.get_board_display())
+    board_display = presenter.get_board_display()
+    name = f"build_output[{position}-{_get_piece_style(game_config)}]"
+    check_benchmark(name, lambda: view._build_output(board_display), 1000)  # noqa
+
+
+def test_html_parsing(position: str, presenter: BoardPresenter, game_config: GameConfig, check_benchmark):
+    name = f"html_parsing[{position}-{_get_piece_style(game_config)}]"
+    check_benchmark(name, lambda: to_formatted_text(_build_html(presenter)), 100)
+
+
+def test_update_round_trip(position: str, presenter: BoardPresenter, game_config: GameConfig, check_benchmark):
+    # A move and its takeback, each rendered through the model update event
+    model = presenter.model
+    move = POSITIONS[position][1]
+
+    def round_trip():
+        model.make_move(move)
+        model.takeback(chess.WHITE)
+
+    name = f"update_round_trip[{position}-{_get_piece_style(game_config)}]"
+    check_benchmark(name, round_trip, 300)
@@ -0,0 +1,20 @@
+import os
+import pytest
+
+# Timing and allocation tests depend on the machine and its load, so they
+# only run when opted in by setting this environment variable
+RUN_BENCHMARKS_ENV = "CLI_CHESS_RUN_BENCHMARKS"
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", f"benchmark: timing or allocation test, only run when {RUN_BENCHMARKS_ENV} is set")
+
+
+def pytest_collection_modifyitems(config, items):
+    if os.environ.get(RUN_BENCHMARKS_ENV):
+        return
+
+    skip_benchmark = pytest.mark.skip(reason=f"benchmarks only run when {RUN_BENCHMARKS_ENV} is set")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip_benchmark)
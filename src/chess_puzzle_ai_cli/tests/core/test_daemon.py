@@ -0,0 +1,132 @@
+from chess_puzzle_ai_cli.core.daemon_client import attach_to_daemon, create_attach_request, is_daemon_available, MessageReader, DaemonUnavailableError
+from chess_puzzle_ai_cli.core.daemon_server import PuzzleDaemon
+from concurrent.futures import ThreadPoolExecutor
+from time import sleep, monotonic
+import threading
+import asyncio
+import select
+import socket
+import sys
+import os
+import pytest
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    daemon = PuzzleDaemon(str(tmp_path / "daemon.sock"))
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_until_complete, args=(daemon.serve(),), daemon=True)
+    thread.start()
+
+    deadline = monotonic() + 5
+    while not is_daemon_available(daemon.socket_path) and monotonic() < deadline:
+        sleep(0.01)
+
+    yield daemon
+    loop.call_soon_threadsafe(daemon.stop)
+    thread.join(5)
+    assert not os.path.exists(daemon.socket_path)
+
+
+class Terminal:
+    """A pseudo terminal for a client to attach to the daemon"""
+    def __init__(self) -> None:
+        self.master_fd, self.slave_fd = os.openpty()
+        self.output = b""
+
+    def read_until(self, text: bytes, timeout: float = 5.0) -> bool:
+        deadline = monotonic() + timeout
+        while text not in self.output and monotonic() < deadline:
+            readable, _, _ = select.select([self.master_fd], [], [], 0.05)
+            if readable:
+                self.output += os.read(self.master_fd, 65536)
+        return text in self.output
+
+    def type(self, keys: bytes) -> None:
+        os.write(self.master_fd, keys)
+
+    def close(self) -> None:
+        os.close(self.master_fd)
+        os.close(self.slave_fd)
+
+
+def _attach(daemon: PuzzleDaemon, terminal: Terminal, **kwargs) -> int:
+    return attach_to_daemon(create_attach_request(**kwargs), daemon.socket_path, terminal.slave_fd, terminal.slave_fd)
+
+
+def test_message_reader():
+    reader = MessageReader()
+    assert reader.feed(b'{"type": "res') == []
+    assert reader.feed(b'ize"}\n{"type": "exit", "exit_code": 3}\n{') == [{"type": "resize"}, {"type": "exit", "exit_code": 3}]
+
+
+def test_daemon_sessions(daemon: PuzzleDaemon, tmp_path):
+    clock_file = tmp_path / "clock.txt"
+    clock_file.write_text("125")
+    terminals = [Terminal(), Terminal()]
+
+    # One daemon serves several terminals concurrently
+    with ThreadPoolExecutor(2) as executor:
+        sessions = [executor.submit(_attach, daemon, terminal, clock_file=str(clock_file)) for terminal in terminals]
+        for terminal in terminals:
+            assert terminal.read_until(b"02:05")
+        assert daemon.get_session_count() == 2
+
+        # Exiting one session leaves the other running
+        terminals[0].type(b"\x03")
+        assert sessions[0].result(5) == 0
+        assert daemon.get_session_count() == 1
+
+        terminals[1].type(b"\x11")
+        assert sessions[1].result(5) == 0
+
+    for terminal in terminals:
+        terminal.close()
+
+
+def test_daemon_run_mode(daemon: PuzzleDaemon, tmp_path):
+    terminal = Terminal()
+    with ThreadPoolExecutor(1) as executor:
+        session = executor.submit(_attach, daemon, terminal,
+                                  agent_command=[sys.executable, "-c", "print('agent output'); exit(4)"])
+        assert terminal.read_until(b"exit code 4")
+        terminal.type(b"\x03")
+
+        # The agent's exit code is returned to the client, and its output printed on the terminal
+        assert session.result(5) == 4
+        assert terminal.read_until(b"agent output")
+    terminal.close()
+
+
+def test_attach_without_daemon(tmp_path):
+    assert not is_daemon_available(str(tmp_path / "daemon.sock"))
+    with pytest.raises(DaemonUnavailableError):
+        attach_to_daemon(create_attach_request(), str(tmp_path / "daemon.sock"))
+
+
+def test_daemon_drops_attached_session(tmp_path):
+    # A daemon which accepts the session and then closes it
+    socket_path = str(tmp_path / "daemon.sock")
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(socket_path)
+    server.listen(1)
+
+    def drop_session():
+        connection, _ = server.accept()
+        _, fds, _, _ = socket.recv_fds(connection, 65536, 2)
+        for fd in fds:
+            os.close(fd)
+        connection.close()
+
+    thread = threading.Thread(target=drop_session, daemon=True)
+    thread.start()
+    terminal = Terminal()
+    try:
+        # The session was handed to the daemon, so this is not reported as the daemon being unavailable
+        with pytest.raises(ConnectionError) as error:
+            attach_to_daemon(create_attach_request(), socket_path, terminal.slave_fd, terminal.slave_fd)
+        assert not isinstance(error.value, DaemonUnavailableError)
+    finally:
+        thread.join(5)
+        server.close()
+        terminal.close()
@@ -1,6 +1,8 @@
 import pytest
+import argparse
 from unittest.mock import patch
-from chess_puzzle_ai_cli.__main__ import main
+from chess_puzzle_ai_cli.__main__ import main, _attach_to_daemon
+from chess_puzzle_ai_cli.core.daemon_client import DaemonUnavailableError
 
 
 def test_main_parses_arguments(tmp_path):
@@ -22,3 +24,19 @@ def test_main_parses_arguments(tmp_path):
             # Assert that the log.info was called with the correct arguments
             mock_log_info.assert_any_call(f"Received clock_file: {str(clock_file)}")
             mock_log_info.assert_any_call(f"Received status_file: {str(status_file)}")
+
+
+def test_attach_to_daemon_fallback(capsys):
+    args = argparse.Namespace(no_daemon=False, socket_path="daemon.sock", clock_file=None, status_file=None,
+                              rating=None, themes="", command="run", agent_command=["echo", "agent"])
+    with patch('chess_puzzle_ai_cli.core.daemon_client.is_daemon_available', return_value=True), \
+         patch('sys.stdin.isatty', return_value=True), patch('sys.stdout.isatty', return_value=True), \
+         patch('sys.stdin.fileno', return_value=0), patch('sys.stdout.fileno', return_value=1):
+        # The UI is shown locally if the session could not be handed to the daemon
+        with patch('chess_puzzle_ai_cli.core.daemon_client.attach_to_daemon', side_effect=DaemonUnavailableError()):
+            assert _attach_to_daemon(args) is None
+
+        # Once attached, a dropped session fails rather than running the agent command again locally
+        with patch('chess_puzzle_ai_cli.core.daemon_client.attach_to_daemon', side_effect=ConnectionError("closed")):
+            assert _attach_to_daemon(args) == 1
+        assert "closed" in capsys.readouterr().err
@@ -0,0 +1,53 @@
+from chess_puzzle_ai_cli.core.puzzle_app import PuzzleApp
+from chess_puzzle_ai_cli.modules.puzzle.puzzle_prefetcher import PuzzleDecoder
+from chess_puzzle_ai_cli.modules.puzzle.puzzle_store import PuzzleRecord
+from prompt_toolkit.application import create_app_session
+from prompt_toolkit.input import create_pipe_input
+from prompt_toolkit.output import DummyOutput
+from unittest.mock import Mock, patch
+import pytest
+
+PUZZLES = [
+    PuzzleRecord("000hf", "r1bqk2r/pp1nbNp1/2p1p2p/8/2BP4/1PN3P1/P3QP1P/3R1RK1 b kq - 0 19",
+                 ("e8f7", "e2e6", "f7f8", "e6f7"), 1589, ("mate", "mateIn2", "short"), 90),
+    PuzzleRecord("0000D", "5rk1/1p3ppp/pq3b2/8/8/1P1Q1N2/P4PPP/3R2K1 w - - 2 27",
+                 ("d3d6", "f8d8", "d6d8", "f6d8"), 1580, ("advantage", "short"), 90),
+]
+
+
+@pytest.fixture(autouse=True)
+def mock_repaint_ui():
+    with patch('chess_puzzle_ai_cli.utils.ui_common.repaint_ui') as mock:
+        yield mock
+
+
+@pytest.fixture
+def puzzles():
+    decoder = PuzzleDecoder()
+    puzzles = [decoder.decode(index, record) for index, record in enumerate(PUZZLES)]
+    decoder.cleanup()
+    return puzzles
+
+
+def test_next_puzzle_loaded_when_solved(puzzles):
+    prefetcher = Mock()
+    prefetcher.get_next_puzzle.side_effect = puzzles + [None]
+
+    with create_pipe_input() as pipe_input, create_app_session(input=pipe_input, output=DummyOutput()):
+        app = PuzzleApp(puzzle_prefetcher=prefetcher)
+        try:
+            assert app.puzzle_presenter.puzzle is puzzles[0]
+
+            # An incorrect move does not move on to the next puzzle
+            app.puzzle_presenter.user_input_received("Rfe1")
+            assert prefetcher.get_next_puzzle.call_count == 1
+
+            # Solving the puzzle takes the next puzzle from the prefetcher
+            app.puzzle_presenter.user_input_received("Qe6")
+            app.puzzle_presenter.user_input_received("Qf7#")
+            assert prefetcher.get_next_puzzle.call_count == 2
+            assert app.puzzle_presenter.puzzle is puzzles[1]
+            assert app.board_model.board.fen() == puzzles[1].board.fen()
+            assert not app.puzzle_presenter.session.is_solved()
+        finally:
+            app.cleanup()
@@ -0,0 +1,94 @@
+from chess_puzzle_ai_cli.core.daemon_client import get_daemon_socket_path
+from chess_puzzle_ai_cli.utils.config import get_config_path
+from typing import Dict
+import subprocess
+import sys
+import os
+import pytest
+
+# Modules which must not be imported before the puzzle UI is first painted
+DEFERRED_MODULES = ["cli_chess", "berserk", "requests", "urllib3", "chess.variant", "chess.engine", "chess.pgn", "sqlite3",
+                    "chess_puzzle_ai_cli.modules.puzzle.puzzle_importer", "chess_puzzle_ai_cli.modules.agent.agent_runner"]
+
+# The only package modules the thin daemon client may import
+CLIENT_MODULES = {"chess_puzzle_ai_cli", "chess_puzzle_ai_cli.__main__", "chess_puzzle_ai_cli.utils",
+                  "chess_puzzle_ai_cli.utils.logging", "chess_puzzle_ai_cli.core", "chess_puzzle_ai_cli.core.daemon_client"}
+
+# Import time (in microseconds) this package's own modules may take on the startup path. Only
+# the self times of the package modules are counted, so the import time of the UI stack
+# (prompt_toolkit and python-chess) and machine load don't add to it. The package modules
+# take about 22ms on python 3.9 (11ms on 3.11), so the budget leaves about 2x headroom.
+STARTUP_IMPORT_BUDGET = 50000
+PACKAGE_NAME = "chess_puzzle_ai_cli"
+
+# Runs the startup path up until the application would start running
+STARTUP_SCRIPT = """
+from unittest.mock import patch
+import prompt_toolkit.application
+import prompt_toolkit.widgets
+import chess
+{}
+"""
+# Imports the thin client path, taken when a puzzle daemon is running
+CLIENT_SCRIPT = """
+import chess_puzzle_ai_cli.__main__
+import chess_puzzle_ai_cli.core.daemon_client
+"""
+MAIN_SCRIPT = STARTUP_SCRIPT.format("""
+from chess_puzzle_ai_cli.__main__ import main
+with patch('sys.argv', ['chess-puzzle-ai-cli']), patch('prompt_toolkit.application.Application.run'):
+    main()
+""")
+
+
+def _run_with_importtime(script: str, home: str) -> Dict[str, int]:
+    """Runs the script with `-X importtime` and returns the self import time (in microseconds) of each imported module"""
+    env = dict(os.environ, HOME=home, PYTHONPATH=os.pathsep.join(sys.path))
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", script], env=env,
+                            capture_output=True, text=True, check=True)
+
+    import_times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            self_time, _, module = line[len("import time:"):].split("|")
+            if self_time.strip().isdigit():
+                import_times[module.strip()] = int(self_time)
+    return import_times
+
+
+def _get_best_package_import_time(script: str, home: str, runs: int = 3) -> int:
+    """Returns the lowest total self import time (in microseconds) of this package's modules over several runs of the script"""
+    return min(sum(import_time for module, import_time in _run_with_importtime(script, home).items()
+                   if module == PACKAGE_NAME or module.startswith(PACKAGE_NAME + "."))
+               for _ in range(runs))
+
+
+@pytest.fixture
+def home(tmp_path):
+    os.makedirs(tmp_path / ".config" / "cli-chess")
+    return str(tmp_path)
+
+
+def test_startup_defers_imports(home):
+    imported_modules = _run_with_importtime(MAIN_SCRIPT, home)
+    assert "chess_puzzle_ai_cli.modules.board.board_presenter" in imported_modules
+    for module in DEFERRED_MODULES:
+        assert module not in imported_modules, f"{module} should not be imported on startup"
+
+
+def test_client_imports(home):
+    imported_modules = _run_with_importtime(CLIENT_SCRIPT, home)
+    package_modules = {module for module in imported_modules if module == PACKAGE_NAME or module.startswith(PACKAGE_NAME + ".")}
+    assert package_modules == CLIENT_MODULES
+
+
+def test_client_socket_path(home, monkeypatch):
+    monkeypatch.setenv("HOME", home)
+    assert get_daemon_socket_path() == os.path.join(get_config_path(), "daemon.sock")
+    assert get_daemon_socket_path("daemon.sock") == "daemon.sock"
+
+
+def test_startup_import_budget(home):
+    # The best of several runs is compared to reduce noise
+    startup_time = _get_best_package_import_time(MAIN_SCRIPT, home)
+    assert 0 < startup_time < STARTUP_IMPORT_BUDGET
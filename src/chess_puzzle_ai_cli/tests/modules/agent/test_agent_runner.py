@@ -0,0 +1,122 @@
+from chess_puzzle_ai_cli.modules.agent.agent_runner import AgentRunner, MAX_OUTPUT_LINE_LENGTH
+from chess_puzzle_ai_cli.modules.clock.clock_model import ClockModel
+from chess_puzzle_ai_cli.modules.status.status_model import StatusModel, AgentStatus, AGENT_RUNNING, AGENT_FINISHED, AGENT_FAILED
+from unittest.mock import MagicMock
+import asyncio
+import time
+import sys
+import os
+import signal
+import pytest
+
+
+@pytest.fixture
+def models():
+    clock_model = ClockModel(None)
+    status_model = StatusModel(None)
+    yield clock_model, status_model
+    clock_model.cleanup()
+    status_model.cleanup()
+
+
+def _python_command(code: str):
+    return [sys.executable, "-c", code]
+
+
+def test_run(models):
+    clock_model, status_model = models
+    runner = AgentRunner(_python_command("import sys, time; print('working'); time.sleep(0.3); "
+                                         "print('oops', file=sys.stderr); print('done')"), clock_model, status_model)
+    exited_listener = MagicMock()
+    runner.e_agent_exited.add_listener(exited_listener)
+
+    async def run():
+        task = asyncio.ensure_future(runner.run())
+        await asyncio.sleep(0.2)
+
+        # While running the clock counts up from the process start and the status shows the latest output
+        assert clock_model.get_direction() == "up"
+        assert status_model.get_status() == AgentStatus(AGENT_RUNNING, "working")
+        return await task
+
+    assert asyncio.run(run()) == 0
+    assert runner.returncode == 0
+    assert sorted(runner.output) == [("stderr", "oops"), ("stdout", "done"), ("stdout", "working")]
+    exited_listener.assert_called_once_with(0)
+
+    # The clock stops at the elapsed time and the exit code is shown
+    assert clock_model.get_direction() == "stopped"
+    assert 0.3 <= clock_model.get_time() < 5
+    assert status_model.get_status() == AgentStatus(AGENT_FINISHED, "exit code 0")
+    assert status_model.is_agent_finished()
+
+
+def test_run_exit_with_pipes_open(models):
+    # The agent starts a background process which inherits (and holds open) its output pipes
+    clock_model, status_model = models
+    runner = AgentRunner(_python_command("import subprocess, sys; "
+                                         "child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)']); "
+                                         "print(child.pid, flush=True); sys.exit(2)"), clock_model, status_model)
+    start = time.monotonic()
+    try:
+        assert asyncio.run(runner.run()) == 2
+    finally:
+        os.kill(int(runner.get_output_lines()[0]), signal.SIGKILL)
+
+    # The exit is reported without waiting for the pipes to close
+    assert time.monotonic() - start < 10
+    assert status_model.get_status() == AgentStatus(AGENT_FAILED, "exit code 2")
+
+    # The elapsed time stops at the exit
+    elapsed = runner.get_elapsed_time()
+    time.sleep(0.05)
+    assert runner.get_elapsed_time() == elapsed == clock_model.get_time()
+
+
+def test_run_failed(models):
+    clock_model, status_model = models
+    runner = AgentRunner(_python_command("import sys; sys.exit(3)"), clock_model, status_model)
+    assert asyncio.run(runner.run()) == 3
+    assert status_model.get_status() == AgentStatus(AGENT_FAILED, "exit code 3")
+
+
+def test_run_missing_command():
+    with pytest.raises(ValueError):
+        AgentRunner([])
+
+    with pytest.raises(OSError):
+        asyncio.run(AgentRunner(["not-an-agent-command-that-exists"]).run())
+
+
+def test_output_ring_buffer():
+    runner = AgentRunner(_python_command(f"print('x' * {MAX_OUTPUT_LINE_LENGTH * 2}, flush=True)\n"
+                                         "for i in range(50000): print(f'line {i}')"), output_buffer_lines=100)
+    assert asyncio.run(runner.run()) == 0
+
+    # Only the most recent lines are kept, and overly long lines are truncated
+    assert runner.get_output_lines() == [f"line {i}" for i in range(49900, 50000)]
+
+    runner = AgentRunner(_python_command(f"print('x' * {MAX_OUTPUT_LINE_LENGTH * 2})"))
+    asyncio.run(runner.run())
+    assert runner.get_output_lines() == ["x" * MAX_OUTPUT_LINE_LENGTH]
+
+
+def test_run_cancelled(models):
+    clock_model, status_model = models
+    runner = AgentRunner(_python_command("import time; time.sleep(30)"), clock_model, status_model)
+
+    async def run():
+        task = asyncio.ensure_future(runner.run())
+        await asyncio.sleep(0.2)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    # Quitting the UI terminates the agent process
+    asyncio.run(run())
+    assert runner.returncode is not None and runner.returncode != 0
+    assert not status_model.is_agent_finished()
+
+
+def test_get_command_display():
+    assert AgentRunner(["agent", "--task", "fix the tests"]).get_command_display() == "agent --task 'fix the tests'"
@@ -1,4 +1,7 @@
-from chess_puzzle_ai_cli.modules.board.board_model import BoardModel
+from chess_puzzle_ai_cli.modules.board.board_model import BoardModel, BOARD_LAYOUTS
+from chess_puzzle_ai_cli.utils.event import EventTopics
+from random import Random
+from time import perf_counter
 from unittest.mock import Mock
 import pytest
 import chess
@@ -80,6 +83,24 @@ def test_reinitialize_board(model: BoardModel, board_updated_listener: Mock):
     assert model.get_highlight_move() == chess.Move.null()
 
 
+def test_load_board(model: BoardModel, board_updated_listener: Mock):
+    board = chess.Board("r1bqk2r/pp1nbNp1/2p1p2p/8/2BP4/1PN3P1/P3QP1P/3R1RK1 b kq - 0 19")
+    board.push_uci("e8f7")
+
+    model.load_board(board, chess.BLACK)
+    assert model.board is board
+    assert model.initial_fen == "r1bqk2r/pp1nbNp1/2p1p2p/8/2BP4/1PN3P1/P3QP1P/3R1RK1 b kq - 0 19"
+    assert model.get_board_orientation() == chess.BLACK
+    assert model.get_highlight_move() == chess.Move.from_uci("e8f7")
+    board_updated_listener.assert_called()
+
+    # Test without model update notification
+    board_updated_listener.reset_mock()
+    model.load_board(chess.Board(), chess.WHITE, notify=False)
+    assert model.get_highlight_move() == chess.Move.null()
+    board_updated_listener.assert_not_called()
+
+
 def test_make_move(model: BoardModel, board_updated_listener: Mock):
     # Test valid move
     try:
@@ -99,6 +120,12 @@ def test_make_move(model: BoardModel, board_updated_listener: Mock):
     assert model.get_highlight_move() == model.board.peek()
 
 
+def test_get_legal_moves(model: BoardModel):
+    assert model.get_legal_moves() == list(model.board.legal_moves)
+    model.make_move("e4")
+    assert model.get_legal_moves() == list(model.board.legal_moves)
+
+
 def test_make_moves_from_list(model: BoardModel, board_updated_listener: Mock):
     # Test a valid move sequence
     moves = ["e4", "g6", "d4", "Bg7"]
@@ -117,6 +144,59 @@ def test_make_moves_from_list(model: BoardModel, board_updated_listener: Mock):
     board_updated_listener.assert_not_called()
 
 
+def test_push_moves(model: BoardModel, board_updated_listener: Mock):
+    # Test pushing chess.Move objects and UCI strings with a single notification
+    model.push_moves([chess.Move.from_uci("e2e4"), "g7g6", "d2d4", chess.Move.from_uci("f8g7")])
+    assert model.board.fen() == "rnbqk1nr/ppppppbp/6p1/8/3PP3/8/PPP2PPP/RNBQKBNR w KQkq - 1 3"
+    assert model.get_highlight_move() == chess.Move.from_uci("f8g7")
+    board_updated_listener.assert_called_once_with(EventTopics.MOVE_MADE)
+
+    # Test an illegal and an invalid move undo the moves already pushed
+    board_updated_listener.reset_mock()
+    for moves in (["g1f3", "g7h8"], ["g1f3", "Nf6"]):
+        with pytest.raises(ValueError):
+            model.push_moves(moves)
+        assert model.board.peek() == chess.Move.from_uci("f8g7")
+        assert model.get_highlight_move() == chess.Move.from_uci("f8g7")
+    board_updated_listener.assert_not_called()
+
+    # Test the game over notification is sent once the moves are pushed
+    model.reset(notify=False)
+    model.push_moves(["f2f3", "e7e5", "g2g4", "d8h4"])
+    board_updated_listener.assert_called_once_with(EventTopics.MOVE_MADE, EventTopics.GAME_END)
+    with pytest.raises(Warning):
+        model.push_moves(["a2a3"])
+
+    # Test pushing without validation or notification
+    model.reset(notify=False)
+    board_updated_listener.reset_mock()
+    model.push_moves(["e2e4"], validate=False, notify=False)
+    assert model.board.peek() == chess.Move.from_uci("e2e4")
+    board_updated_listener.assert_not_called()
+
+
+@pytest.mark.benchmark
+def test_push_moves_speed(model: BoardModel):
+    # Generate a 300 ply game, and verify replaying it takes microseconds per ply
+    rng = Random(0)
+    board = chess.Board()
+    while len(board.move_stack) < 300:
+        if board.is_game_over():
+            board.reset()
+        board.push(rng.choice(list(board.legal_moves)))
+    moves = board.move_stack
+
+    replay_times = []
+    for _ in range(5):
+        model.reset(notify=False)
+        start = perf_counter()
+        model.push_moves(moves)
+        replay_times.append(perf_counter() - start)
+        assert model.board.board_fen() == board.board_fen()
+
+    assert min(replay_times) / len(moves) < 0.0001
+
+
 def test_takeback(model: BoardModel, board_updated_listener: Mock):
     # Test empty move stack
     model.board.reset()
@@ -268,11 +348,29 @@ def test_get_board_squares(model: BoardModel):
                       0, 1, 2, 3, 4, 5, 6, 7]
 
     # Test white board orientation
-    assert model.get_board_squares() == square_numbers
+    assert model.get_board_squares() == tuple(square_numbers)
 
     # Test black board orientation
     model.set_board_orientation(chess.BLACK)
-    assert model.get_board_squares() == square_numbers[::-1]
+    assert model.get_board_squares() == tuple(square_numbers[::-1])
+
+
+def test_get_board_layout(model: BoardModel):
+    layout = model.get_board_layout()
+    assert layout is BOARD_LAYOUTS[chess.WHITE]
+    assert layout.rank_labels[chess.A1] == "1" and layout.rank_labels[chess.A8] == "8"
+    assert layout.rank_labels[chess.H1] == "" and layout.rank_labels[chess.B4] == ""
+    assert layout.start_of_rank[chess.A5] and not layout.start_of_rank[chess.H5]
+    assert layout.end_of_rank[chess.H5] and not layout.end_of_rank[chess.A5]
+    assert layout.file_labels == "a b c d e f g h "
+
+    # Flipping the orientation switches to the other precomputed layout
+    model.set_board_orientation(chess.BLACK)
+    layout = model.get_board_layout()
+    assert layout is BOARD_LAYOUTS[chess.BLACK]
+    assert layout.rank_labels[chess.H1] == "1" and layout.rank_labels[chess.A1] == ""
+    assert layout.start_of_rank[chess.H5] and layout.end_of_rank[chess.A5]
+    assert layout.squares[0] == chess.H1 and layout.squares[-1] == chess.A8
 
 
 def test_get_square_file_index(model: BoardModel):
@@ -345,14 +443,18 @@ def test_set_board_position(model: BoardModel, board_updated_listener: Mock):
     assert model.get_highlight_move() == chess.Move.null()
 
 
-def test_is_game_over(model: BoardModel):
+def test_is_game_over(model: BoardModel, board_updated_listener: Mock):
     # Test game in progress
     model.set_fen("k7/8/8/8/8/8/8/K5Q1 w - - 0 1")
     assert not model.is_game_over()
 
-    # Test game over
+    # Test game over. The game end is notified by the move, not by querying it
+    board_updated_listener.reset_mock()
     model.make_move("Qb6")  # stalemate
+    board_updated_listener.assert_called_once_with(EventTopics.MOVE_MADE, EventTopics.GAME_END)
+    assert model.is_game_over()
     assert model.is_game_over()
+    board_updated_listener.assert_called_once()
 
 
 def test_get_game_over_result(model: BoardModel):
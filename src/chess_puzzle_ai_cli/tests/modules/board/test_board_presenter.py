@@ -1,9 +1,15 @@
 from chess_puzzle_ai_cli.modules.board.board_model import BoardModel
-from chess_puzzle_ai_cli.modules.board.board_presenter import BoardPresenter
+from chess_puzzle_ai_cli.modules.board.board_presenter import BoardPresenter, SquareDisplay
 from chess_puzzle_ai_cli.modules.common import get_piece_unicode_symbol
 from chess_puzzle_ai_cli.utils.config import GameConfig
+from chess_puzzle_ai_cli.utils.event import EventTopics
+from chess_puzzle_ai_cli.utils.frame_scheduler import FrameScheduler
 from os import remove
+from time import perf_counter
+import tracemalloc
+import threading
 import chess
+import asyncio
 from unittest.mock import Mock
 import pytest
 
@@ -32,13 +38,173 @@ def test_update(model: BoardModel, presenter: BoardPresenter, game_config: GameC
     # Verify the update method is listening to model updates
     assert presenter.update in model.e_board_model_updated.listeners
 
-    # Verify the board presenter update function is calling the board view
-    # update function and passing in the board output data
-    model.make_move("Nf3")
+    # Verify a move only sends the changed squares to the view
     presenter.view.update = Mock()
+    presenter.view.update_squares = Mock()
+    model.make_move("Nf3")
+    presenter.view.update.assert_not_called()
+    changed_squares = {square.square_number for square in presenter.view.update_squares.call_args.args[0]}
+    assert changed_squares == {chess.G1, chess.F3}
+
+    # Verify nothing is sent to the view if the display has not changed
+    presenter.view.update_squares.reset_mock()
     presenter.update()
-    board_output_data = presenter.get_board_display()
-    presenter.view.update.assert_called_with(board_output_data)
+    presenter.view.update_squares.assert_not_called()
+
+    # Verify the full board output is sent on orientation changes and new games
+    model.set_board_orientation(chess.BLACK)
+    presenter.view.update.assert_called_with(presenter.get_board_display())
+    model.reset()
+    presenter.view.update.assert_called_with(presenter.get_board_display())
+
+
+def test_update_matches_full_render(model: BoardModel, presenter: BoardPresenter):
+    # Verify patching the changed squares results in the same output as a full render
+    for move in ["e4", "f5", "Qh5+", "g6", "exf5", "Nf6"]:
+        model.make_move(move)
+        incremental_output = list(presenter.view.get_output())
+        presenter.render_full_board()
+        assert incremental_output == presenter.view.get_output()
+
+    model.set_premove_highlight(chess.Move.from_uci("f5g6"))
+    incremental_output = list(presenter.view.get_output())
+    presenter.render_full_board()
+    assert incremental_output == presenter.view.get_output()
+
+    model.clear_premove_highlight()
+    model.takeback(chess.WHITE)
+    incremental_output = list(presenter.view.get_output())
+    presenter.render_full_board()
+    assert incremental_output == presenter.view.get_output()
+
+
+def test_update_frame_scheduler(model: BoardModel, game_config: GameConfig, monkeypatch):
+    # Verify a burst of model updates is rendered once per frame
+    monkeypatch.setattr('chess_puzzle_ai_cli.modules.board.board_presenter.game_config', game_config)
+    frame_scheduler = FrameScheduler()
+    presenter = BoardPresenter(model, frame_scheduler)
+    presenter.view.update = Mock()
+    presenter.view.update_squares = Mock()
+    moves = ["e4", "e5", "Nf3", "Nc6", "Bb5", "a6", "Ba4", "Nf6", "O-O", "Be7"]
+
+    async def replay_moves():
+        model.set_board_orientation(chess.BLACK)
+        for move in moves:
+            model.make_move(move)
+            model.set_premove_highlight(chess.Move.from_uci("e1g1"))
+            model.clear_premove_highlight()
+        presenter.view.update.assert_not_called()
+        await asyncio.sleep(0)
+
+    asyncio.run(replay_moves())
+    assert frame_scheduler.frame_count == 1
+    presenter.view.update.assert_called_once_with(presenter.get_board_display())
+    presenter.view.update_squares.assert_not_called()
+
+
+def test_config_update_from_another_thread(model: BoardModel, game_config: GameConfig, monkeypatch):
+    # Config reloads are notified on a watcher thread, the board is rendered on the event loop's thread
+    monkeypatch.setattr('chess_puzzle_ai_cli.modules.board.board_presenter.game_config', game_config)
+    frame_scheduler = FrameScheduler()
+    presenter = BoardPresenter(model, frame_scheduler)
+    render_threads = []
+    presenter.view.update = Mock(side_effect=lambda *args: render_threads.append(threading.get_ident()))
+
+    async def run():
+        frame_scheduler.set_event_loop(asyncio.get_running_loop())
+        thread = threading.Thread(target=game_config.set_value, args=(game_config.Keys.BLINDFOLD_CHESS, "yes"))
+        thread.start()
+        thread.join()
+        presenter.view.update.assert_not_called()
+        while not frame_scheduler.frame_count:
+            await asyncio.sleep(0.01)
+
+    asyncio.run(run())
+    assert render_threads == [threading.get_ident()]
+    assert presenter.game_config_values.blindfold_chess
+    assert all(not square.piece_str for square in presenter.get_board_display())
+    presenter.cleanup()
+
+
+@pytest.mark.benchmark
+def test_update_speed(model: BoardModel, presenter: BoardPresenter, monkeypatch):
+    # Verify a per move update is at least an order of magnitude faster than a full render.
+    # Repainting is patched out as outside a running application it creates a dummy application.
+    monkeypatch.setattr('chess_puzzle_ai_cli.modules.board.board_view.repaint_ui', Mock())
+    moves = ["e4", "e5", "Nf3", "Nc6", "Bb5", "a6", "Ba4", "Nf6", "O-O", "Be7"]
+    model.e_board_model_updated.remove_listener(presenter.update)
+
+    def time_updates(update) -> float:
+        model.reset(notify=False)
+        total = 0.0
+        for move in moves:
+            model.make_move(move, notify=False)
+            start = perf_counter()
+            update()
+            total += perf_counter() - start
+        return total
+
+    full_times = []
+    incremental_times = []
+    for _ in range(5):
+        full_times.append(time_updates(presenter.render_full_board))
+        presenter.render_full_board()
+        incremental_times.append(time_updates(lambda: presenter.update(EventTopics.MOVE_MADE)))
+
+    assert min(full_times) / min(incremental_times) > 5
+
+
+def test_square_records_updated_in_place(model: BoardModel, presenter: BoardPresenter):
+    # Verify renders update the square display records rather than creating new ones
+    records = list(presenter._board_records)  # noqa
+    model.make_move("e4")
+    presenter.render_full_board()
+    assert all(new is old for new, old in zip(presenter._board_records, records))  # noqa
+    assert presenter._board_records == presenter.get_board_display()  # noqa
+
+    # The records are reordered (not recreated) when the orientation changes
+    model.set_board_orientation(chess.BLACK)
+    assert presenter._board_records[0] is not records[0]  # noqa
+    assert {id(record) for record in presenter._board_records} == {id(record) for record in records}  # noqa
+
+
+@pytest.mark.benchmark
+def test_update_allocations(model: BoardModel, presenter: BoardPresenter, monkeypatch):
+    # Verify renders update the square display records in place, allocating near zero new objects
+    monkeypatch.setattr('chess_puzzle_ai_cli.modules.board.board_view.repaint_ui', Mock())
+    moves = ["e4", "e5", "Nf3", "Nc6", "Bb5", "a6", "Ba4", "Nf6", "O-O", "Be7"]
+    model.e_board_model_updated.remove_listener(presenter.update)
+
+    def get_allocated_size(function) -> int:
+        tracemalloc.reset_peak()
+        start = tracemalloc.get_traced_memory()[0]
+        function()
+        return tracemalloc.get_traced_memory()[1] - start
+
+    # Warm up the shared fragments
+    for move in moves:
+        model.make_move(move, notify=False)
+        presenter.update(EventTopics.MOVE_MADE)
+    model.reset(notify=False)
+    presenter.render_full_board()
+
+    tracemalloc.start()
+    try:
+        update_sizes = []
+        for move in moves:
+            model.make_move(move, notify=False)
+            update_sizes.append(get_allocated_size(lambda: presenter.update(EventTopics.MOVE_MADE)))
+
+        full_render_size = get_allocated_size(presenter.render_full_board)
+        board_display_size = get_allocated_size(presenter.get_board_display)
+    finally:
+        tracemalloc.stop()
+
+    assert max(update_sizes) < 2048
+    assert full_render_size < 2048
+
+    # Allocating a new display record per square (as get_board_display does) allocates far more
+    assert board_display_size > 2 * full_render_size
 
 
 def test_update_cached_config_values(model: BoardModel, presenter: BoardPresenter, game_config: GameConfig):
@@ -46,27 +212,55 @@ def test_update_cached_config_values(model: BoardModel, presenter: BoardPresente
     assert presenter._update_cached_config_values in game_config.e_game_config_updated.listeners
 
     # Test initial assignment
-    assert presenter.game_config_values == game_config.get_all_values()
+    assert presenter.game_config_values == game_config.get_snapshot()
 
     # Test game_config listener notification is working
     # (manual calls to _update_cached_config_values shouldn't be required)
     game_config.set_value(game_config.Keys.BLINDFOLD_CHESS, "yes")
     game_config.set_value(game_config.Keys.USE_UNICODE_PIECES, "no")
-    assert presenter.game_config_values == game_config.get_all_values()
-    assert presenter.game_config_values[game_config.Keys.BLINDFOLD_CHESS]
-    assert not presenter.game_config_values[game_config.Keys.USE_UNICODE_PIECES]
+    assert presenter.game_config_values == game_config.get_snapshot()
+    assert presenter.game_config_values.blindfold_chess
+    assert not presenter.game_config_values.use_unicode_pieces
 
     # Remove game config notification listener and verify updates don't come through
     game_config.e_game_config_updated.remove_listener(presenter._update_cached_config_values)
-    assert presenter.game_config_values == game_config.get_all_values()
+    assert presenter.game_config_values == game_config.get_snapshot()
     game_config.set_value(game_config.Keys.USE_UNICODE_PIECES, "yes")
-    assert presenter.game_config_values != game_config.get_all_values()
+    assert presenter.game_config_values != game_config.get_snapshot()
 
     # With listener removed, manually call the function and verify it works by itself
     game_config.set_value(game_config.Keys.BLINDFOLD_CHESS, "no")
-    assert presenter.game_config_values != game_config.get_all_values()
+    assert presenter.game_config_values != game_config.get_snapshot()
     presenter._update_cached_config_values()
-    assert presenter.game_config_values == game_config.get_all_values()
+    assert presenter.game_config_values == game_config.get_snapshot()
+
+
+def test_load_board(model: BoardModel, presenter: BoardPresenter, game_config: GameConfig):
+    board = chess.Board()
+    board.push_uci("e2e4")
+    model.set_board_orientation(chess.BLACK, notify=False)
+    board_display = presenter.get_board_display()
+
+    config_values = presenter.game_config_values
+
+    presenter.view.update = Mock()
+    presenter.load_board(board, chess.BLACK, board_display, config_values)
+    assert model.board is board
+    assert model.get_board_orientation() == chess.BLACK
+    presenter.view.update.assert_called_once_with(board_display)
+
+    # A board display computed before a config change is not used, the board is fully rendered instead
+    game_config.set_value(game_config.Keys.BLINDFOLD_CHESS, "no" if config_values.blindfold_chess else "yes")
+    presenter.view.update.reset_mock()
+    presenter.load_board(board, chess.BLACK, board_display, config_values)
+    assert presenter.game_config_values == game_config.get_snapshot()
+    assert presenter.view.update.call_args.args[0] == presenter.get_board_display() != board_display
+
+
+def test_cleanup(presenter: BoardPresenter, game_config: GameConfig):
+    assert presenter._update_cached_config_values in game_config.e_game_config_updated.listeners
+    presenter.cleanup()
+    assert presenter._update_cached_config_values not in game_config.e_game_config_updated.listeners
 
 
 def test_make_move(model: BoardModel, presenter: BoardPresenter):
@@ -91,37 +285,37 @@ def test_get_board_display(model: BoardModel, presenter: BoardPresenter, game_co
 
     for square_data in board_output:
         # Test square in check
-        if square_data['square_number'] == chess.D2:
-            assert square_data == {
-                'square_number': chess.D2,
-                'piece_str': 'K',
-                'piece_display_color': 'light-piece',
-                'square_display_color': 'in-check',
-                'rank_label': '',
-                'is_end_of_rank': False
-            }
+        if square_data.square_number == chess.D2:
+            assert square_data == SquareDisplay(
+                square_number=chess.D2,
+                piece_str='K',
+                piece_display_color='light-piece',
+                square_display_color='in-check',
+                rank_label='',
+                is_end_of_rank=False
+            )
 
         # Test start of rank with rank label
-        if square_data['square_number'] == chess.A1:
-            assert square_data == {
-                'square_number': chess.A1,
-                'piece_str': 'B',
-                'piece_display_color': 'dark-piece',
-                'square_display_color': 'dark-square',
-                'rank_label': '1',
-                'is_end_of_rank': False
-            }
+        if square_data.square_number == chess.A1:
+            assert square_data == SquareDisplay(
+                square_number=chess.A1,
+                piece_str='B',
+                piece_display_color='dark-piece',
+                square_display_color='dark-square',
+                rank_label='1',
+                is_end_of_rank=False
+            )
 
         # Test end of rank without piece
-        if square_data['square_number'] == chess.H7:
-            assert square_data == {
-                'square_number': chess.H7,
-                'piece_str': '',
-                'piece_display_color': '',
-                'square_display_color': 'light-square',
-                'rank_label': '',
-                'is_end_of_rank': True
-            }
+        if square_data.square_number == chess.H7:
+            assert square_data == SquareDisplay(
+                square_number=chess.H7,
+                piece_str='',
+                piece_display_color='',
+                square_display_color='light-square',
+                rank_label='',
+                is_end_of_rank=True
+            )
 
 
 def test_get_file_labels(model: BoardModel, presenter: BoardPresenter, game_config: GameConfig):
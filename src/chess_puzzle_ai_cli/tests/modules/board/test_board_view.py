@@ -0,0 +1,79 @@
+from chess_puzzle_ai_cli.modules.board.board_model import BoardModel
+from chess_puzzle_ai_cli.modules.board.board_presenter import BoardPresenter
+from chess_puzzle_ai_cli.modules.board.board_view import BoardView, SQUARE_STYLES
+from prompt_toolkit.formatted_text import HTML, to_formatted_text
+from time import perf_counter
+from unittest.mock import Mock
+import chess
+import pytest
+
+
+@pytest.fixture
+def presenter(monkeypatch):
+    # Outside a running application repainting creates a dummy application, which would dominate the timings
+    monkeypatch.setattr('chess_puzzle_ai_cli.modules.board.board_view.repaint_ui', Mock())
+    model = BoardModel(fen="r1bqkb1r/pppp1ppp/2n2n2/4p2Q/2B1P3/8/PPPP1PPP/RNB1K1NR w KQkq - 4 4")
+    model.make_move("Qxf7#")
+    model.set_premove_highlight(chess.Move.from_uci("e8e7"))
+    return BoardPresenter(model)
+
+
+def _build_html_output(presenter: BoardPresenter, board_output_list: list) -> HTML:
+    """The previous board view output, built as HTML markup and parsed by prompt_toolkit"""
+    board_output_str = ""
+
+    for square in board_output_list:
+        square_style = f"{square.square_display_color}.{square.piece_display_color}"
+        piece_str = square.piece_str
+        piece_str += " " if square.piece_str else "  "
+
+        board_output_str += f"<rank-label>{square.rank_label}</rank-label>"
+        board_output_str += f"<{square_style}>{piece_str}</{square_style}>"
+
+        if square.is_end_of_rank:
+            board_output_str += "\n"
+
+    file_labels = " " + presenter.get_file_labels()
+    board_output_str += f"<file-label>{file_labels}</file-label>"
+
+    return HTML(board_output_str)
+
+
+def _normalize(fragments: list) -> list:
+    """Drops empty fragments, and the trailing '.' HTML adds to the style of empty squares"""
+    return [(style.rstrip("."), text) for style, text, *_ in fragments if text]
+
+
+def test_square_styles():
+    assert SQUARE_STYLES["light-square", "dark-piece"] == "class:light-square.dark-piece"
+    assert SQUARE_STYLES["in-check", ""] == "class:in-check"
+
+
+def test_output_matches_html(presenter: BoardPresenter):
+    board_display = presenter.get_board_display()
+    view = BoardView(presenter, board_display)
+    html_output = to_formatted_text(_build_html_output(presenter, board_display))
+    assert _normalize(view.get_output()) == _normalize(html_output)
+
+    # Verify the highlighted squares are styled
+    assert ("class:in-check.dark-piece", "♚ ") in view.get_output()
+    assert ("class:last-move.light-piece", "♛ ") in view.get_output()
+    assert ("class:pre-move", "  ") in view.get_output()
+
+
+@pytest.mark.benchmark
+def test_output_speed(presenter: BoardPresenter):
+    # Verify building the fragments directly is faster than building and parsing HTML
+    board_display = presenter.get_board_display()
+    view = BoardView(presenter, board_display)
+    iterations = 200
+
+    def time_output(build) -> float:
+        start = perf_counter()
+        for _ in range(iterations):
+            to_formatted_text(build())
+        return perf_counter() - start
+
+    html_time = min(time_output(lambda: _build_html_output(presenter, board_display)) for _ in range(3))
+    fragment_time = min(time_output(lambda: view.update(board_display) or view.get_output()) for _ in range(3))
+    assert html_time / fragment_time > 5
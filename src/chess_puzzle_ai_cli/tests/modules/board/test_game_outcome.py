@@ -0,0 +1,107 @@
+from chess_puzzle_ai_cli.modules.board import game_outcome
+from chess_puzzle_ai_cli.modules.board.game_outcome import GameOutcomeTracker
+from random import Random
+import chess
+import chess.variant
+
+
+def _random_game(seed: int, plies: int) -> chess.Board:
+    """Returns a board with a random game of up to the passed in number of plies"""
+    rng = Random(seed)
+    board = chess.Board()
+    while len(board.move_stack) < plies and not board.is_game_over():
+        board.push(rng.choice(list(board.legal_moves)))
+    return board
+
+
+def test_get_outcome():
+    # Verify the outcome matches python-chess for every position of a few random games
+    for seed in range(5):
+        game = _random_game(seed, 400)
+        tracker = GameOutcomeTracker(chess.Board())
+        for move in game.move_stack:
+            tracker.push(move)
+            assert tracker.get_outcome() == tracker.board.outcome()
+
+    # Test checkmate and variant endings
+    tracker = GameOutcomeTracker(chess.Board("7K/6q1/6k1/8/8/8/8/8 w - - 0 1"))
+    assert tracker.get_outcome() == chess.Outcome(chess.Termination.CHECKMATE, chess.BLACK)
+    tracker = GameOutcomeTracker(chess.variant.KingOfTheHillBoard("8/8/8/3K4/8/8/8/7k b - - 0 1"))
+    assert tracker.get_outcome() == chess.Outcome(chess.Termination.VARIANT_LOSS, chess.WHITE)
+
+
+def test_fivefold_repetition():
+    tracker = GameOutcomeTracker(chess.Board())
+    shuffle = [chess.Move.from_uci(move) for move in ["g1f3", "g8f6", "f3g1", "f6g8"]]
+    for _ in range(3):
+        for move in shuffle:
+            tracker.push(move)
+    assert tracker.get_repetitions() == 4
+    assert tracker.get_outcome() is None
+
+    for move in shuffle:
+        tracker.push(move)
+    assert tracker.get_repetitions() == 5
+    assert tracker.get_outcome() == chess.Outcome(chess.Termination.FIVEFOLD_REPETITION, None)
+    assert tracker.board.is_fivefold_repetition()
+
+    # Popping a move undoes its count
+    assert tracker.pop() == shuffle[-1]
+    assert tracker.get_outcome() is None
+    tracker.pop()
+    assert tracker.get_repetitions() == 4
+
+
+def test_board_changed_directly():
+    # Verify changes made to the board without the tracker are picked up
+    board = chess.Board()
+    tracker = GameOutcomeTracker(board)
+    assert tracker.get_outcome() is None
+
+    board.set_fen("7K/6q1/6k1/8/8/8/8/8 w - - 0 1")
+    assert tracker.get_outcome() == chess.Outcome(chess.Termination.CHECKMATE, chess.BLACK)
+
+    board.set_fen(chess.STARTING_FEN)
+    for move in ["f2f3", "e7e5", "g2g4"]:
+        board.push_uci(move)
+    assert tracker.get_outcome() is None
+    tracker.push(chess.Move.from_uci("d8h4"))
+    assert tracker.get_outcome() == chess.Outcome(chess.Termination.CHECKMATE, chess.BLACK)
+
+
+def test_cached_outcome(monkeypatch):
+    tracker = GameOutcomeTracker(chess.Board())
+    calls = []
+    compute_outcome = tracker._compute_outcome
+    monkeypatch.setattr(tracker, "_compute_outcome", lambda: calls.append(1) or compute_outcome())
+
+    # The outcome is only computed again once the position changes
+    for _ in range(3):
+        tracker.get_outcome()
+    assert len(calls) == 1
+
+    tracker.push(chess.Move.from_uci("e2e4"))
+    tracker.get_outcome()
+    tracker.get_outcome()
+    assert len(calls) == 2
+
+
+def test_repetition_check_constant_time(monkeypatch):
+    # Verify the number of positions keyed per move does not grow with the game length
+    game = _random_game(0, 300)
+    tracker = GameOutcomeTracker(chess.Board())
+    key_counts = []
+    get_repetition_key = game_outcome.get_repetition_key
+
+    def count_keys(board: chess.Board):
+        key_counts[-1] += 1
+        return get_repetition_key(board)
+
+    monkeypatch.setattr(game_outcome, "get_repetition_key", count_keys)
+    for move in game.move_stack:
+        key_counts.append(0)
+        tracker.push(move)
+        tracker.get_outcome()
+
+    assert len(key_counts) > 200
+    assert max(key_counts) == min(key_counts)
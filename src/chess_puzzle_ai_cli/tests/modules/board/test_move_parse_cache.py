@@ -0,0 +1,119 @@
+from chess_puzzle_ai_cli.modules.board.move_parse_cache import MoveParseCache, get_position_key
+from time import perf_counter
+import chess
+import chess.variant
+import pytest
+
+
+def test_parse_move():
+    cache = MoveParseCache()
+    board = chess.Board()
+
+    assert cache.parse_move(board, "e4") == chess.Move.from_uci("e2e4")
+    assert cache.parse_move(board, " e4 ") == chess.Move.from_uci("e2e4")
+    assert cache.parse_move(board, "g1f3") == chess.Move.from_uci("g1f3")
+    assert (cache.hits, cache.misses) == (1, 2)
+
+    # Errors are cached too, and raised as python-chess errors each time
+    for _ in range(2):
+        with pytest.raises(chess.IllegalMoveError):
+            cache.parse_move(board, "e5")
+        with pytest.raises(chess.InvalidMoveError):
+            cache.parse_move(board, "Nf")
+    assert (cache.hits, cache.misses) == (3, 4)
+
+    # A position change looks up a different entry
+    board.push_san("e4")
+    assert cache.parse_move(board, "e5") == chess.Move.from_uci("e7e5")
+    with pytest.raises(chess.IllegalMoveError):
+        cache.parse_move(board, "e4")
+    assert cache.misses == 6
+
+    # Returning to a cached position hits the cache again
+    board.pop()
+    assert cache.parse_move(board, "e4") == chess.Move.from_uci("e2e4")
+    assert cache.hits == 4
+
+
+def test_position_key():
+    board = chess.Board()
+    board.push_san("Nf3")
+    board.push_san("Nf6")
+    board.push_san("Ng1")
+    board.push_san("Ng8")
+
+    # The position key ignores the move counters, but not the variant
+    assert get_position_key(board) == get_position_key(chess.Board())
+    assert get_position_key(chess.variant.AntichessBoard()) != get_position_key(chess.Board())
+
+    board.push_san("e4")
+    assert get_position_key(board) != get_position_key(chess.Board())
+
+    # Castling moves differ in chess960, and the same placement with other pockets allows other drops
+    assert get_position_key(chess.Board(chess960=True)) != get_position_key(chess.Board())
+    assert get_position_key(chess.variant.CrazyhouseBoard("4k3/8/8/8/8/8/8/4K3[Q] w - - 0 1")) != \
+           get_position_key(chess.variant.CrazyhouseBoard("4k3/8/8/8/8/8/8/4K3[q] w - - 0 1"))
+
+
+def test_parse_move_chess960():
+    # The same move string is a different move in chess960 (castling is king takes rook)
+    cache = MoveParseCache()
+    fen = "r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1"
+    assert cache.parse_move(chess.Board(fen), "O-O") == chess.Move.from_uci("e1g1")
+    assert cache.parse_move(chess.Board(fen, chess960=True), "O-O") == chess.Move.from_uci("e1h1")
+
+    # Drops are only parsed when the piece is in the pocket
+    board = chess.variant.CrazyhouseBoard("4k3/8/8/8/8/8/8/4K3[Q] w - - 0 1")
+    assert cache.parse_move(board, "Q@d4") == chess.Move.from_uci("Q@d4")
+    with pytest.raises(chess.IllegalMoveError):
+        cache.parse_move(chess.variant.CrazyhouseBoard("4k3/8/8/8/8/8/8/4K3[] w - - 0 1"), "Q@d4")
+
+
+def test_get_legal_moves():
+    cache = MoveParseCache()
+    board = chess.Board()
+    legal_moves = cache.get_legal_moves(board)
+    assert legal_moves == list(board.legal_moves)
+    assert cache.get_legal_moves(board) is legal_moves
+
+    board.push_san("e4")
+    assert cache.get_legal_moves(board) == list(board.legal_moves)
+
+
+def test_lru_eviction():
+    cache = MoveParseCache(max_positions=2)
+    boards = [chess.Board(), chess.Board("8/8/8/8/8/2k5/8/K7 w - - 0 1"), chess.Board("8/8/8/8/8/2k5/8/K7 b - - 0 1")]
+
+    cache.parse_move(boards[0], "e4")
+    cache.parse_move(boards[1], "Ka2")
+    cache.parse_move(boards[0], "e4")
+    cache.parse_move(boards[2], "Kc2")
+    assert (cache.hits, cache.misses) == (1, 3)
+
+    # The least recently used position (boards[1]) was evicted
+    cache.parse_move(boards[0], "e4")
+    cache.parse_move(boards[1], "Ka2")
+    assert (cache.hits, cache.misses) == (2, 4)
+
+
+@pytest.mark.benchmark
+def test_parse_move_speed():
+    # Verify repeated parsing in the same position is faster than parsing the SAN
+    cache = MoveParseCache()
+    board = chess.Board("r1bqkb1r/pppp1ppp/2n2n2/4p2Q/2B1P3/8/PPPP1PPP/RNB1K1NR w KQkq - 4 4")
+    moves = ["Q", "Qx", "Qxf", "Qxf7", "Qxf7#", "Bxf7+", "Nc3"]
+    iterations = 200
+
+    def time_parsing(parse) -> float:
+        start = perf_counter()
+        for _ in range(iterations):
+            for move in moves:
+                try:
+                    parse(board, move)
+                except ValueError:
+                    pass
+        return perf_counter() - start
+
+    san_time = min(time_parsing(chess.Board.parse_san) for _ in range(3))
+    cached_time = min(time_parsing(cache.parse_move) for _ in range(3))
+    assert san_time / cached_time > 2
@@ -1,8 +1,11 @@
 import pytest
-from unittest.mock import MagicMock
-from chess_puzzle_ai_cli.modules.clock.clock_model import ClockModel
+import asyncio
+import json
+import time
+from unittest.mock import patch
+from chess_puzzle_ai_cli.modules.clock.clock_model import ClockModel, ClockAnchor
 from chess_puzzle_ai_cli.modules.clock.clock_presenter import ClockPresenter
-from chess_puzzle_ai_cli.modules.clock.clock_view import ClockView
+from time import sleep, monotonic
 
 @pytest.fixture
 def clock_file(tmp_path):
@@ -10,21 +13,121 @@ def clock_file(tmp_path):
     file_path.write_text("123")
     return str(file_path)
 
-def test_clock_integration(clock_file):
+def _wait_for(condition, timeout: float = 5.0):
+    deadline = monotonic() + timeout
+    while not condition() and monotonic() < deadline:
+        sleep(0.01)
+
+@patch('chess_puzzle_ai_cli.modules.clock.clock_view.repaint_ui')
+def test_clock_integration(mock_repaint_ui, clock_file):
     # Create the components
     model = ClockModel(clock_file)
     presenter = ClockPresenter(model)
-    view = ClockView(presenter)
+    view = presenter.view
 
     # Initial display
-    assert view._text_area.text == "02:03"
+    assert view.time_str == "02:03"
 
-    # Update the clock file
+    # Update the clock file, the watcher picks up the change without the view re-reading the file
     with open(clock_file, "w") as f:
         f.write("60")
 
-    # Update the view
-    view.update()
+    _wait_for(lambda: view.time_str == "01:00")
+    assert view.time_str == "01:00"
+    assert mock_repaint_ui.call_count == 1
+    model.cleanup()
+
+@patch('chess_puzzle_ai_cli.modules.clock.clock_view.repaint_ui')
+def test_clock_model_caches_time(mock_repaint_ui, clock_file):
+    model = ClockModel(clock_file)
+    presenter = ClockPresenter(model)
+
+    # Reading the time does not touch the clock file
+    with patch('builtins.open') as mock_open:
+        for _ in range(100):
+            assert model.get_time() == 123.0
+        mock_open.assert_not_called()
+
+    # Re-reading an unchanged clock does not repaint
+    model._on_clock_file_changed()
+    mock_repaint_ui.assert_not_called()
+
+    # Unparsable contents keep the last time
+    with open(clock_file, "w") as f:
+        f.write("not a number")
+    model._on_clock_file_changed()
+    assert model.get_time() == 123.0
+    mock_repaint_ui.assert_not_called()
+
+    with open(clock_file, "w") as f:
+        f.write("42.5")
+    model._on_clock_file_changed()
+    assert model.get_time() == 42.5
+    assert presenter.view.time_str == "00:42"
+    mock_repaint_ui.assert_called_once()
+    model.cleanup()
+
+def test_clock_model_without_clock_file():
+    model = ClockModel(None)
+    assert model.get_time() == 0.0
+    assert not model.is_ticking()
+    assert ClockPresenter(model).get_time_display() == "00:00"
+    model.cleanup()
+
+def test_clock_anchor():
+    anchor = ClockAnchor(90.0, 1000.0, "down")
+    assert anchor.get_time(1000.0) == 90.0
+    assert anchor.get_time(1030.5) == 59.5
+    assert anchor.get_time(2000.0) == 0.0
+
+    assert ClockAnchor(90.0, 1000.0, "up").get_time(1030.5) == 120.5
+    assert ClockAnchor(90.0, 1000.0, "stopped").get_time(1030.5) == 90.0
+
+def test_clock_model_anchor_file(clock_file):
+    # The anchor was written 30 seconds ago, so 30 seconds have already counted down
+    with open(clock_file, "w") as f:
+        json.dump({"time": 120, "at": time.time() - 30, "direction": "down"}, f)
+
+    model = ClockModel(clock_file)
+    assert model.is_ticking()
+    assert model.get_direction() == "down"
+    assert 89 < model.get_time() <= 90
+
+    # The time is interpolated locally from the monotonic clock
+    with patch('time.monotonic', return_value=monotonic() + 10):
+        assert 79 < model.get_time() <= 80
+
+    with patch('time.monotonic', return_value=monotonic() + 100):
+        assert model.get_time() == 0.0
+        assert not model.is_ticking()
+
+    with pytest.raises(ValueError):
+        model.set_anchor(10, "sideways")
+
+    model.set_anchor(5, "up")
+    with patch('time.monotonic', return_value=monotonic() + 10):
+        assert 15 <= model.get_time() < 16
+    model.cleanup()
+
+@patch('chess_puzzle_ai_cli.modules.clock.clock_presenter.CLOCK_TICK_INTERVAL', 0.05)
+@patch('chess_puzzle_ai_cli.modules.clock.clock_view.repaint_ui')
+def test_run_clock_tick(mock_repaint_ui):
+    model = ClockModel(None)
+    presenter = ClockPresenter(model)
+    model.set_anchor(2.5, "down")
+    assert presenter.view.time_str == "00:02"
+    mock_repaint_ui.reset_mock()
+
+    async def run_tick():
+        task = asyncio.ensure_future(presenter.run_clock_tick())
+        await asyncio.sleep(1.2)
+        task.cancel()
+
+    # The view only repaints when the displayed second changes
+    asyncio.run(run_tick())
+    assert presenter.view.time_str == "00:01"
+    assert mock_repaint_ui.call_count == 1
 
-    # Check if the display has been updated
-    assert view._text_area.text == "01:00"
+    # A stopped clock keeps ticking cheaply without repainting
+    assert presenter._get_next_tick_delay() <= 0.05
+    model.cleanup()
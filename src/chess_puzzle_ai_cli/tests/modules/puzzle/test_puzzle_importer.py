@@ -0,0 +1,156 @@
+from chess_puzzle_ai_cli.modules.puzzle.puzzle_database import PuzzleDatabase
+from chess_puzzle_ai_cli.modules.puzzle.puzzle_importer import import_puzzles, open_puzzle_csv, PuzzleCsvReader, PuzzleRow
+from chess_puzzle_ai_cli.modules.puzzle.puzzle_store import PuzzleStore, PuzzleStoreWriter
+from chess_puzzle_ai_cli.modules.puzzle.puzzle_index import PuzzleIndex
+from unittest.mock import Mock
+import bz2
+import gzip
+import pytest
+
+CSV_HEADER = "PuzzleId,FEN,Moves,Rating,RatingDeviation,Popularity,NbPlays,Themes,GameUrl,OpeningTags\n"
+CSV_ROWS = [
+    "00008,r6k/pp2r2p/4Rp1Q/3p4/8/1N1P2R1/PqP2bPP/7K b - - 0 24,f2g3 e6e7 b2b1 b3c1 b1c1 h6c1,1913,75,93,5245,crushing hangingPiece long middlegame,https://lichess.org/787zsVup/black#48,\n",
+    "0000D,5rk1/1p3ppp/pq3b2/8/8/1P1Q1N2/P4PPP/3R2K1 w - - 2 27,d3d6 f8d8 d6d8 f6d8,1580,73,92,37,advantage endgame short,https://lichess.org/F8M8OS71#53,\n",
+    "0009B,r2qr1k1/b1p2ppp/pp4n1/P1P1p3/4P1n1/B2P2Pb/3NBP1P/RN1QR1K1 b - - 1 16,b6c5 e2g4 h3g4 d1g4,1103,75,88,520,advantage middlegame short,https://lichess.org/4MWQCxQ6/black#32,Kings_Pawn_Game\n",
+]
+
+
+@pytest.fixture
+def store_path(tmp_path):
+    return str(tmp_path / "store")
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / "lichess_db_puzzle.csv"
+    path.write_text(CSV_HEADER + "".join(CSV_ROWS))
+    return str(path)
+
+
+def test_open_puzzle_csv(tmp_path):
+    content = CSV_HEADER + "".join(CSV_ROWS)
+
+    bz2_path = tmp_path / "puzzles.csv.bz2"
+    bz2_path.write_bytes(bz2.compress(content.encode()))
+    with open_puzzle_csv(str(bz2_path)) as f:
+        assert f.read() == content
+
+    gz_path = tmp_path / "puzzles.csv.gz"
+    gz_path.write_bytes(gzip.compress(content.encode()))
+    with open_puzzle_csv(str(gz_path)) as f:
+        assert f.read() == content
+
+
+def test_puzzle_csv_reader(csv_path):
+    with open_puzzle_csv(csv_path) as f:
+        reader = PuzzleCsvReader(f)
+        rows = list(reader)
+
+    assert len(rows) == 3
+    assert rows[0] == PuzzleRow("00008", "r6k/pp2r2p/4Rp1Q/3p4/8/1N1P2R1/PqP2bPP/7K b - - 0 24",
+                                "f2g3 e6e7 b2b1 b3c1 b1c1 h6c1", 1913, "crushing hangingPiece long middlegame", 93)
+    assert reader.rows_skipped == 0
+
+
+def test_puzzle_csv_reader_malformed(tmp_path):
+    path = tmp_path / "malformed.csv"
+    path.write_text(CSV_HEADER + CSV_ROWS[0] + "0000X,8/8/8/8/8/8/8/8 w - - 0 1,e2e4,not-a-rating,75,93,1,short,,\n" + "0000Y\n")
+    with open_puzzle_csv(str(path)) as f:
+        reader = PuzzleCsvReader(f)
+        assert [row.puzzle_id for row in reader] == ["00008"]
+        assert reader.rows_skipped == 2
+
+    # Test a header missing required columns
+    path.write_text("PuzzleId,FEN,Moves\n")
+    with open_puzzle_csv(str(path)) as f:
+        with pytest.raises(ValueError):
+            list(PuzzleCsvReader(f))
+
+
+def test_import_puzzles(csv_path, store_path):
+    progress_callback = Mock()
+    result = import_puzzles(csv_path, store_path, progress_callback)
+    assert result.rows_read == 3
+    assert result.puzzles_added == 3
+    assert result.rows_skipped == 0
+    progress_callback.assert_called_with(3)
+
+    database = PuzzleDatabase(store_path)
+    store = PuzzleStore(store_path)
+    assert database.get_puzzle_count() == len(store) == 3
+    assert database.get_record_index("missing") is None
+
+    puzzle = store.get_puzzle(database.get_record_index("0000D"))
+    assert puzzle.puzzle_id == "0000D"
+    assert puzzle.fen == "5rk1/1p3ppp/pq3b2/8/8/1P1Q1N2/P4PPP/3R2K1 w - - 2 27"
+    assert puzzle.moves == ("d3d6", "f8d8", "d6d8", "f6d8")
+    assert puzzle.rating == 1580
+    assert puzzle.themes == ("advantage", "endgame", "short")
+    assert puzzle.popularity == 92
+    database.close()
+    store.close()
+
+
+def test_import_puzzles_incremental(tmp_path, csv_path, store_path):
+    import_puzzles(csv_path, store_path)
+
+    # Re-running with a newer dump should only append the new puzzles
+    newer_dump = tmp_path / "newer.csv.gz"
+    new_row = "000Vc,8/8/4k3/8/8/4K3/4P3/8 w - - 0 1,e3d4 e6d6,1200,80,50,10,endgame short,,\n"
+    newer_dump.write_bytes(gzip.compress((CSV_HEADER + "".join(CSV_ROWS) + new_row).encode()))
+
+    result = import_puzzles(str(newer_dump), store_path)
+    assert result.rows_read == 4
+    assert result.puzzles_added == 1
+
+    database = PuzzleDatabase(store_path)
+    store = PuzzleStore(store_path)
+    assert database.get_puzzle_count() == len(store) == 4
+    assert database.get_record_index("000Vc") == 3
+    assert store.get_puzzle(3).puzzle_id == "000Vc"
+
+    # The puzzle index is rebuilt to include the new puzzles
+    index = PuzzleIndex(store, store_path)
+    assert index.select_puzzle(rating=1200, rating_range=0) == 3
+    index.close()
+    database.close()
+    store.close()
+
+
+def test_import_puzzles_unpackable(tmp_path, store_path):
+    # Puzzles that cannot be packed into a store record are skipped
+    path = tmp_path / "unpackable.csv"
+    path.write_text(CSV_HEADER + CSV_ROWS[0] + "0000Z,8/8/8/8/8/8/8/8 w - - 0 1,e2e9,1500,75,93,1,short,,\n")
+    result = import_puzzles(str(path), store_path)
+    assert result.rows_read == 2
+    assert result.puzzles_added == 1
+    assert result.rows_skipped == 1
+
+
+def test_import_puzzles_interrupted(csv_path, store_path, monkeypatch):
+    # An import stopped while writing records does not commit the puzzle ids of the batch
+    append_records = PuzzleStoreWriter.append_records
+
+    def interrupted_append_records(writer, records):
+        append_records(writer, records[:1])
+        raise OSError("No space left on device")
+
+    monkeypatch.setattr(PuzzleStoreWriter, "append_records", interrupted_append_records)
+    with pytest.raises(OSError):
+        import_puzzles(csv_path, store_path)
+    database = PuzzleDatabase(store_path)
+    assert database.get_puzzle_count() == 0
+    database.close()
+
+    # Re-running the import drops the records without puzzle ids, and imports every puzzle
+    monkeypatch.setattr(PuzzleStoreWriter, "append_records", append_records)
+    result = import_puzzles(csv_path, store_path)
+    assert result.puzzles_added == 3
+
+    database = PuzzleDatabase(store_path)
+    store = PuzzleStore(store_path)
+    assert database.get_puzzle_count() == len(store) == 3
+    for puzzle_id in ["00008", "0000D", "0009B"]:
+        assert store.get_puzzle(database.get_record_index(puzzle_id)).puzzle_id == puzzle_id
+    database.close()
+    store.close()
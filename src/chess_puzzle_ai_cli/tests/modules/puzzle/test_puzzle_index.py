@@ -0,0 +1,117 @@
+from chess_puzzle_ai_cli.modules.puzzle.puzzle_index import PuzzleIndex, build_puzzle_index
+from chess_puzzle_ai_cli.modules.puzzle.puzzle_store import (PuzzleStore, PuzzleStoreWriter, pack_puzzle, encode_themes,
+                                                             RATING_OFFSET, THEMES_OFFSET)
+from chess_puzzle_ai_cli.modules.board.board_model import BoardModel
+from time import perf_counter
+import chess
+import pytest
+
+NUM_PUZZLES = 20000
+THEME_CYCLE = ["mateIn2 short", "fork middlegame", "mateIn1 oneMove", "endgame long", "mateIn2 backRankMate short"]
+
+
+def _get_rating(i: int) -> int:
+    return 600 + (i * 7919) % 2400
+
+
+@pytest.fixture
+def store_path(tmp_path):
+    store_path = str(tmp_path / "store")
+    template = bytearray(pack_puzzle("00000", "r6k/pp2r2p/4Rp1Q/3p4/8/1N1P2R1/PqP2bPP/7K b - - 0 24",
+                                     "f2g3 e6e7 b2b1 b3c1 b1c1 h6c1", 0, "", 0))
+    records = []
+    for i in range(NUM_PUZZLES):
+        template[0:8] = f"{i:08d}".encode()
+        template[RATING_OFFSET:RATING_OFFSET + 2] = _get_rating(i).to_bytes(2, "little")
+        template[THEMES_OFFSET:THEMES_OFFSET + 16] = encode_themes(THEME_CYCLE[i % len(THEME_CYCLE)]).to_bytes(16, "little")
+        records.append(bytes(template))
+
+    writer = PuzzleStoreWriter(store_path)
+    writer.append_records(records)
+    writer.close()
+    build_puzzle_index(store_path)
+    return store_path
+
+
+@pytest.fixture
+def store(store_path):
+    store = PuzzleStore(store_path)
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def index(store: PuzzleStore, store_path):
+    index = PuzzleIndex(store, store_path)
+    yield index
+    index.close()
+
+
+def test_select_puzzle(index: PuzzleIndex, store: PuzzleStore):
+    for _ in range(200):
+        record_index = index.select_puzzle(rating=1800, themes={"mateIn2"})
+        puzzle = store.get_puzzle(record_index)
+        assert 1700 <= puzzle.rating <= 1900
+        assert "mateIn2" in puzzle.themes
+
+    # Test intersecting multiple themes
+    for _ in range(200):
+        puzzle = store.get_puzzle(index.select_puzzle(rating=1200, rating_range=50, themes=["short", "backRankMate"]))
+        assert 1150 <= puzzle.rating <= 1250
+        assert {"short", "backRankMate", "mateIn2"} <= set(puzzle.themes)
+
+    # Test selecting without a rating or themes
+    assert 0 <= index.select_puzzle() < NUM_PUZZLES
+
+    # Test no matching puzzles
+    assert index.select_puzzle(rating=3500) is None
+    assert index.select_puzzle(themes=["mateIn1", "mateIn2"]) is None
+
+    with pytest.raises(ValueError):
+        index.select_puzzle(themes=["notATheme"])
+
+
+def test_select_puzzle_exclude(index: PuzzleIndex, store: PuzzleStore):
+    band = [i for i in range(NUM_PUZZLES) if 1795 <= _get_rating(i) <= 1805 and i % len(THEME_CYCLE) == 3]
+    assert len(band) > 1
+
+    # Exclude all but one puzzle in the band, forcing the fallback scan
+    seen = set(band[1:])
+    assert index.select_puzzle(rating=1800, rating_range=5, themes={"endgame"}, exclude=seen) == band[0]
+
+    seen.add(band[0])
+    assert index.select_puzzle(rating=1800, rating_range=5, themes={"endgame"}, exclude=seen) is None
+
+
+@pytest.mark.benchmark
+def test_select_puzzle_speed(index: PuzzleIndex):
+    iterations = 1000
+    start = perf_counter()
+    for _ in range(iterations):
+        index.select_puzzle(rating=1800, themes={"mateIn2"}, exclude=set())
+    assert (perf_counter() - start) / iterations < 0.001
+
+
+def test_select_puzzle_seeds_board_model(index: PuzzleIndex, store: PuzzleStore):
+    puzzle = store.get_puzzle(index.select_puzzle(rating=1800, themes={"mateIn2"}))
+    model = BoardModel()
+    model.reinitialize_board("standard", not puzzle.get_turn(), fen=puzzle.fen)
+    assert model.board.fen() == puzzle.fen
+    assert model.get_board_orientation() == chess.WHITE
+
+
+def test_puzzle_index_out_of_date(store_path, store: PuzzleStore):
+    writer = PuzzleStoreWriter(store_path)
+    writer.append_records([pack_puzzle("0000X", chess.STARTING_FEN, "e2e4", 600, "opening", 1)])
+    writer.close()
+
+    updated_store = PuzzleStore(store_path)
+    with pytest.raises(ValueError):
+        PuzzleIndex(updated_store, store_path)
+
+    # Rebuilding the index brings it up to date
+    build_puzzle_index(store_path)
+    index = PuzzleIndex(updated_store, store_path)
+    assert index.select_puzzle(rating=600, rating_range=0, themes=["opening"]) == NUM_PUZZLES
+    index.close()
+    updated_store.close()
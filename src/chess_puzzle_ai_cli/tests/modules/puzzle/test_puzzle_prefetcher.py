@@ -0,0 +1,99 @@
+from chess_puzzle_ai_cli.modules.puzzle.puzzle_prefetcher import PuzzlePrefetcher, PuzzleDecoder
+from chess_puzzle_ai_cli.modules.puzzle.puzzle_index import PuzzleIndex, build_puzzle_index
+from chess_puzzle_ai_cli.modules.puzzle.puzzle_store import PuzzleStore, PuzzleStoreWriter, pack_puzzle
+from chess_puzzle_ai_cli.utils.config import game_config
+from time import sleep, monotonic
+import chess
+import pytest
+
+PUZZLES = [
+    ("00008", "r6k/pp2r2p/4Rp1Q/3p4/8/1N1P2R1/PqP2bPP/7K b - - 0 24", "f2g3 e6e7 b2b1 b3c1 b1c1 h6c1", 1913, "crushing long"),
+    ("0000D", "5rk1/1p3ppp/pq3b2/8/8/1P1Q1N2/P4PPP/3R2K1 w - - 2 27", "d3d6 f8d8 d6d8 f6d8", 1580, "advantage short"),
+    ("0009B", "r2qr1k1/b1p2ppp/pp4n1/P1P1p3/4P1n1/B2P2Pb/3NBP1P/RN1QR1K1 b - - 1 16", "b6c5 e2g4 h3g4 d1g4", 1103, "advantage short"),
+    ("000aY", "r4rk1/pp3ppp/2n1b3/q1pp2B1/8/P1Q2NP1/1PP1PP1P/2KR3R w - - 0 15", "g5e7 a5c3 b2c3 c6e7", 1407, "advantage short"),
+    ("000hf", "r1bqk2r/pp1nbNp1/2p1p2p/8/2BP4/1PN3P1/P3QP1P/3R1RK1 b kq - 0 19", "e8f7 e2e6 f7f8 e6f7", 1589, "mate mateIn2 short"),
+]
+
+
+@pytest.fixture
+def store_path(tmp_path):
+    store_path = str(tmp_path / "store")
+    writer = PuzzleStoreWriter(store_path)
+    writer.append_records([pack_puzzle(*puzzle, 90) for puzzle in PUZZLES])
+    writer.close()
+    build_puzzle_index(store_path)
+    return store_path
+
+
+@pytest.fixture
+def store(store_path):
+    store = PuzzleStore(store_path)
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def index(store: PuzzleStore, store_path):
+    index = PuzzleIndex(store, store_path)
+    yield index
+    index.close()
+
+
+def _wait_for_depth(prefetcher: PuzzlePrefetcher, depth: int, timeout: float = 5.0) -> None:
+    deadline = monotonic() + timeout
+    while prefetcher.get_depth() < depth and monotonic() < deadline:
+        sleep(0.01)
+
+
+def test_puzzle_decoder(store: PuzzleStore):
+    decoder = PuzzleDecoder()
+    puzzle = decoder.decode(4, store.get_puzzle(4))
+    decoder.cleanup()
+
+    assert puzzle.record.puzzle_id == "000hf"
+    assert puzzle.solution == [chess.Move.from_uci(move) for move in PUZZLES[4][2].split()]
+
+    # The board starts after the opponents first move, with the solver to move
+    assert puzzle.board.move_stack == [chess.Move.from_uci("e8f7")]
+    assert puzzle.get_solver_color() == chess.WHITE
+
+    # The first board display is precomputed, along with the config values it was computed with
+    assert len(puzzle.board_display) == 64
+    assert puzzle.config_values == game_config.get_snapshot()
+    f7_display = next(square for square in puzzle.board_display if square.square_number == chess.F7)
+    assert f7_display.square_display_color == "last-move"
+
+
+def test_get_next_puzzle(store: PuzzleStore, index: PuzzleIndex):
+    prefetcher = PuzzlePrefetcher(store, index, depth=2)
+    prefetcher.start()
+    _wait_for_depth(prefetcher, 2)
+    assert prefetcher.get_stats() == {"depth": 2, "capacity": 2, "hits": 0, "misses": 0}
+
+    # Puzzles are served from the queue and never handed out twice
+    puzzle_ids = set()
+    for _ in range(len(PUZZLES)):
+        _wait_for_depth(prefetcher, 1)
+        puzzle = prefetcher.get_next_puzzle()
+        puzzle_ids.add(puzzle.record.puzzle_id)
+
+    assert puzzle_ids == {puzzle[0] for puzzle in PUZZLES}
+    assert prefetcher.hits == len(PUZZLES)
+    assert prefetcher.misses == 0
+
+    # Test all matching puzzles have been played
+    _wait_for_depth(prefetcher, 1)
+    assert prefetcher.get_next_puzzle() is None
+    assert prefetcher.get_next_puzzle() is None
+    prefetcher.stop()
+
+
+def test_get_next_puzzle_miss(store: PuzzleStore, index: PuzzleIndex):
+    # Without the background thread every request is a miss decoded on the calling thread
+    prefetcher = PuzzlePrefetcher(store, index, rating=1600, rating_range=50, themes=["short"])
+    puzzle = prefetcher.get_next_puzzle()
+    assert puzzle.record.puzzle_id in ("0000D", "000hf")
+    assert prefetcher.get_stats() == {"depth": 0, "capacity": 3, "hits": 0, "misses": 1}
+
+    assert prefetcher.get_next_puzzle().record.puzzle_id in ("0000D", "000hf")
+    assert prefetcher.get_next_puzzle() is None
@@ -0,0 +1,85 @@
+from chess_puzzle_ai_cli.modules.board.board_model import BoardModel
+from chess_puzzle_ai_cli.modules.board.board_presenter import BoardPresenter
+from chess_puzzle_ai_cli.modules.puzzle.puzzle_prefetcher import PuzzleDecoder
+from chess_puzzle_ai_cli.modules.puzzle.puzzle_presenter import PuzzlePresenter
+from chess_puzzle_ai_cli.modules.puzzle.puzzle_store import PuzzleRecord
+from chess_puzzle_ai_cli.utils.common import AlertType
+from unittest.mock import Mock, patch
+import chess
+import pytest
+
+MATE_IN_TWO = PuzzleRecord("000hf", "r1bqk2r/pp1nbNp1/2p1p2p/8/2BP4/1PN3P1/P3QP1P/3R1RK1 b kq - 0 19",
+                           ("e8f7", "e2e6", "f7f8", "e6f7"), 1589, ("mate", "mateIn2", "short"), 90)
+
+
+@pytest.fixture(autouse=True)
+def mock_repaint_ui():
+    with patch('chess_puzzle_ai_cli.utils.ui_common.repaint_ui') as mock:
+        yield mock
+
+
+@pytest.fixture
+def presenter():
+    model = BoardModel()
+    board_presenter = BoardPresenter(model)
+    presenter = PuzzlePresenter(board_presenter)
+    presenter.view.show_alert = Mock()
+    yield presenter
+    presenter.cleanup()
+    board_presenter.cleanup()
+    model.cleanup()
+
+
+def _decode(record: PuzzleRecord):
+    decoder = PuzzleDecoder()
+    puzzle = decoder.decode(0, record)
+    decoder.cleanup()
+    return puzzle
+
+
+def test_start_puzzle(presenter: PuzzlePresenter):
+    puzzle = _decode(MATE_IN_TWO)
+    presenter.start_puzzle(puzzle)
+    model = presenter.board_presenter.model
+    assert model.board.fen() == puzzle.board.fen()
+    assert model.get_board_orientation() == chess.WHITE
+    assert presenter.session.steps is puzzle.steps
+    presenter.view.show_alert.assert_called_with("Puzzle 000hf (rating 1589): White to move", AlertType.NEUTRAL)
+
+
+def test_user_input_received(presenter: PuzzlePresenter):
+    solved_listener = Mock()
+    presenter.e_puzzle_solved.add_listener(solved_listener)
+
+    # Without a puzzle there is nothing to check the move against
+    presenter.user_input_received("e4")
+    presenter.view.show_alert.assert_called_with("There is no puzzle to solve", AlertType.ERROR)
+
+    puzzle = _decode(MATE_IN_TWO)
+    presenter.start_puzzle(puzzle)
+    model = presenter.board_presenter.model
+
+    # Illegal and incorrect moves leave the board unchanged
+    presenter.user_input_received("Qe8")
+    assert presenter.view.show_alert.call_args[0][1] is AlertType.ERROR
+    presenter.user_input_received("Rfe1")
+    presenter.view.show_alert.assert_called_with("Rfe1 is not the best move, try again", AlertType.ERROR)
+    assert presenter.session.mistakes == 1
+    assert model.board.fen() == puzzle.board.fen()
+
+    # Correct moves are played along with the opponents reply, through the move input
+    presenter.view.input_field_container.text = "e2e6"
+    presenter.view.input_field_container.buffer.validate_and_handle()
+    assert presenter.view.input_field_container.text == ""
+    presenter.view.show_alert.assert_called_with("Correct, keep going", AlertType.SUCCESS)
+    assert model.board.peek() == chess.Move.from_uci("f7f8")
+    solved_listener.assert_not_called()
+
+    presenter.user_input_received(" Qf7# ")
+    presenter.view.show_alert.assert_called_with("Puzzle solved!", AlertType.SUCCESS)
+    assert model.board.is_checkmate()
+    solved_listener.assert_called_once_with(puzzle)
+
+    presenter.user_input_received("Kg2")
+    presenter.view.show_alert.assert_called_with("There is no puzzle to solve", AlertType.ERROR)
+    solved_listener.assert_called_once()
@@ -0,0 +1,100 @@
+from chess_puzzle_ai_cli.modules.board.board_model import BoardModel
+from chess_puzzle_ai_cli.modules.puzzle.puzzle_prefetcher import PuzzleDecoder, DecodedPuzzle
+from chess_puzzle_ai_cli.modules.puzzle.puzzle_session import PuzzleSession, PuzzleMoveResult, compute_puzzle_steps
+from chess_puzzle_ai_cli.modules.puzzle.puzzle_store import PuzzleRecord
+from time import perf_counter
+import chess
+import pytest
+
+MATE_IN_TWO = PuzzleRecord("000hf", "r1bqk2r/pp1nbNp1/2p1p2p/8/2BP4/1PN3P1/P3QP1P/3R1RK1 b kq - 0 19",
+                           ("e8f7", "e2e6", "f7f8", "e6f7"), 1589, ("mate", "mateIn2", "short"), 90)
+BACK_RANK_MATE = PuzzleRecord("00001", "6k1/p4ppp/8/8/8/8/8/1R2R1K1 b - - 0 1",
+                              ("a7a6", "e1e8"), 600, ("mate", "mateIn1"), 90)
+
+
+def _decode(record: PuzzleRecord) -> DecodedPuzzle:
+    decoder = PuzzleDecoder()
+    puzzle = decoder.decode(0, record)
+    decoder.cleanup()
+    return puzzle
+
+
+def _start_session(record: PuzzleRecord) -> PuzzleSession:
+    puzzle = _decode(record)
+    model = BoardModel()
+    model.load_board(puzzle.board, puzzle.get_solver_color(), notify=False)
+    return PuzzleSession(model, puzzle.steps)
+
+
+def test_compute_puzzle_steps():
+    puzzle = _decode(MATE_IN_TWO)
+    move = chess.Move.from_uci
+    assert [step.expected_move for step in puzzle.steps] == [move("e2e6"), move("e6f7")]
+    assert [step.reply for step in puzzle.steps] == [move("f7f8"), None]
+    assert [step.mating_moves for step in puzzle.steps] == [frozenset(), frozenset([move("e6f7")])]
+
+    # The board is left unchanged
+    assert puzzle.board.move_stack == [move("e8f7")]
+
+    with pytest.raises(ValueError):
+        compute_puzzle_steps(puzzle.board, [move("e2e6"), move("e6f7")])
+
+
+def test_submit_move():
+    session = _start_session(MATE_IN_TWO)
+    model = session.model
+
+    # An incorrect move leaves the board unchanged
+    assert session.submit_move("Rfe1") is PuzzleMoveResult.INCORRECT
+    assert session.mistakes == 1
+    assert model.board.move_stack == [chess.Move.from_uci("e8f7")]
+
+    # A correct move is played along with the opponents reply
+    assert session.submit_move("e2e6") is PuzzleMoveResult.CORRECT
+    assert model.board.move_stack[-2:] == [chess.Move.from_uci("e2e6"), chess.Move.from_uci("f7f8")]
+    assert model.get_highlight_move() == chess.Move.from_uci("f7f8")
+    assert session.get_expected_move() == chess.Move.from_uci("e6f7")
+
+    assert session.submit_move(chess.Move.from_uci("e6f7")) is PuzzleMoveResult.SOLVED
+    assert session.is_solved()
+    assert session.get_expected_move() is None
+    assert model.board.is_checkmate()
+
+    with pytest.raises(Warning):
+        session.submit_move("Kg2")
+
+    # Illegal moves are errors, not mistakes
+    session = _start_session(MATE_IN_TWO)
+    with pytest.raises(ValueError):
+        session.submit_move("Qe8")
+    assert session.mistakes == 0
+
+
+def test_alternative_mate_accepted():
+    session = _start_session(BACK_RANK_MATE)
+    assert session.submit_move("Rb8#") is PuzzleMoveResult.SOLVED
+    assert session.model.board.is_checkmate()
+
+
+def test_check_move():
+    # Only the expected move and other mating moves are correct, checking leaves the board unchanged
+    session = _start_session(BACK_RANK_MATE)
+    correct_moves = [move for move in session.model.get_legal_moves() if session.check_move(move)]
+    assert sorted(move.uci() for move in correct_moves) == ["b1b8", "e1e8"]
+    assert session.model.board.move_stack == [chess.Move.from_uci("a7a6")]
+    assert session.mistakes == 0
+
+
+@pytest.mark.benchmark
+def test_check_move_speed():
+    # Verify checking a move is a lookup, rather than move generation
+    session = _start_session(MATE_IN_TWO)
+    moves = session.model.get_legal_moves()
+    iterations = 200
+
+    start = perf_counter()
+    for _ in range(iterations):
+        for move in moves:
+            session.check_move(move)
+    per_check = (perf_counter() - start) / (iterations * len(moves))
+    assert per_check < 5e-6
@@ -0,0 +1,158 @@
+from chess_puzzle_ai_cli.modules.puzzle.puzzle_store import (PuzzleStore, PuzzleStoreWriter, PuzzleRecord, RECORD_SIZE,
+                                                             pack_fen, unpack_fen, pack_puzzle, encode_move, decode_move,
+                                                             encode_themes, decode_themes, get_puzzle_store_filename)
+from chess_puzzle_ai_cli.modules.board.board_model import BoardModel
+import chess
+import pytest
+
+
+@pytest.fixture
+def store_path(tmp_path):
+    return str(tmp_path / "store")
+
+
+@pytest.fixture
+def store(store_path):
+    writer = PuzzleStoreWriter(store_path)
+    writer.append_records([
+        pack_puzzle("00008", "r6k/pp2r2p/4Rp1Q/3p4/8/1N1P2R1/PqP2bPP/7K b - - 0 24", "f2g3 e6e7 b2b1 b3c1 b1c1 h6c1",
+                    1913, "crushing hangingPiece long middlegame", 93),
+        pack_puzzle("0000D", "5rk1/1p3ppp/pq3b2/8/8/1P1Q1N2/P4PPP/3R2K1 w - - 2 27", "d3d6 f8d8 d6d8 f6d8",
+                    1580, "advantage endgame short", -12),
+    ])
+    writer.close()
+
+    store = PuzzleStore(store_path)
+    yield store
+    store.close()
+
+
+def test_pack_fen():
+    fens = [
+        chess.STARTING_FEN,
+        "r6k/pp2r2p/4Rp1Q/3p4/8/1N1P2R1/PqP2bPP/7K b - - 0 24",
+        "rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w Kq f6 0 3",
+        "8/8/8/8/8/8/8/8 w - - 0 1",
+    ]
+    for fen in fens:
+        packed = pack_fen(fen)
+        assert len(packed) == 32
+        assert unpack_fen(packed) == fen
+
+    # Test unrepresentable FENs
+    with pytest.raises(ValueError):
+        pack_fen("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP w KQkq - 0 1")
+
+    with pytest.raises(ValueError):
+        pack_fen("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w HAha - 0 1")
+
+    with pytest.raises(ValueError):
+        pack_fen("QQQQQQQQ/QQQQQQQQ/QQQQQQQQ/QQQQQQQQ/QQQQQQQQ/8/8/8 w - - 0 1")
+
+
+def test_encode_move():
+    for uci in ["e2e4", "a1h8", "h8a1", "e7e8q", "b2a1n"]:
+        assert decode_move(encode_move(uci)) == uci
+        assert encode_move(uci) < 1 << 16
+
+    for uci in ["e2", "e2e9", "i2e4", "e7e8x"]:
+        with pytest.raises(ValueError):
+            encode_move(uci)
+
+
+def test_encode_themes():
+    themes_mask = encode_themes("mateIn2 short notATheme backRankMate")
+    assert decode_themes(themes_mask) == ("backRankMate", "mateIn2", "short")
+    assert encode_themes("") == 0
+    assert themes_mask < 1 << 128
+
+
+def test_pack_puzzle():
+    assert len(pack_puzzle("00008", chess.STARTING_FEN, "e2e4 e7e5", 1500, "opening", 0)) == RECORD_SIZE
+
+    with pytest.raises(ValueError):
+        pack_puzzle("00008", chess.STARTING_FEN, "", 1500, "opening", 0)
+
+    with pytest.raises(ValueError):
+        pack_puzzle("00008", chess.STARTING_FEN, " ".join(["e2e4"] * 33), 1500, "opening", 0)
+
+    with pytest.raises(ValueError):
+        pack_puzzle("toolongid", chess.STARTING_FEN, "e2e4", 1500, "opening", 0)
+
+
+def test_puzzle_store(store: PuzzleStore):
+    assert len(store) == 2
+    assert store.get_puzzle(1) == PuzzleRecord("0000D", "5rk1/1p3ppp/pq3b2/8/8/1P1Q1N2/P4PPP/3R2K1 w - - 2 27",
+                                               ("d3d6", "f8d8", "d6d8", "f6d8"), 1580,
+                                               ("advantage", "endgame", "short"), -12)
+    assert store.get_rating(0) == 1913
+    assert decode_themes(store.get_themes_mask(0)) == ("crushing", "hangingPiece", "long", "middlegame")
+
+    with pytest.raises(IndexError):
+        store.get_puzzle(2)
+
+    with pytest.raises(IndexError):
+        store.get_rating(-1)
+
+
+def test_puzzle_store_seeds_board_model(store: PuzzleStore):
+    puzzle = store.get_puzzle(0)
+    assert not puzzle.get_turn()
+
+    model = BoardModel(orientation=not puzzle.get_turn(), fen=puzzle.fen)
+    assert model.board.fen() == puzzle.fen
+    for move in puzzle.moves:
+        model.make_move(move)
+
+
+def test_puzzle_store_writer_appends(store_path, store: PuzzleStore):
+    writer = PuzzleStoreWriter(store_path)
+    assert writer.record_count == 2
+    writer.append_records([pack_puzzle("0000X", chess.STARTING_FEN, "e2e4", 600, "opening", 1)])
+    assert writer.record_count == 3
+    writer.close()
+
+    reopened_store = PuzzleStore(store_path)
+    assert len(reopened_store) == 3
+    assert reopened_store.get_puzzle(2).puzzle_id == "0000X"
+    reopened_store.close()
+
+
+def test_puzzle_store_writer_truncates_partial_record(store_path, store: PuzzleStore):
+    # A record cut off by an interrupted write is removed on open, so later appends stay aligned
+    record = pack_puzzle("0000X", chess.STARTING_FEN, "e2e4", 600, "opening", 1)
+    with open(get_puzzle_store_filename(store_path), "ab") as f:
+        f.write(record[:RECORD_SIZE // 2])
+
+    writer = PuzzleStoreWriter(store_path)
+    assert writer.record_count == 2
+    writer.append_records([record])
+    writer.truncate(5)
+    assert writer.record_count == 3
+    writer.close()
+
+    reopened_store = PuzzleStore(store_path)
+    assert len(reopened_store) == 3
+    assert reopened_store.get_puzzle(2).puzzle_id == "0000X"
+    reopened_store.close()
+
+    # Records past the count are removed
+    writer = PuzzleStoreWriter(store_path)
+    writer.truncate(1)
+    assert writer.record_count == 1
+    writer.close()
+    reopened_store = PuzzleStore(store_path)
+    assert len(reopened_store) == 1
+    reopened_store.close()
+
+
+def test_puzzle_store_invalid_file(store_path):
+    with pytest.raises(OSError):
+        PuzzleStore(store_path)
+
+    PuzzleStoreWriter(store_path).close()
+    with open(get_puzzle_store_filename(store_path), "r+b") as f:
+        f.write(b"XXXX")
+
+    with pytest.raises(ValueError):
+        PuzzleStore(store_path)
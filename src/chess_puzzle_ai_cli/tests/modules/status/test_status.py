@@ -0,0 +1,123 @@
+from chess_puzzle_ai_cli.modules.status.status_model import (StatusModel, AgentStatus, parse_status_line,
+                                                             AGENT_RUNNING, AGENT_FINISHED, AGENT_FAILED)
+from chess_puzzle_ai_cli.modules.status.status_presenter import StatusPresenter
+from chess_puzzle_ai_cli.utils.common import AlertType
+from unittest.mock import MagicMock, patch
+from time import sleep, monotonic, perf_counter
+import json
+import pytest
+
+
+@pytest.fixture
+def status_file(tmp_path):
+    return str(tmp_path / "status.jsonl")
+
+
+@pytest.fixture(autouse=True)
+def mock_repaint_ui():
+    with patch('chess_puzzle_ai_cli.utils.ui_common.repaint_ui') as mock:
+        yield mock
+
+
+def _append_status(status_file: str, *events) -> None:
+    with open(status_file, "a") as f:
+        for event in events:
+            f.write((json.dumps(event) if isinstance(event, dict) else event) + "\n")
+
+
+def _wait_for(condition, timeout: float = 5.0):
+    deadline = monotonic() + timeout
+    while not condition() and monotonic() < deadline:
+        sleep(0.01)
+
+
+def test_parse_status_line():
+    assert parse_status_line(b'{"status": "running", "message": "Running tests"}') == AgentStatus(AGENT_RUNNING, "Running tests")
+    assert parse_status_line(b'{"status": "FINISHED"}') == AgentStatus(AGENT_FINISHED, "")
+    assert parse_status_line(b'{"message": "Step 2"}') == AgentStatus(AGENT_RUNNING, "Step 2")
+    assert parse_status_line(b"Compiling...") == AgentStatus(AGENT_RUNNING, "Compiling...")
+    assert parse_status_line(b"   ") is None
+    assert parse_status_line(b'{"status": "running"') is None
+    assert parse_status_line(b'{"status": "sleeping"}') is None
+
+
+def test_status_model(status_file):
+    _append_status(status_file, {"status": "running", "message": "Starting"})
+    model = StatusModel(status_file)
+    assert model.get_status() == AgentStatus(AGENT_RUNNING, "Starting")
+
+    updated_listener = MagicMock()
+    finished_listener = MagicMock()
+    model.e_status_model_updated.add_listener(updated_listener)
+    model.e_agent_finished.add_listener(finished_listener)
+
+    # Only the latest status of a batch of appended lines is applied. The lines may
+    # already have been read by the watcher thread, so wait for the status to apply
+    _append_status(status_file, {"message": "Step 1"}, {"message": "Step 2"}, "{\"status\": broken")
+    model.read_status_file()
+    _wait_for(lambda: model.get_status() == AgentStatus(AGENT_RUNNING, "Step 2"))
+    assert model.get_status() == AgentStatus(AGENT_RUNNING, "Step 2")
+    updated_listener.assert_called_once()
+    finished_listener.assert_not_called()
+
+    _append_status(status_file, {"status": "finished", "message": "All tests pass"})
+    _wait_for(model.is_agent_finished)
+    assert model.is_agent_finished()
+    finished_listener.assert_called_once_with(AgentStatus(AGENT_FINISHED, "All tests pass"))
+    model.cleanup()
+
+
+def test_status_model_without_status_file():
+    model = StatusModel(None)
+    assert model.get_status() is None
+    assert not model.is_agent_finished()
+    assert StatusPresenter(model).get_status_display() == ("", AlertType.NEUTRAL)
+    model.cleanup()
+
+
+def test_status_presenter(status_file):
+    model = StatusModel(status_file)
+    presenter = StatusPresenter(model)
+    assert presenter.get_status_display() == ("", AlertType.NEUTRAL)
+
+    model.set_status(AgentStatus(AGENT_RUNNING, ""))
+    assert presenter.get_status_display() == ("AI agent running...", AlertType.NEUTRAL)
+
+    model.set_status(AgentStatus(AGENT_RUNNING, "Running tests"))
+    assert presenter.view._status_banner._alert_label.text == "AI agent running: Running tests"
+
+    model.set_status(AgentStatus(AGENT_FAILED, "Exit code 1"))
+    assert presenter.get_status_display() == ("AI agent failed: Exit code 1", AlertType.ERROR)
+
+    model.set_status(AgentStatus(AGENT_FINISHED, ""))
+    assert presenter.get_status_display() == ("AI agent finished", AlertType.SUCCESS)
+    model.cleanup()
+
+
+def test_status_model_chatty_agent(status_file):
+    model = StatusModel(status_file)
+    model._watcher.stop()
+
+    # Megabytes of progress lines are appended between reads
+    progress = "".join(json.dumps({"message": f"Progress {i}"}) + "\n" for i in range(100000))
+    with open(status_file, "a") as f:
+        f.write(progress)
+
+    model.read_status_file()
+    assert model.get_status() == AgentStatus(AGENT_RUNNING, "Progress 99999")
+    model.cleanup()
+
+
+@pytest.mark.benchmark
+def test_status_model_chatty_agent_speed(status_file):
+    # Only the latest status line is parsed, so reading megabytes of progress lines stays fast
+    model = StatusModel(status_file)
+    model._watcher.stop()
+    progress = "".join(json.dumps({"message": f"Progress {i}"}) + "\n" for i in range(100000))
+    with open(status_file, "a") as f:
+        f.write(progress)
+
+    start = perf_counter()
+    model.read_status_file()
+    assert perf_counter() - start < 0.1
+    model.cleanup()
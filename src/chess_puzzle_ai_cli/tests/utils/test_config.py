@@ -0,0 +1,208 @@
+from chess_puzzle_ai_cli.utils import config
+from chess_puzzle_ai_cli.utils.config import GameConfig, TerminalConfig, get_config_document
+from time import sleep
+from unittest.mock import Mock
+import configparser
+import threading
+import stat
+import os
+import pytest
+
+
+@pytest.fixture
+def config_path(tmp_path, monkeypatch):
+    config_path = str(tmp_path) + os.sep
+    monkeypatch.setattr('chess_puzzle_ai_cli.utils.config.get_config_path', lambda: config_path)
+    return config_path
+
+
+def test_shared_document(config_path: str):
+    game_config = GameConfig("config.ini")
+    terminal_config = TerminalConfig("config.ini")
+    assert game_config.document is terminal_config.document
+    assert game_config.parser is terminal_config.parser
+
+    # Creating both sections is one read, and one write per config
+    assert game_config.document.reads == 1
+    assert game_config.document.writes == 2
+    assert game_config.parser.has_section("terminal")
+
+    # A config of an existing file does not write anything
+    GameConfig("config.ini")
+    assert game_config.document.writes == 2
+
+
+def test_batch(config_path: str):
+    game_config = GameConfig("config.ini")
+    document = game_config.document
+    writes = document.writes
+    game_listener = Mock()
+    config_listener = Mock()
+    game_config.e_game_config_updated.add_listener(game_listener)
+    game_config.e_config_updated.add_listener(config_listener)
+
+    with game_config.batch():
+        game_config.set_value(GameConfig.Keys.BLINDFOLD_CHESS, True)
+        with game_config.batch():
+            game_config.set_value(GameConfig.Keys.USE_UNICODE_PIECES, False)
+        game_config.set_value(GameConfig.Keys.PAD_UNICODE, False)
+
+        # Nothing is written or notified until the outermost batch ends
+        assert document.writes == writes
+        game_listener.assert_not_called()
+
+    assert document.writes == writes + 1
+    game_listener.assert_called_once()
+    config_listener.assert_called_once()
+
+    # Outside a batch each change is written
+    game_config.set_value(GameConfig.Keys.PAD_UNICODE, True)
+    assert document.writes == writes + 2
+    assert game_listener.call_count == 2
+
+    # The written values are read back from the file
+    document.read()
+    assert game_config.get_boolean(GameConfig.Keys.BLINDFOLD_CHESS)
+    assert not game_config.get_boolean(GameConfig.Keys.USE_UNICODE_PIECES)
+
+
+def test_atomic_write(config_path: str, monkeypatch):
+    game_config = GameConfig("config.ini")
+    with open(game_config.full_filename) as config_file:
+        contents = config_file.read()
+
+    # A failed write leaves the previous file intact and no temp files behind
+    monkeypatch.setattr(game_config.parser, "write", Mock(side_effect=OSError("disk full")))
+    with pytest.raises(OSError):
+        game_config.set_value(GameConfig.Keys.BLINDFOLD_CHESS, True)
+
+    with open(game_config.full_filename) as config_file:
+        assert config_file.read() == contents
+    assert os.listdir(config_path) == ["config.ini"]
+
+
+@pytest.mark.skipif(os.name == "nt", reason="file permission bits are not supported on Windows")
+def test_write_keeps_file_mode(config_path: str):
+    # A new file is created with the default permissions
+    umask = os.umask(0o022)
+    try:
+        game_config = GameConfig("config.ini")
+    finally:
+        os.umask(umask)
+    assert stat.S_IMODE(os.stat(game_config.full_filename).st_mode) == 0o644
+
+    # Rewriting the file keeps its permissions
+    os.chmod(game_config.full_filename, 0o640)
+    game_config.set_value(GameConfig.Keys.BLINDFOLD_CHESS, True)
+    assert stat.S_IMODE(os.stat(game_config.full_filename).st_mode) == 0o640
+
+
+def test_stale_document(config_path: str):
+    # The document is re-read when the file is changed or removed underneath it
+    game_config = GameConfig("config.ini")
+    os.remove(game_config.full_filename)
+    assert get_config_document(game_config.full_filename).reads == 2
+    assert not game_config.parser.has_section("game")
+
+
+def test_load_all_configs(config_path: str, monkeypatch):
+    # Loading the program configs on first run reads and writes the config file once
+    # The config instances are removed, and restored (or removed again) after the test
+    for name in ["player_info_config", "game_config", "terminal_config", "lichess_config"]:
+        monkeypatch.setitem(vars(config), name, None)
+        monkeypatch.delitem(vars(config), name)
+    monkeypatch.setattr(config, "all_configs", [])
+    monkeypatch.setattr(config, "redact_from_logs", Mock())
+
+    config.load_all_configs()
+    document = config.game_config.document
+    assert config.lichess_config.document is document
+    assert (document.reads, document.writes) == (1, 1)
+    assert len(document.parser.sections()) == 4
+
+
+def test_game_config_snapshot(config_path: str):
+    game_config = GameConfig("config.ini")
+    snapshot = game_config.get_snapshot()
+    assert snapshot.use_unicode_pieces and not snapshot.blindfold_chess
+    with pytest.raises(AttributeError):
+        snapshot.blindfold_chess = True  # noqa
+
+    # The snapshot is shared until the configuration changes
+    assert game_config.get_snapshot() is snapshot
+    with game_config.batch():
+        game_config.set_value(GameConfig.Keys.BLINDFOLD_CHESS, "yes")
+        game_config.set_value(GameConfig.Keys.USE_UNICODE_PIECES, "no")
+    new_snapshot = game_config.get_snapshot()
+    assert new_snapshot is not snapshot
+    assert new_snapshot.blindfold_chess and not new_snapshot.use_unicode_pieces
+    assert snapshot.use_unicode_pieces and not snapshot.blindfold_chess
+
+    # Invalid values fall back to the default
+    game_config.set_value(GameConfig.Keys.PAD_UNICODE, "maybe")
+    assert game_config.get_snapshot().pad_unicode is GameConfig.Keys.PAD_UNICODE.default_value
+
+
+def _edit_config_file(full_filename: str, section: str, key: str, value: str) -> None:
+    """Edits the config file as another program would"""
+    parser = configparser.ConfigParser()
+    parser.read(full_filename)
+    parser[section][key] = value
+    with open(full_filename, 'w') as config_file:
+        parser.write(config_file)
+
+
+def test_reload(config_path: str):
+    game_config = GameConfig("config.ini")
+    terminal_config = TerminalConfig("config.ini")
+    game_listener = Mock()
+    terminal_listener = Mock()
+    game_config.e_game_config_updated.add_listener(game_listener)
+    terminal_config.e_program_config_updated.add_listener(terminal_listener)
+
+    # Nothing is reloaded or notified if the file has not changed
+    assert game_config.document.reload() == set()
+
+    # Only the configs of the changed sections are notified
+    _edit_config_file(game_config.full_filename, "game", "blindfold_chess", "True")
+    assert game_config.document.reload() == {"game"}
+    assert game_config.get_snapshot().blindfold_chess
+    game_listener.assert_called_once()
+    terminal_listener.assert_not_called()
+
+    # Rewriting the same values is not a change
+    _edit_config_file(game_config.full_filename, "terminal", "max_frame_rate", "30")
+    assert game_config.document.reload() == set()
+    terminal_listener.assert_not_called()
+
+    # A file which cannot be parsed keeps the current values
+    with open(game_config.full_filename, 'w') as config_file:
+        config_file.write("blindfold_chess = False")
+    assert game_config.document.reload() == set()
+    assert game_config.get_snapshot().blindfold_chess
+
+
+def test_watch_for_changes(config_path: str):
+    game_config = GameConfig("config.ini")
+    reloaded = threading.Event()
+    game_config.e_game_config_updated.add_listener(reloaded.set)
+
+    game_config.document.start_watching()
+    game_config.document.start_watching()
+    try:
+        # Changes written by this process are not reloaded
+        game_config.set_value(GameConfig.Keys.PAD_UNICODE, False)
+        reloaded.clear()
+        sleep(0.2)
+        assert not reloaded.is_set()
+
+        _edit_config_file(game_config.full_filename, "game", "use_unicode_pieces", "False")
+        assert reloaded.wait(5)
+        assert not game_config.get_snapshot().use_unicode_pieces
+
+        # The file is watched until every start is matched by a stop
+        game_config.document.stop_watching()
+        assert game_config.document._watcher is not None  # noqa
+    finally:
+        game_config.document.stop_watching()
+    assert game_config.document._watcher is None  # noqa
@@ -0,0 +1,71 @@
+from chess_puzzle_ai_cli.utils.file_tailer import FileTailer
+from unittest.mock import patch
+import os
+import pytest
+
+
+@pytest.fixture
+def tailer(tmp_path):
+    tailer = FileTailer(str(tmp_path / "status.jsonl"))
+    yield tailer
+    tailer.close()
+
+
+def _append(file_path: str, data: bytes) -> None:
+    with open(file_path, "ab") as f:
+        f.write(data)
+
+
+def test_read_lines(tailer: FileTailer):
+    # The file does not need to exist yet
+    assert tailer.read_lines() == []
+
+    _append(tailer.file_path, b"first\nsecond\r\nthi")
+    assert tailer.read_lines() == [b"first", b"second"]
+    assert tailer.read_lines() == []
+
+    # Partial lines are held back until they are complete
+    _append(tailer.file_path, b"rd\n")
+    assert tailer.read_lines() == [b"third"]
+    assert tailer.offset == os.path.getsize(tailer.file_path)
+
+
+def test_read_lines_only_reads_appended_bytes(tailer: FileTailer):
+    _append(tailer.file_path, b"a" * 1000 + b"\n")
+    tailer.read_lines()
+
+    _append(tailer.file_path, b"new\n")
+    with patch.object(tailer._file, "read", wraps=tailer._file.read) as mock_read:
+        assert tailer.read_lines() == [b"new"]
+        mock_read.assert_called_once_with(4)
+
+
+def test_read_lines_truncated(tailer: FileTailer):
+    _append(tailer.file_path, b"old line one\nold line two\n")
+    tailer.read_lines()
+
+    with open(tailer.file_path, "wb") as f:
+        f.write(b"new\n")
+    assert tailer.read_lines() == [b"new"]
+
+
+def test_read_lines_rotated(tailer: FileTailer, tmp_path):
+    _append(tailer.file_path, b"old\n")
+    tailer.read_lines()
+
+    os.rename(tailer.file_path, str(tmp_path / "status.jsonl.1"))
+    _append(tailer.file_path, b"rotated line\n")
+    assert tailer.read_lines() == [b"rotated line"]
+
+
+def test_read_lines_skips_ahead(tmp_path):
+    tailer = FileTailer(str(tmp_path / "status.jsonl"), max_read_size=100)
+    _append(tailer.file_path, b"".join(f"progress {i}\n".encode() for i in range(100000)))
+
+    # Only the most recent complete lines are read
+    lines = tailer.read_lines()
+    assert lines[-1] == b"progress 99999"
+    assert 0 < len(lines) <= 10
+    assert all(line.startswith(b"progress ") for line in lines)
+    assert tailer.bytes_skipped > 1000000
+    tailer.close()
@@ -0,0 +1,99 @@
+from chess_puzzle_ai_cli.utils.file_watcher import FileWatcher, INOTIFY_EVENT_STRUCT, IN_CLOSE_WRITE, IN_MODIFY, IN_MOVED_TO
+from unittest.mock import MagicMock
+from time import sleep, monotonic
+import os
+import pytest
+
+
+def _wait_for_calls(callback: MagicMock, call_count: int, timeout: float = 5.0) -> None:
+    deadline = monotonic() + timeout
+    while callback.call_count < call_count and monotonic() < deadline:
+        sleep(0.01)
+
+
+@pytest.fixture(params=[True, False], ids=["inotify", "polling"])
+def watcher_factory(request, monkeypatch):
+    if not request.param:
+        monkeypatch.setattr("chess_puzzle_ai_cli.utils.file_watcher._load_inotify", lambda: None)
+
+    watchers = []
+
+    def _create(file_path, callback):
+        watcher = FileWatcher(file_path, callback, poll_interval=0.05)
+        watcher.start()
+        watchers.append(watcher)
+        return watcher
+
+    yield _create
+    for watcher in watchers:
+        watcher.stop()
+
+
+def test_file_watcher(tmp_path, watcher_factory):
+    file_path = tmp_path / "clock.txt"
+    file_path.write_text("1")
+    callback = MagicMock()
+    watcher_factory(str(file_path), callback)
+
+    # No callback without a change
+    sleep(0.2)
+    callback.assert_not_called()
+
+    # An in place write may be seen mid write (truncated), so it can report more than once
+    file_path.write_text("22")
+    _wait_for_calls(callback, 1)
+    assert callback.call_count >= 1
+
+    # Atomic (rename based) writes are picked up
+    sleep(0.2)
+    call_count = callback.call_count
+    temp_path = tmp_path / "clock.txt.tmp"
+    temp_path.write_text("333")
+    os.replace(temp_path, file_path)
+    _wait_for_calls(callback, call_count + 1)
+    assert callback.call_count == call_count + 1
+
+
+def test_file_watcher_inotify_events(tmp_path):
+    file_path = tmp_path / "clock.txt"
+    file_path.write_text("1")
+    callback = MagicMock()
+    watcher = FileWatcher(str(file_path), callback)
+
+    def _event(mask: int, name: bytes) -> bytes:
+        return INOTIFY_EVENT_STRUCT.pack(1, mask, 0, 16) + name.ljust(16, b"\0")
+
+    # Events of other files in the directory are ignored
+    watcher._handle_inotify_events(_event(IN_CLOSE_WRITE, b"clock.txt.tmp"))
+    callback.assert_not_called()
+
+    # A modification which leaves the files mtime, size and inode unchanged is not reported...
+    watcher._handle_inotify_events(_event(IN_MODIFY, b"clock.txt"))
+    callback.assert_not_called()
+
+    # ...but every completed write or rename over the file is, even if its signature is unchanged
+    watcher._handle_inotify_events(_event(IN_CLOSE_WRITE, b"clock.txt") + _event(IN_MOVED_TO, b"clock.txt"))
+    assert callback.call_count == 2
+
+
+def test_file_watcher_missing_file(tmp_path, watcher_factory):
+    file_path = tmp_path / "status.txt"
+    callback = MagicMock()
+    watcher_factory(str(file_path), callback)
+
+    file_path.write_text("running")
+    _wait_for_calls(callback, 1)
+    assert callback.call_count >= 1
+
+
+def test_file_watcher_stop(tmp_path, watcher_factory):
+    file_path = tmp_path / "clock.txt"
+    file_path.write_text("1")
+    callback = MagicMock()
+    watcher = watcher_factory(str(file_path), callback)
+    watcher.stop()
+    sleep(0.2)
+
+    file_path.write_text("22")
+    sleep(0.2)
+    callback.assert_not_called()
@@ -0,0 +1,90 @@
+from chess_puzzle_ai_cli.utils.frame_scheduler import FrameScheduler
+from time import monotonic
+from unittest.mock import Mock
+import threading
+import asyncio
+import pytest
+
+
+def test_flush_without_event_loop():
+    # Outside a running event loop renders are flushed immediately
+    scheduler = FrameScheduler()
+    render = Mock()
+    scheduler.mark_dirty(render)
+    scheduler.mark_dirty(render)
+    assert render.call_count == 2
+    assert scheduler.frame_count == 2
+
+    with pytest.raises(ValueError):
+        FrameScheduler(max_frame_rate=0)
+
+
+def test_coalesce_renders():
+    scheduler = FrameScheduler()
+    board_render = Mock()
+    clock_render = Mock()
+
+    async def run():
+        for _ in range(100):
+            scheduler.mark_dirty(board_render)
+            scheduler.mark_dirty(clock_render)
+
+        # Nothing is rendered until the event loop runs the next iteration
+        board_render.assert_not_called()
+        await asyncio.sleep(0)
+
+    asyncio.run(run())
+    board_render.assert_called_once()
+    clock_render.assert_called_once()
+    assert scheduler.frame_count == 1
+
+
+def test_max_frame_rate():
+    scheduler = FrameScheduler(max_frame_rate=10)
+    frame_times = []
+
+    async def run():
+        for frame in range(3):
+            scheduler.mark_dirty(lambda: frame_times.append(monotonic()))
+            while scheduler.frame_count <= frame:
+                await asyncio.sleep(0.01)
+
+    asyncio.run(run())
+    assert len(frame_times) == 3
+    assert frame_times[1] - frame_times[0] >= 0.09
+    assert frame_times[2] - frame_times[1] >= 0.09
+
+
+def test_cancel():
+    scheduler = FrameScheduler()
+    render = Mock()
+
+    async def run():
+        scheduler.mark_dirty(render)
+        scheduler.cancel()
+        await asyncio.sleep(0.01)
+
+    asyncio.run(run())
+    render.assert_not_called()
+
+
+def test_render_from_another_thread():
+    # Render requests from another thread are rendered on the event loop's thread
+    scheduler = FrameScheduler()
+    render_threads = []
+    render = Mock(side_effect=lambda: render_threads.append(threading.get_ident()))
+
+    async def run():
+        scheduler.set_event_loop(asyncio.get_running_loop())
+        thread = threading.Thread(target=scheduler.mark_dirty, args=(render,))
+        thread.start()
+        thread.join()
+        while not scheduler.frame_count:
+            await asyncio.sleep(0.01)
+
+    asyncio.run(run())
+    assert render_threads == [threading.get_ident()]
+
+    # Once the event loop has stopped, the render is flushed immediately
+    scheduler.mark_dirty(render)
+    assert render.call_count == 2
@@ -0,0 +1,214 @@
+from chess_puzzle_ai_cli.utils.logging import (BoundedQueueHandler, LoggingRedactor, Redactor, configure_logger,
+                                               redact_from_logs, stop_logging, log)
+from random import Random
+import logging
+import string
+import timeit
+import threading
+import queue
+import os
+import pytest
+
+
+@pytest.fixture
+def config_path(tmp_path, monkeypatch):
+    config_path = str(tmp_path) + os.sep
+    monkeypatch.setattr('chess_puzzle_ai_cli.utils.config.get_config_path', lambda: config_path)
+    level = log.level
+    yield config_path
+    stop_logging()
+    log.setLevel(level)
+
+
+def test_queued_logging(config_path: str, monkeypatch):
+    # Verify records are written by the listener thread, not the logging thread
+    writer_threads = set()
+    emit = logging.FileHandler.emit
+    log_file = config_path + "unit-test-queued.log"
+
+    def record_writer_thread(handler: logging.FileHandler, record: logging.LogRecord) -> None:
+        if handler.baseFilename == log_file:
+            writer_threads.add(threading.get_ident())
+        emit(handler, record)
+
+    monkeypatch.setattr(logging.FileHandler, "emit", record_writer_thread)
+    logger = configure_logger("unit-test-queued")
+    for i in range(100):
+        logger.debug(f"Record {i}")
+    logger.info("Value: %s", 42)
+
+    # Stopping flushes every queued record to the file
+    stop_logging()
+    with open(log_file) as file:
+        lines = file.read().splitlines()
+    assert len(lines) == 101
+    assert lines[0].endswith("| Record 0")
+    assert lines[-1].endswith("| Value: 42")
+    assert writer_threads and threading.get_ident() not in writer_threads
+    assert not logger.handlers
+
+
+def test_program_logger(config_path: str, capsys):
+    # Verify the records of the program logger, which every module logs through, reach the log file
+    # (and not stderr, which the full screen UI is drawn on)
+    assert configure_logger("unit-test-program") is log
+    log.debug("Debug record")
+    log.error("Error record")
+    stop_logging()
+
+    with open(config_path + "unit-test-program.log") as file:
+        lines = file.read().splitlines()
+    assert [line.rsplit("| ", 1)[1] for line in lines] == ["Debug record", "Error record"]
+    assert "Error record" not in capsys.readouterr().err
+
+
+def test_configure_logger_again(config_path: str):
+    # Configuring the logger again replaces the previous configuration, so records aren't duplicated
+    configure_logger("unit-test-first")
+    log.debug("First record")
+    configure_logger("unit-test-second")
+    log.debug("Second record")
+    configure_logger("unit-test-second")
+    assert len([handler for handler in log.handlers if isinstance(handler, BoundedQueueHandler)]) == 1
+    log.debug("Third record")
+    stop_logging()
+
+    with open(config_path + "unit-test-first.log") as file:
+        assert [line.split("| ")[-1] for line in file.read().splitlines()] == ["First record"]
+    with open(config_path + "unit-test-second.log") as file:
+        assert [line.split("| ")[-1] for line in file.read().splitlines()] == ["Second record", "Third record"]
+
+
+def test_drop_when_full():
+    # Nothing consumes the queue, so records past its size are dropped
+    handler = BoundedQueueHandler(queue.Queue(maxsize=5))
+    logger = logging.getLogger("unit-test-drop")
+    logger.addHandler(handler)
+    try:
+        for i in range(8):
+            logger.warning(f"Record {i}")
+    finally:
+        logger.removeHandler(handler)
+
+    assert handler.queue.qsize() == 5
+    assert handler.dropped == 3
+
+
+def test_block_when_full():
+    # The logging thread waits for space rather than dropping records
+    log_queue = queue.Queue(maxsize=1)
+    handler = BoundedQueueHandler(log_queue, block_when_full=True)
+    record = logging.makeLogRecord({"msg": "Record"})
+    handler.handle(record)
+
+    blocked_thread = threading.Thread(target=handler.handle, args=(record,), daemon=True)
+    blocked_thread.start()
+    blocked_thread.join(0.1)
+    assert blocked_thread.is_alive()
+
+    log_queue.get()
+    blocked_thread.join(5)
+    assert not blocked_thread.is_alive()
+    assert log_queue.qsize() == 1
+    assert handler.dropped == 0
+
+
+def test_redactor():
+    redactor = Redactor()
+    assert redactor.redact("Nothing to redact") == "Nothing to redact"
+
+    redactor.add(" lip_abc123 ")
+    redactor.add("lip_abc")
+    redactor.add("user.name+1")
+    redactor.add("--token (secret) value")
+    redactor.add("")
+    assert len(redactor) == 4
+    assert "lip_abc123" in redactor
+
+    # The longest match is redacted, and regex characters are matched literally
+    assert redactor.redact("Token lip_abc123, or lip_abcd") == "Token ********, or ********d"
+    assert redactor.redact("user.name+1 vs userXname+1") == "******** vs userXname+1"
+    assert redactor.redact("args: --token (secret) value --flag") == "args: ******** --flag"
+
+    # Long texts can be redacted
+    long_text = "x" * 5000
+    redactor.add(long_text)
+    assert redactor.redact(f"[{long_text}]") == "[********]"
+
+
+def test_redactor_pattern_rebuilt_on_change(monkeypatch):
+    redactor = Redactor()
+    builds = []
+    build_trie_regex = Redactor._build_trie_regex
+    monkeypatch.setattr(Redactor, "_build_trie_regex", staticmethod(lambda texts: builds.append(1) or build_trie_regex(texts)))
+
+    redactor.add("secret")
+    for _ in range(3):
+        assert redactor.redact("a secret") == "a ********"
+    redactor.add("secret")
+    redactor.redact("a secret")
+    assert len(builds) == 1
+
+    redactor.add("another")
+    assert redactor.redact("another secret") == "******** ********"
+    assert len(builds) == 2
+
+
+def test_redact_from_logs(config_path: str, monkeypatch):
+    redactor = Redactor()
+    monkeypatch.setattr('chess_puzzle_ai_cli.utils.logging.log_redactor', redactor)
+    format_calls = []
+    format_record = LoggingRedactor.format
+    monkeypatch.setattr(LoggingRedactor, "format", lambda formatter, record: format_calls.append(1) or format_record(formatter, record))
+
+    logger = configure_logger("unit-test-redacted", level=logging.INFO)
+    redact_from_logs("lip_secret")
+    logger.info("Using token lip_secret")
+    logger.debug("Skipped below the level: lip_secret")
+    stop_logging()
+
+    with open(config_path + "unit-test-redacted.log") as file:
+        lines = file.read().splitlines()
+    assert len(lines) == 1 and lines[0].endswith("| Using token ********")
+    assert len(format_calls) == 1
+
+
+@pytest.mark.benchmark
+def test_redaction_speed():
+    # Verify the per line cost of redacting levels off as the number of redacted texts grows (it is bounded
+    # by the branching of the texts trie), unlike a replace per text which grows linearly with the texts.
+    # The texts are Lichess style API tokens, account names and arguments.
+    rng = Random(0)
+    line = ("01/02/2024 10:11:12.123 | DEBUG | cli-chess | board_model.make_move | "
+            "Made move (e2e4) for player_name with --clock-file /tmp/clock.json --status-file /tmp/status")
+    texts = [f"lip_{''.join(rng.choices(string.ascii_letters + string.digits, k=20))}" for _ in range(700)]
+    texts += [''.join(rng.choices(string.ascii_lowercase, k=10)) for _ in range(700)]
+    texts += [f"--{''.join(rng.choices(string.ascii_lowercase, k=6))} {rng.randint(0, 10 ** 6)}" for _ in range(700)]
+    rng.shuffle(texts)
+
+    def get_cost_ratio(redact, baseline_redact) -> float:
+        # The timings are interleaved, so a change in machine load affects both
+        assert redact(line) == baseline_redact(line) == line
+        times, baseline_times = [], []
+        for _ in range(7):
+            times.append(timeit.timeit(lambda: redact(line), number=300))
+            baseline_times.append(timeit.timeit(lambda: baseline_redact(line), number=300))
+        return min(times) / min(baseline_times)
+
+    def replace_per_text(texts):
+        def redact(text):
+            for item in texts:
+                text = text.replace(item, "********")
+            return text
+        return redact
+
+    def create_redactor(texts):
+        redactor = Redactor()
+        for text in texts:
+            redactor.add(text)
+        return redactor.redact
+
+    some_texts, many_texts = texts[:300], texts
+    assert get_cost_ratio(replace_per_text(many_texts), replace_per_text(some_texts)) > 5
+    assert get_cost_ratio(create_redactor(many_texts), create_redactor(some_texts)) < 3
+    assert get_cost_ratio(replace_per_text(many_texts), create_redactor(many_texts)) > 5
@@ -1,10 +1,10 @@
 from __future__ import annotations
 from chess_puzzle_ai_cli.utils.logging import log
-from platform import system
 from typing import Tuple, Type
 import threading
 import subprocess
 import enum
+import sys
 import os
 
 VALID_COLOR_DEPTHS = ["DEPTH_24_BIT", "DEPTH_8_BIT", "DEPTH_4_BIT"]
@@ -40,17 +40,17 @@ class AlertType(enum.Enum):
 
 def is_linux_os() -> bool:
     """Returns True if running on Linux"""
-    return True if system() == "Linux" else False
+    return sys.platform.startswith("linux")
 
 
 def is_windows_os() -> bool:
     """Returns True if running on Windows"""
-    return True if system() == "Windows" else False
+    return sys.platform == "win32"
 
 
 def is_mac_os() -> bool:
     """Returns True if running on Mac"""
-    return True if system() == "Darwin" else False
+    return sys.platform == "darwin"
 
 
 def str_to_bool(s: str) -> bool:
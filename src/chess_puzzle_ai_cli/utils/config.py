@@ -1,11 +1,18 @@
+from __future__ import annotations
 from chess_puzzle_ai_cli.utils.common import is_linux_os, is_windows_os, VALID_COLOR_DEPTHS
 from chess_puzzle_ai_cli.utils.logging import log, redact_from_logs
 from chess_puzzle_ai_cli.utils.event import Event
+from chess_puzzle_ai_cli.utils.file_watcher import FileWatcher
+from contextlib import contextmanager
 from getpass import getuser
 from enum import Enum
 import configparser
+import threading
+import tempfile
+import weakref
+import stat
 import os
-from typing import List
+from typing import Dict, Iterator, List, NamedTuple, Optional, Set, Tuple
 
 all_configs: List["SectionBase"] = []
 DEFAULT_CONFIG_FILENAME = "config.ini"
@@ -23,6 +30,8 @@ def get_config_path() -> str:
 
 def force_recreate_configs() -> None:
     """Forces a clean recreation of all configs"""
+    load_all_configs()
+
     # Handle deletion first as configs can exist in the same file
     # and we don't want to delete a newly created config/section
     for config in all_configs:
@@ -30,14 +39,17 @@ def force_recreate_configs() -> None:
             os.remove(config.full_filename)
 
     # second loop to handle recreation
+    for document in {config.document for config in all_configs}:
+        document.read()
     for config in all_configs:
-        config.parser = config._get_parser() # noqa
         config.create_section()
 
 
 def print_program_config() -> None:
     """Prints the configuration files for debugging purposes"""
     filenames = []  # Keep track of filenames printed so it's not duplicated
+    load_all_configs()
+    lichess_config = __getattr__("lichess_config")
     api_token = lichess_config.get_value(lichess_config.Keys.API_TOKEN).strip()
     for config in all_configs:
         if config.full_filename not in filenames:
@@ -53,30 +65,228 @@ def print_program_config() -> None:
                 print(e)
 
 
+def _get_file_signature(full_filename: str) -> Optional[Tuple[int, int, int]]:
+    """Returns the files (mtime, size, inode) or None if it does not exist"""
+    try:
+        stat = os.stat(full_filename)
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+    except OSError:
+        return None
+
+
+class ConfigDocument:
+    """The parsed contents of a single configuration file, shared by every config
+       stored in the file, so the file is only read once. Changes made inside a
+       batch are written with a single atomic write (a temp file renamed over the
+       configuration file) when the outermost batch ends, and each changed config
+       is notified once. Outside a batch each change is written immediately.
+       While watched, changes made to the file by other processes are reloaded
+       and only the configs of the sections which actually changed are notified.
+    """
+    def __init__(self, full_filename: str) -> None:
+        self.full_filename = full_filename
+        self.lock = threading.RLock()
+        self.parser = configparser.ConfigParser()
+        self.reads = 0
+        self.writes = 0
+        self.version = 0  # incremented on each change of the parsed contents
+        self.configs: "weakref.WeakSet[BaseConfig]" = weakref.WeakSet()
+
+        self._signature: Optional[Tuple[int, int, int]] = None
+        self._batch_depth = 0
+        self._changed_configs: List[BaseConfig] = []
+        self._watcher: Optional[FileWatcher] = None
+        self._watch_count = 0
+        self.read()
+
+    def read(self) -> None:
+        """(Re)reads the configuration file, discarding any unwritten changes"""
+        with self.lock:
+            parser = configparser.ConfigParser()
+            self._signature = _get_file_signature(self.full_filename)
+            parser.read(self.full_filename)
+            self.parser = parser
+            self.reads += 1
+            self.version += 1
+
+    def is_stale(self) -> bool:
+        """Returns True if the file has changed since it was last read or written"""
+        return _get_file_signature(self.full_filename) != self._signature
+
+    def reload(self) -> Set[str]:
+        """Re-reads the file if it was changed since it was last read or written, and
+           notifies the configs of each section whose values changed. Returns the
+           names of the changed sections. If the changed file is empty, removed or
+           cannot be parsed (e.g. it is mid-write by another program) the current
+           values are kept.
+        """
+        with self.lock:
+            signature = _get_file_signature(self.full_filename)
+            if signature == self._signature:
+                return set()
+            if signature is None or signature[1] == 0:
+                log.debug(f"Not reloading {self.full_filename} as it is empty or removed")
+                return set()
+
+            old_values = self._get_section_values()
+            try:
+                self.read()
+            except configparser.Error as e:
+                log.error(f"Unable to reload {self.full_filename}, keeping the current configuration: {e}")
+                return set()
+
+            new_values = self._get_section_values()
+            changed_sections = {section for section in old_values.keys() | new_values.keys()
+                                if old_values.get(section) != new_values.get(section)}
+
+        if changed_sections:
+            log.info(f"Reloaded the changed configuration sections: {sorted(changed_sections)}")
+            for config in list(self.configs):
+                config._on_sections_reloaded(changed_sections)  # noqa
+        return changed_sections
+
+    def start_watching(self) -> None:
+        """Starts reloading the file when it is changed by another program. Calls are
+           counted, so the file is watched until each call is matched by stop_watching().
+        """
+        with self.lock:
+            self._watch_count += 1
+            if self._watcher is None:
+                self._watcher = FileWatcher(self.full_filename, self.reload)
+                self._watcher.start()
+
+    def stop_watching(self) -> None:
+        """Stops watching the file once every start_watching() call has been matched"""
+        with self.lock:
+            self._watch_count = max(self._watch_count - 1, 0)
+            if self._watch_count == 0 and self._watcher is not None:
+                self._watcher.stop()
+                self._watcher = None
+
+    def _get_section_values(self) -> Dict[str, Dict[str, str]]:
+        """Returns the raw key/values of each section"""
+        return {section: dict(self.parser.items(section, raw=True)) for section in self.parser.sections()}
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Context manager which coalesces the changes made inside it into a
+           single write and a single notification per changed config
+        """
+        with self.lock:
+            self._batch_depth += 1
+            try:
+                yield
+            finally:
+                self._batch_depth -= 1
+                changed_configs = self._write_changes() if self._batch_depth == 0 else []
+
+        # Listeners are notified outside the lock, so they are free to read from other threads
+        for config in changed_configs:
+            config._notify_config_updated()  # noqa
+
+    def mark_changed(self, config: BaseConfig) -> None:
+        """Records the passed in config as changed. The change is written when
+           the current batch ends, or immediately if there is no batch.
+        """
+        with self.batch():
+            self.version += 1
+            if config not in self._changed_configs:
+                self._changed_configs.append(config)
+
+    def _write_changes(self) -> List[BaseConfig]:
+        """Writes the file if there are unwritten changes. Returns the changed configs."""
+        changed_configs = self._changed_configs
+        if changed_configs:
+            self._changed_configs = []
+            self._write()
+        return changed_configs
+
+    def _write(self) -> None:
+        """Atomically writes the file by writing a temp file and renaming it over the file"""
+        file_path = os.path.dirname(self.full_filename)
+        os.makedirs(file_path, exist_ok=True)
+
+        fd, temp_filename = tempfile.mkstemp(dir=file_path, prefix=".config-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w') as config_file:
+                self.parser.write(config_file)
+
+            # The temp file is created private (0600), so the file keeps its permissions after the rename
+            os.chmod(temp_filename, self._get_file_mode())
+            os.replace(temp_filename, self.full_filename)
+        except BaseException:
+            if os.path.exists(temp_filename):
+                os.remove(temp_filename)
+            raise
+
+        self._signature = _get_file_signature(self.full_filename)
+        self.writes += 1
+
+    def _get_file_mode(self) -> int:
+        """Returns the permission bits of the file, or the default
+           permissions of a new file if it does not exist yet
+        """
+        try:
+            return stat.S_IMODE(os.stat(self.full_filename).st_mode)
+        except FileNotFoundError:
+            umask = os.umask(0)
+            os.umask(umask)
+            return 0o666 & ~umask
+
+
+_config_documents: Dict[str, ConfigDocument] = {}
+_config_documents_lock = threading.Lock()
+
+
+def get_config_document(full_filename: str) -> ConfigDocument:
+    """Returns the shared document of the passed in configuration file. The file
+       is re-read if it was changed or removed since the document last read it.
+    """
+    with _config_documents_lock:
+        document = _config_documents.get(full_filename)
+        if document is None:
+            document = _config_documents[full_filename] = ConfigDocument(full_filename)
+        elif document.is_stale():
+            document.read()
+        return document
+
+
 class BaseConfig:
     def __init__(self, filename: str = DEFAULT_CONFIG_FILENAME) -> None:
         """Default base class constructor"""
         self.file_path = get_config_path()
         self.full_filename = self.file_path + filename
-        self.parser = self._get_parser()
+        self.document = get_config_document(self.full_filename)
+        self.document.configs.add(self)
 
         # Event called on any configuration write event (across sections)
         self.e_config_updated = Event()
 
-    def _get_parser(self) -> "ConfigParser":  # noqa: F821
-        """Returns the config parser object"""
-        parser = configparser.ConfigParser()
-        parser.read(self.full_filename)
-        return parser
+    @property
+    def parser(self) -> configparser.ConfigParser:
+        """Returns the shared config parser of the configuration file"""
+        return self.document.parser
+
+    def batch(self):
+        """Returns a context manager which coalesces the configuration changes made
+           inside it (across all configs of the file) into a single atomic write.
+           Example: `with game_config.batch(): ...`
+        """
+        return self.document.batch()
 
     def write_config(self) -> None:
-        """Writes to the configuration file"""
-        if not os.path.exists(self.file_path):
-            os.makedirs(self.file_path)
+        """Writes to the configuration file. Inside a batch, the write
+           is deferred until the batch ends.
+        """
+        self.document.mark_changed(self)
+
+    def _notify_config_updated(self) -> None:
+        """Notifies listeners the configuration was written"""
+        self.e_config_updated.notify()
 
-        with open(self.full_filename, 'w') as config_file:
-            self.parser.write(config_file)
-            self.e_config_updated.notify()
+    def _on_sections_reloaded(self, sections: Set[str]) -> None:
+        """Called when the passed in sections were changed by another program"""
+        self._notify_config_updated()
 
     def config_exists(self) -> bool:
         """Returns True if the configuration file exists"""
@@ -84,14 +294,16 @@ class BaseConfig:
 
     def add_section(self, section: str) -> None:
         """Add a section to the configuration file"""
-        self.parser[section] = {}
-        self.write_config()
+        with self.document.lock:
+            self.parser[section] = {}
+            self.write_config()
 
     def set_key_value(self, section: str, key: str, value: str) -> None:
         """Set (or add) a key/value to a section in the configuration file"""
         # TODO: Raise error if section does not exist
-        self.parser[section][key] = str(value.strip() if isinstance(value, str) else value)
-        self.write_config()
+        with self.document.lock:
+            self.parser[section][key] = str(value.strip() if isinstance(value, str) else value)
+            self.write_config()
 
     def get_config_filename(self) -> str:
         """Returns the configuration filename"""
@@ -151,18 +363,20 @@ class SectionBase(BaseConfig):
            as all expected keys. If the section is missing, the entire section is recreated.
            If a key is missing from the section, the key will be re-added with its default value.
         """
-        if self._section_exists():
-            for key in self.section_keys:
-                if not self._section_has_key(key):
-                    super().set_key_value(self.section_name, key.name, key.default_value)
-        else:
-            self.create_section()
+        with self.batch():
+            if self._section_exists():
+                for key in self.section_keys:
+                    if not self._section_has_key(key):
+                        super().set_key_value(self.section_name, key.name, key.default_value)
+            else:
+                self.create_section()
 
     def create_section(self) -> None:
         """Creates this section using key value defaults"""
-        super().add_section(self.section_name)
-        for key in self.section_keys:
-            super().set_key_value(self.section_name, key.name, key.default_value)
+        with self.batch():
+            super().add_section(self.section_name)
+            for key in self.section_keys:
+                super().set_key_value(self.section_name, key.name, key.default_value)
 
     def get_all_values(self) -> dict:
         """Returns a dictionary of all key/values in this section.
@@ -182,6 +396,11 @@ class SectionBase(BaseConfig):
         """Retrieve the boolean value at the passed in section/key pair"""
         return super().get_key_boolean_value(self.section_name, key.name)
 
+    def _on_sections_reloaded(self, sections: Set[str]) -> None:
+        """Notifies listeners if this section was changed by another program"""
+        if self.section_name in sections:
+            self._notify_config_updated()
+
     def _section_exists(self) -> bool:
         """Returns true if this section exists in the configuration file"""
         return self.parser.has_section(self.section_name)
@@ -212,12 +431,23 @@ class PlayerInfoConfig(SectionBase):
         self.e_player_info_config_updated = Event()
         super().__init__(section_name="player_info", section_keys=self.Keys, filename=filename)
 
-    def write_config(self) -> None:
-        """Writes to the configuration file"""
-        super().write_config()
+    def _notify_config_updated(self) -> None:
+        """Notifies listeners the configuration was written"""
+        super()._notify_config_updated()
         self.e_player_info_config_updated.notify()
 
 
+class GameConfigValues(NamedTuple):
+    """An immutable snapshot of the "game" configuration values"""
+    show_board_coordinates: bool
+    show_board_highlights: bool
+    blindfold_chess: bool
+    use_unicode_pieces: bool
+    show_move_list_in_unicode: bool
+    show_material_diff_in_unicode: bool
+    pad_unicode: bool
+
+
 class GameConfig(SectionBase):
     """Creates and manages the "game" configuration. This configuration can
        either live in its own file, or be appended as a section by using a
@@ -249,13 +479,40 @@ class GameConfig(SectionBase):
 
     def __init__(self, filename: str = DEFAULT_CONFIG_FILENAME):
         self.e_game_config_updated = Event()
+        self._snapshot: Tuple[int, Optional[GameConfigValues]] = (-1, None)
         super().__init__(section_name="game", section_keys=self.Keys, filename=filename)
 
-    def write_config(self) -> None:
-        """Writes to the configuration file"""
-        super().write_config()
+    def _notify_config_updated(self) -> None:
+        """Notifies listeners the configuration was written"""
+        super()._notify_config_updated()
         self.e_game_config_updated.notify()
 
+    def get_snapshot(self) -> GameConfigValues:
+        """Returns an immutable snapshot of the game configuration values. A snapshot is
+           only built once per configuration change and is swapped in whole, so readers
+           on other threads never see a partially updated configuration.
+        """
+        version, snapshot = self._snapshot
+        if version != self.document.version:
+            with self.document.lock:
+                version = self.document.version
+                snapshot = self._create_snapshot()
+                self._snapshot = (version, snapshot)
+        return snapshot
+
+    def _create_snapshot(self) -> GameConfigValues:
+        """Returns a new snapshot of the game configuration values. Invalid
+           or missing values are replaced with the keys default value.
+        """
+        values = {}
+        for key in self.Keys:
+            try:
+                values[key.value] = self.parser.getboolean(self.section_name, key.name)
+            except (ValueError, configparser.Error) as e:
+                log.error(f"Invalid {key.name} configuration value, using the default: {e}")
+                values[key.value] = key.default_value
+        return GameConfigValues(**values)
+
     def get_all_values(self) -> dict:
         """Returns a dictionary of all key/values in this section.
            The keys of the dictionary is this sections Key enum.
@@ -278,12 +535,14 @@ class TerminalConfig(SectionBase):
     """
     class Keys(Enum):
         TERMINAL_COLOR_DEPTH = "terminal_color_depth"
+        MAX_FRAME_RATE = "max_frame_rate"
 
         @property
         def default_value(self):
             """Returns the default value for the key"""
             default_lookup = {
-                self.TERMINAL_COLOR_DEPTH: "DEPTH_24_BIT" if is_linux_os() else "DEPTH_8_BIT"
+                self.TERMINAL_COLOR_DEPTH: "DEPTH_24_BIT" if is_linux_os() else "DEPTH_8_BIT",
+                self.MAX_FRAME_RATE: "30",
             }
             return default_lookup[self]
 
@@ -298,9 +557,23 @@ class TerminalConfig(SectionBase):
             super().set_value(self.Keys.TERMINAL_COLOR_DEPTH, self.Keys.TERMINAL_COLOR_DEPTH.default_value)
         return super().get_key_value(self.section_name, key.name, False)
 
-    def write_config(self) -> None:
-        """Writes to the configuration file"""
-        super().write_config()
+    def get_max_frame_rate(self) -> float:
+        """Returns the max frame rate to render the UI at. Invalid
+           values are reset to the default max frame rate.
+        """
+        try:
+            max_frame_rate = float(self.get_value(self.Keys.MAX_FRAME_RATE))
+            if max_frame_rate > 0:
+                return max_frame_rate
+        except (TypeError, ValueError):
+            pass
+
+        super().set_value(self.Keys.MAX_FRAME_RATE, self.Keys.MAX_FRAME_RATE.default_value)
+        return float(self.Keys.MAX_FRAME_RATE.default_value)
+
+    def _notify_config_updated(self) -> None:
+        """Notifies listeners the configuration was written"""
+        super()._notify_config_updated()
         self.e_program_config_updated.notify()
 
 
@@ -326,9 +599,9 @@ class LichessConfig(SectionBase):
         super().__init__(section_name="lichess", section_keys=self.Keys, filename=filename)
         redact_from_logs(self.get_value(self.Keys.API_TOKEN))
 
-    def write_config(self) -> None:
-        """Writes to the configuration file"""
-        super().write_config()
+    def _notify_config_updated(self) -> None:
+        """Notifies listeners the configuration was written"""
+        super()._notify_config_updated()
         self.e_lichess_config_updated.notify()
 
     def set_value(self, key, value: str) -> None:
@@ -341,7 +614,52 @@ class LichessConfig(SectionBase):
         super().set_key_value(self.section_name, key.name, value)
 
 
-player_info_config = PlayerInfoConfig()
-game_config = GameConfig()
-terminal_config = TerminalConfig()
-lichess_config = LichessConfig()
+# The config instances are created on first access (see __getattr__), so importing
+# this module does not read the config file. The configs are created together,
+# so the config file is read once and written at most once.
+_config_classes = {
+    "player_info_config": PlayerInfoConfig,
+    "game_config": GameConfig,
+    "terminal_config": TerminalConfig,
+    "lichess_config": LichessConfig,
+}
+_config_lock = threading.Lock()
+
+
+def __getattr__(name: str):
+    """Returns the named config instance, creating the configs on first access"""
+    if name not in _config_classes:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    if name not in globals():
+        load_all_configs()
+    return globals()[name]
+
+
+def start_watching_configs() -> None:
+    """Starts reloading the program configs when they're changed by another program
+       (e.g. another terminal), so changes apply without a restart
+    """
+    load_all_configs()
+    for document in {globals()[name].document for name in _config_classes}:
+        document.start_watching()
+
+
+def stop_watching_configs() -> None:
+    """Stops reloading the program configs (see start_watching_configs)"""
+    for document in {globals()[name].document for name in _config_classes if name in globals()}:
+        document.stop_watching()
+
+
+def load_all_configs() -> None:
+    """Creates all config instances (and their default config sections if they don't exist).
+       Any missing sections or keys are added with a single write of the config file.
+    """
+    with _config_lock:
+        if all(name in globals() for name in _config_classes):
+            return
+
+        with get_config_document(get_config_path() + DEFAULT_CONFIG_FILENAME).batch():
+            for name, config_class in _config_classes.items():
+                if name not in globals():
+                    globals()[name] = config_class()
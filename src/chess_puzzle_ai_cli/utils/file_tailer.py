@@ -0,0 +1,95 @@
+from __future__ import annotations
+from chess_puzzle_ai_cli.utils.logging import log
+from typing import List, Optional
+import os
+
+DEFAULT_MAX_READ_SIZE = 1024 * 1024
+
+
+class FileTailer:
+    """Incrementally reads the complete lines appended to a file. The byte offset
+       of the last read is remembered, so each read only touches newly appended
+       bytes. If the file is truncated, or replaced (rotated) by a new file, reading
+       restarts from the beginning of the file. If more than `max_read_size` bytes
+       were appended since the last read, only the most recent lines within
+       `max_read_size` bytes are returned and the rest are skipped.
+    """
+    def __init__(self, file_path: str, max_read_size: int = DEFAULT_MAX_READ_SIZE) -> None:
+        self.file_path = file_path
+        self.max_read_size = max_read_size
+        self.offset = 0
+        self.bytes_skipped = 0
+
+        self._file = None
+        self._inode: Optional[int] = None
+        self._partial_line = b""
+
+    def read_lines(self) -> List[bytes]:
+        """Returns the complete lines (without line endings) appended since the last read"""
+        if not self._open_if_needed():
+            return []
+
+        size = os.fstat(self._file.fileno()).st_size
+        if size < self.offset:
+            log.debug(f"{self.file_path} was truncated, reading from the beginning")
+            self._reset()
+
+        unread = size - self.offset
+        if unread <= 0:
+            return []
+
+        # Skip ahead when a chatty writer appended more than we are willing to read
+        skip_partial_line = False
+        if unread > self.max_read_size:
+            self.bytes_skipped += unread - self.max_read_size
+            self.offset = size - self.max_read_size
+            self._partial_line = b""
+            skip_partial_line = True
+
+        self._file.seek(self.offset)
+        data = self._file.read(size - self.offset)
+        self.offset += len(data)
+
+        lines = (self._partial_line + data).split(b"\n")
+        self._partial_line = lines.pop()
+        if skip_partial_line and lines:
+            lines.pop(0)
+
+        return [line.rstrip(b"\r") for line in lines]
+
+    def close(self) -> None:
+        """Closes the tailed file"""
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def _open_if_needed(self) -> bool:
+        """Opens the file if it is not open, or re-opens it if it has been
+           replaced. Returns False if the file does not exist.
+        """
+        try:
+            inode = os.stat(self.file_path).st_ino
+        except OSError:
+            return self._file is not None
+
+        if self._file is not None and inode == self._inode:
+            return True
+
+        if self._file is not None:
+            log.debug(f"{self.file_path} was replaced, reading from the beginning")
+            self.close()
+
+        try:
+            self._file = open(self.file_path, "rb")
+        except OSError as e:
+            log.error(f"Unable to open {self.file_path}: {e}")
+            return False
+
+        self._inode = os.fstat(self._file.fileno()).st_ino
+        self._reset()
+        return True
+
+    def _reset(self) -> None:
+        """Resets reading to the beginning of the file"""
+        self.offset = 0
+        self._partial_line = b""
@@ -0,0 +1,146 @@
+from __future__ import annotations
+from chess_puzzle_ai_cli.utils.common import is_linux_os, threaded
+from chess_puzzle_ai_cli.utils.logging import log
+from typing import Callable, Optional, Tuple
+import threading
+import select
+import struct
+import os
+
+DEFAULT_POLL_INTERVAL = 0.5
+
+# inotify constants (see inotify(7))
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+INOTIFY_EVENT_STRUCT = struct.Struct("iIII")
+INOTIFY_WATCH_MASK = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+
+def _load_inotify():
+    """Returns libc if it provides inotify, otherwise None"""
+    if not is_linux_os():
+        return None
+
+    try:
+        import ctypes
+        libc = ctypes.CDLL(None, use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        return libc
+    except (OSError, AttributeError) as e:
+        log.debug(f"inotify is unavailable: {e}")
+        return None
+
+
+class FileWatcher:
+    """Watches a single file and calls the passed in callback (from a background
+       thread) each time the file actually changes. On Linux, inotify is used to
+       watch the files directory so atomic rename style writes are also seen, and
+       every completed write is reported. Elsewhere, or if inotify cannot be set up,
+       the file is polled by comparing its mtime, size and inode on an interval. The file does not need to exist
+       when watching starts.
+    """
+    def __init__(self, file_path: str, callback: Callable[[], None], poll_interval: float = DEFAULT_POLL_INTERVAL) -> None:
+        self.file_path = os.path.abspath(file_path)
+        self.callback = callback
+        self.poll_interval = poll_interval
+        self.using_inotify = False
+
+        self._signature = self._get_signature()
+        self._stopped = threading.Event()
+
+    def start(self) -> None:
+        """Starts watching the file in the background"""
+        libc = _load_inotify()
+        inotify_fd = self._init_inotify(libc) if libc else None
+        self.using_inotify = inotify_fd is not None
+        self._watch(inotify_fd)
+
+    def stop(self) -> None:
+        """Stops watching the file"""
+        self._stopped.set()
+
+    def _init_inotify(self, libc) -> Optional[int]:
+        """Returns an inotify file descriptor watching the files directory,
+           or None if inotify could not be set up
+        """
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            log.debug("inotify_init1 failed, falling back to polling")
+            return None
+
+        if libc.inotify_add_watch(fd, os.path.dirname(self.file_path).encode(), INOTIFY_WATCH_MASK) < 0:
+            log.debug(f"Unable to inotify watch {self.file_path}, falling back to polling")
+            os.close(fd)
+            return None
+
+        return fd
+
+    @threaded
+    def _watch(self, inotify_fd: Optional[int]) -> None:
+        """Watches the file until stopped"""
+        log.debug(f"Watching {self.file_path} using {'inotify' if inotify_fd is not None else 'polling'}")
+        try:
+            while not self._stopped.is_set():
+                if inotify_fd is not None:
+                    readable, _, _ = select.select([inotify_fd], [], [], self.poll_interval)
+                    if readable:
+                        self._handle_inotify_events(os.read(inotify_fd, 4096))
+                else:
+                    self._stopped.wait(self.poll_interval)
+                    self._check_for_change()
+        except Exception as e:
+            log.error(f"Error watching {self.file_path}: {e}")
+        finally:
+            if inotify_fd is not None:
+                os.close(inotify_fd)
+
+    def _handle_inotify_events(self, data: bytes) -> None:
+        """Handles the events of the watched file in the inotify event data. A completed
+           write or a rename over the file is always reported, as a rewrite can leave
+           the files mtime, size and inode unchanged. Other events (such as appends to
+           a file held open) are only reported if the files signature changed.
+        """
+        file_name = os.path.basename(self.file_path).encode()
+        offset = 0
+        while offset + INOTIFY_EVENT_STRUCT.size <= len(data):
+            _, mask, _, name_length = INOTIFY_EVENT_STRUCT.unpack_from(data, offset)
+            offset += INOTIFY_EVENT_STRUCT.size
+            name = data[offset:offset + name_length].rstrip(b"\0")
+            offset += name_length
+            if name != file_name:
+                continue
+
+            if mask & (IN_CLOSE_WRITE | IN_MOVED_TO):
+                self._signature = self._get_signature()
+                self._notify()
+            else:
+                self._check_for_change()
+
+    def _check_for_change(self) -> None:
+        """Calls the callback if the files signature has changed since the last check"""
+        signature = self._get_signature()
+        if signature != self._signature:
+            self._signature = signature
+            self._notify()
+
+    def _notify(self) -> None:
+        """Calls the callback, logging any error it raises"""
+        try:
+            self.callback()
+        except Exception as e:
+            log.error(f"Error handling change of {self.file_path}: {e}")
+
+    def _get_signature(self) -> Optional[Tuple[int, int, int]]:
+        """Returns the files (mtime, size, inode) or None if it does not exist"""
+        try:
+            stat = os.stat(self.file_path)
+            return stat.st_mtime_ns, stat.st_size, stat.st_ino
+        except OSError:
+            return None
@@ -0,0 +1,98 @@
+from __future__ import annotations
+from chess_puzzle_ai_cli.utils.logging import log
+from typing import Callable, Dict, Optional
+from time import monotonic
+import threading
+import asyncio
+
+DEFAULT_MAX_FRAME_RATE = 30
+
+
+class FrameScheduler:
+    """Coalesces render requests into frames. Presenters mark themselves dirty
+       by passing in their render function, and all dirty render functions are
+       flushed once on the next event loop iteration, no more often than the
+       max frame rate allows. A burst of model updates (e.g. replaying a move
+       list) therefore costs a single render. Render requests made on another
+       thread (e.g. a file watcher) are handed to the event loop the scheduler
+       renders on. If there is no event loop (e.g. outside the application) the
+       render is flushed immediately. A scheduler should only be used by the
+       presenters of one application.
+    """
+    def __init__(self, max_frame_rate: float = DEFAULT_MAX_FRAME_RATE) -> None:
+        if max_frame_rate <= 0:
+            raise ValueError(f"Invalid max frame rate: {max_frame_rate}")
+
+        self.max_frame_rate = max_frame_rate
+        self.frame_count = 0
+
+        self._dirty: Dict[Callable[[], None], None] = {}  # ordered set of render functions
+        self._flush_handle: Optional[asyncio.Handle] = None
+        self._last_flush_time: Optional[float] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+
+    def set_event_loop(self, loop: Optional[asyncio.AbstractEventLoop]) -> None:
+        """Sets the event loop frames are rendered on. The loop is also set
+           by the first render request made in a running event loop.
+        """
+        self._loop = loop
+
+    def mark_dirty(self, render: Callable[[], None]) -> None:
+        """Schedules the passed in render function to be called on the next frame"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        if loop is None:
+            # Requests from another thread are rendered on the event loop's thread
+            render_loop = self._loop
+            if render_loop is not None and render_loop.is_running() and not render_loop.is_closed():
+                render_loop.call_soon_threadsafe(self.mark_dirty, render)
+                return
+        else:
+            self._loop = loop
+
+        with self._lock:
+            self._dirty[render] = None
+            if loop is None or self._flush_handle is not None:
+                scheduled = self._flush_handle is not None
+            else:
+                delay = self._get_next_frame_delay()
+                self._flush_handle = loop.call_later(delay, self.flush) if delay > 0 else loop.call_soon(self.flush)
+                scheduled = True
+
+        if not scheduled:
+            self.flush()
+
+    def flush(self) -> None:
+        """Calls all dirty render functions now"""
+        with self._lock:
+            dirty = list(self._dirty)
+            self._dirty.clear()
+            self._flush_handle = None
+            self._last_flush_time = monotonic()
+
+        if dirty:
+            self.frame_count += 1
+
+        for render in dirty:
+            try:
+                render()
+            except Exception as e:
+                log.error(f"Error rendering frame: {e}")
+
+    def cancel(self) -> None:
+        """Cancels the scheduled frame and drops all pending renders"""
+        with self._lock:
+            if self._flush_handle is not None:
+                self._flush_handle.cancel()
+                self._flush_handle = None
+            self._dirty.clear()
+
+    def _get_next_frame_delay(self) -> float:
+        """Returns the seconds until the next frame may be rendered"""
+        if self._last_flush_time is None:
+            return 0.0
+        return self._last_flush_time + 1 / self.max_frame_rate - monotonic()
@@ -1,45 +1,193 @@
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, List, Optional, Pattern, Set, Tuple
 import logging
+import threading
+import atexit
+import queue
+import os
+import re
 
 log = logging.getLogger("cli-chess")
-log_redactions = []
 
+DEFAULT_LOG_QUEUE_SIZE = 10000
+_log_pipelines: List[Tuple[logging.Logger, "BoundedQueueHandler", "LogQueueListener"]] = []
 
-def configure_logger(name: str, level=logging.DEBUG) -> logging.Logger:
-    """Configures and returns a logger instance"""
+
+def configure_logger(name: str, level=logging.DEBUG, queue_size: int = DEFAULT_LOG_QUEUE_SIZE,
+                     block_when_full: bool = False) -> logging.Logger:
+    """Configures the program logger (`log`), which every module logs through, to write to
+       the log file of the passed in name, and returns it. Log records are put on a bounded
+       queue and written to the log file by a background thread, so the logging thread never
+       touches the disk. If the queue is full, records are dropped, or if block_when_full
+       is true the logging thread waits for space. The queue is flushed on exit. Calling
+       this again replaces the previous configuration (its queue is flushed first), so
+       records are never written more than once.
+    """
     from chess_puzzle_ai_cli.utils.config import get_config_path
 
     log_file = f"{get_config_path()}" + f"{name}.log"
+    reconfigured_files = {handler.baseFilename for _, _, listener in _log_pipelines for handler in listener.handlers}
+    stop_logging()
+
     log_format = "%(asctime)s.%(msecs)03d | %(levelname)-5s | %(name)s | %(module)s.%(funcName)s | %(message)s"
     time_format = "%m/%d/%Y %I:%M:%S"
 
-    file_handler = logging.FileHandler(log_file, mode="w")
+    # The file is opened on the first write, which is on the listener thread. When reconfiguring
+    # to the same file, the records already written by the previous configuration are kept
+    mode = "a" if os.path.abspath(log_file) in reconfigured_files else "w"
+    file_handler = logging.FileHandler(log_file, mode=mode, delay=True)
     file_handler.setFormatter(LoggingRedactor(log_format, time_format))
+    file_handler.setLevel(level)
+
+    # Records below the level are skipped by the handler, before they are formatted or queued
+    log_queue = queue.Queue(maxsize=queue_size)
+    queue_handler = BoundedQueueHandler(log_queue, block_when_full)
+    queue_handler.setLevel(level)
+    listener = LogQueueListener(log_queue, file_handler, respect_handler_level=True)
+    listener.start()
 
-    logger = logging.getLogger(name)
+    logger = log
     logger.setLevel(level)
-    logger.addHandler(file_handler)
+    logger.addHandler(queue_handler)
+
+    atexit.unregister(stop_logging)
+    atexit.register(stop_logging)
+    _log_pipelines.append((logger, queue_handler, listener))
 
     return logger
 
 
+def stop_logging() -> None:
+    """Writes out all queued log records and stops the background log writers.
+       This is called automatically on exit.
+    """
+    while _log_pipelines:
+        logger, queue_handler, listener = _log_pipelines.pop()
+        logger.removeHandler(queue_handler)
+        listener.stop()
+
+        if queue_handler.dropped:
+            for handler in listener.handlers:
+                handler.handle(logger.makeRecord(logger.name, logging.WARNING, __file__, 0,
+                                                 f"Dropped {queue_handler.dropped} log records as the log queue was full",
+                                                 None, None))
+        for handler in listener.handlers:
+            handler.close()
+
+
 def redact_from_logs(text: str = "") -> None:
-    """Adds the passed in text to the log redaction list"""
-    text = text.strip()
-    if text and text not in log_redactions:
-        log_redactions.append(text)
+    """Adds the passed in text to the texts redacted from the logs"""
+    log_redactor.add(text)
+
+
+class Redactor:
+    """Redacts a set of texts (eg. API keys) from strings in a single pass. The
+       texts are compiled into one regex, structured as a trie of the texts so the
+       matching work of a shared prefix is only done once. Each position of the
+       string is matched against the trie, rather than the string being scanned
+       once per text. The regex is rebuilt on first use after the texts change.
+    """
+    def __init__(self, replacement: str = "********") -> None:
+        self.replacement = replacement
+        self._texts: Set[str] = set()
+        self._pattern: Optional[Pattern] = None
+        self._pattern_stale = False
+        self._lock = threading.Lock()
+
+    def add(self, text: str) -> None:
+        """Adds the passed in text (stripped of surrounding whitespace) to the redacted texts"""
+        text = text.strip()
+        if text and text not in self._texts:
+            with self._lock:
+                self._texts.add(text)
+                self._pattern_stale = True
+
+    def redact(self, text: str) -> str:
+        """Returns the passed in string with each redacted text replaced"""
+        pattern = self._get_pattern()
+        return pattern.sub(self.replacement, text) if pattern else text
+
+    def __contains__(self, text: str) -> bool:
+        return text in self._texts
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def _get_pattern(self) -> Optional[Pattern]:
+        """Returns the compiled regex of the redacted texts, rebuilding it if the texts changed"""
+        if self._pattern_stale:
+            with self._lock:
+                self._pattern = re.compile(self._build_trie_regex(self._texts)) if self._texts else None
+                self._pattern_stale = False
+        return self._pattern
+
+    @staticmethod
+    def _build_trie_regex(texts: Set[str]) -> str:
+        """Returns a regex matching any of the passed in texts, preferring the longest match"""
+        trie: Dict[str, dict] = {}
+        for text in texts:
+            node = trie
+            for char in text:
+                node = node.setdefault(char, {})
+            node[""] = {}  # marks the end of a text
+
+        def build(node: Dict[str, dict]) -> str:
+            # Chains of single characters are joined without recursing, so long texts don't hit the recursion limit
+            prefix = ""
+            while len(node) == 1 and "" not in node:
+                (char, node), = node.items()
+                prefix += re.escape(char)
+
+            alternatives = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+            if not alternatives:
+                return prefix
+            regex = alternatives[0] if len(alternatives) == 1 else f"(?:{'|'.join(alternatives)})"
+            return prefix + (f"(?:{regex})?" if "" in node else regex)
+
+        return build(trie)
+
+
+log_redactor = Redactor()
+
+
+class BoundedQueueHandler(QueueHandler):
+    """Queue handler for a bounded queue. When the queue is full the record is
+       dropped (and counted), or if block_when_full is true, the caller waits
+       for the listener to make space.
+    """
+    def __init__(self, log_queue: queue.Queue, block_when_full: bool = False) -> None:
+        super().__init__(log_queue)
+        self.block_when_full = block_when_full
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """Puts the record on the queue, applying the full queue policy"""
+        if self.block_when_full:
+            self.queue.put(record)
+            return
+
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class LogQueueListener(QueueListener):
+    """Queue listener which waits for space to stop on a full bounded queue,
+       so every record queued before stopping is still written
+    """
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)
 
 
 class LoggingRedactor(logging.Formatter):
     """Log formatter that redacts matches from being logged.
-       Loops through the `log_redactions` list and replaces the
-       text before outputting it to the log (eg. API keys)
+       The texts added with `redact_from_logs` (eg. API keys)
+       are replaced in a single pass (see Redactor).
     """
     @staticmethod
     def _filter(text):
-        redacted_text = text
-        for item in log_redactions:
-            redacted_text = redacted_text.replace(item, "********")
-        return redacted_text
+        return log_redactor.redact(text)
 
     def format(self, log_record):
         text = logging.Formatter.format(self, log_record)
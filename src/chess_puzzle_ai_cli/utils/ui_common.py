@@ -1,7 +1,7 @@
 from __future__ import annotations
-from cli_chess.utils import AlertType, log
-from cli_chess.utils.common import VALID_COLOR_DEPTHS
-from cli_chess.utils.config import get_config_path
+from chess_puzzle_ai_cli.utils.common import AlertType, VALID_COLOR_DEPTHS
+from chess_puzzle_ai_cli.utils.config import get_config_path
+from chess_puzzle_ai_cli.utils.logging import log
 from prompt_toolkit.layout import Window, FormattedTextControl, ConditionalContainer
 from prompt_toolkit.filters import to_filter
 from prompt_toolkit.mouse_events import MouseEvent, MouseEventType